@@ -3,7 +3,8 @@ Main API router that includes all route modules
 """
 from fastapi import APIRouter
 
-from app.api.routes import health, mule, flows
+from app.config.settings import settings
+from app.api.routes import health, mule, flows, scans, export, metrics, archives, snapshots, search, query, dataweave, shards, apikit
 
 # Create main router
 router = APIRouter()
@@ -11,4 +12,19 @@ router = APIRouter()
 # Include route modules
 router.include_router(health.router, tags=["Health"])
 router.include_router(mule.router, tags=["MuleSoft Dependencies"])
-router.include_router(flows.router, tags=["MuleSoft Flows"]) 
\ No newline at end of file
+router.include_router(flows.router, tags=["MuleSoft Flows"])
+router.include_router(scans.router, tags=["MuleSoft Scan Jobs"])
+router.include_router(export.router, tags=["MuleSoft Export"])
+router.include_router(metrics.router, tags=["MuleSoft Metrics"])
+router.include_router(archives.router, tags=["MuleSoft Archives"])
+router.include_router(snapshots.router, tags=["MuleSoft Snapshots"])
+router.include_router(search.router, tags=["MuleSoft Search"])
+router.include_router(query.router, tags=["MuleSoft Query"])
+router.include_router(dataweave.router, tags=["MuleSoft DataWeave"])
+router.include_router(shards.router, tags=["MuleSoft Sharding"])
+router.include_router(apikit.router, tags=["MuleSoft APIkit"])
+
+# Profiling routes are only imported and mounted when enabled, so regular scans carry no overhead
+if settings.get_profiling_enabled():
+    from app.api.routes import debug
+    router.include_router(debug.router, tags=["Debug"])
@@ -0,0 +1,32 @@
+"""
+APIkit specification coverage routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import logging
+
+from app.services.apikit_coverage import apikit_coverage
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/mule/apikit/coverage")
+async def get_apikit_coverage(
+    project: Optional[str] = Query(None, description="Project to report (every project if omitted)")
+):
+    """
+    Compare the RAML/OAS specs under src/main/resources/api with the APIkit flows,
+    reporting unimplemented operations and flows missing from the spec
+    """
+    try:
+        return apikit_coverage.coverage(project)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error checking APIkit coverage: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error checking APIkit coverage: {str(e)}"
+        )
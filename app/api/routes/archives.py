@@ -0,0 +1,49 @@
+"""
+MuleSoft application archive scanning routes
+"""
+from fastapi import APIRouter, HTTPException
+import logging
+
+from app.models.flows import ProjectFlowsResponse
+from app.models.dependencies import MuleDependencyScanResponse
+from app.services.archive_scanner import ArchiveScanner
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/mule/archives/flows", response_model=ProjectFlowsResponse)
+async def get_archive_flows():
+    """
+    Scan all application archives and return flow information and endpoints
+    """
+    try:
+        scanner = ArchiveScanner()
+        return scanner.scan_archive_flows()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error scanning MuleSoft archives: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error scanning MuleSoft archives: {str(e)}"
+        )
+
+
+@router.get("/mule/archives/dependencies", response_model=MuleDependencyScanResponse)
+async def get_archive_dependencies():
+    """
+    Scan all application archives and return dependency versions from their pom.xml
+    """
+    try:
+        scanner = ArchiveScanner()
+        return scanner.scan_archive_dependencies()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error scanning MuleSoft archives: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error scanning MuleSoft archives: {str(e)}"
+        )
@@ -0,0 +1,49 @@
+"""
+MuleSoft DataWeave script routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+import logging
+
+from app.services.dataweave_store import dataweave_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/mule/dataweave/duplicates")
+async def get_dataweave_duplicates(
+    min_occurrences: int = Query(2, ge=1, description="Minimum number of places a script is used"),
+    min_projects: int = Query(1, ge=1, description="Minimum number of projects using a script"),
+    limit: int = Query(100, ge=1, le=10000, description="Number of clusters to return")
+):
+    """
+    Get clusters of DataWeave scripts copied across flows, .dwl files and projects
+    """
+    try:
+        dataweave_store.refresh()
+        return dataweave_store.duplicates(min_occurrences, min_projects, limit)
+    except Exception as e:
+        logger.error(f"Error finding duplicate DataWeave scripts: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error finding duplicate DataWeave scripts: {str(e)}"
+        )
+
+
+@router.get("/mule/dataweave/scripts/{script_hash}")
+async def get_dataweave_script(script_hash: str):
+    """
+    Get a DataWeave script, its analysis and every flow or file using it
+    """
+    try:
+        dataweave_store.refresh()
+        return dataweave_store.get_script(script_hash)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting DataWeave script {script_hash}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error getting DataWeave script {script_hash}: {str(e)}"
+        )
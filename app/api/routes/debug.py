@@ -0,0 +1,81 @@
+"""
+Debug profiling routes, only mounted when PROFILING_ENABLED is set
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+import hmac
+import logging
+
+from app.config.settings import settings
+from app.services.scan_profiler import scan_profiler, ScanProfile, ProfileBusyError, PROFILERS
+
+logger = logging.getLogger(__name__)
+
+
+def require_profiling_token(x_profiling_token: Optional[str] = Header(None)) -> None:
+    """Reject profiling requests without the configured token"""
+    token = settings.get_profiling_token()
+    if token and not hmac.compare_digest(x_profiling_token or "", token):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Profiling-Token header")
+
+
+router = APIRouter(dependencies=[Depends(require_profiling_token)])
+
+
+def _render(profile: ScanProfile, output_format: str, view: str, limit: int):
+    """Render a profile as a JSON report or as collapsed stacks"""
+    if output_format == "collapsed":
+        try:
+            return PlainTextResponse(profile.collapsed(view))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return profile.summary(limit)
+
+
+@router.post("/debug/profile/scan")
+async def profile_scan(
+    project: Optional[str] = Query(None, description="Project to scan (the whole tree if omitted)"),
+    env: Optional[str] = Query(None, description="Environment used to resolve ${...} placeholders"),
+    profiler: str = Query("sampling", description="'sampling' or 'deterministic' (cProfile)"),
+    interval_ms: float = Query(1.0, ge=0.1, le=100, description="Milliseconds between stack samples"),
+    memory: bool = Query(True, description="Trace allocations with tracemalloc"),
+    output_format: str = Query("json", alias="format", description="'json' or 'collapsed'"),
+    view: str = Query("stacks", description="Collapsed view: 'stacks', 'files' or 'allocations'"),
+    limit: int = Query(30, ge=1, le=1000, description="Functions, files and allocation sites reported")
+):
+    """
+    Run one uncached scan under the profilers and return where time and memory went
+    """
+    if profiler not in PROFILERS:
+        raise HTTPException(status_code=400, detail=f"Unknown profiler {profiler}, expected one of {', '.join(PROFILERS)}")
+
+    try:
+        profile = await run_in_threadpool(scan_profiler.profile, project, env, profiler, interval_ms, memory)
+    except ProfileBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error profiling scan: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error profiling scan: {str(e)}"
+        )
+
+    return _render(profile, output_format, view, limit)
+
+
+@router.get("/debug/profile/last")
+async def get_last_profile(
+    output_format: str = Query("json", alias="format", description="'json' or 'collapsed'"),
+    view: str = Query("stacks", description="Collapsed view: 'stacks', 'files' or 'allocations'"),
+    limit: int = Query(30, ge=1, le=1000, description="Functions, files and allocation sites reported")
+):
+    """
+    Get the result of the last profiled scan, e.g. in another collapsed view
+    """
+    if scan_profiler.last_profile is None:
+        raise HTTPException(status_code=404, detail="No scan has been profiled yet")
+    return _render(scan_profiler.last_profile, output_format, view, limit)
@@ -0,0 +1,61 @@
+"""
+Columnar export routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from typing import Optional
+import os
+import tempfile
+import logging
+
+from app.services.columnar_export import ColumnarExporter, ExportUnavailableError, EXPORT_TABLES, EXPORT_FORMATS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+
+@router.get("/mule/export/{table}")
+async def export_table(
+    table: str,
+    format: str = Query("parquet", description="Export format: arrow (IPC stream) or parquet"),
+    env: Optional[str] = Query(None, description="Environment used to resolve ${...} placeholders")
+):
+    """
+    Export projects, flows, endpoints, processors or dependencies as a columnar table
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table {table}, expected one of {', '.join(EXPORT_TABLES)}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format {format}, expected arrow or parquet")
+
+    extension = EXPORT_FORMATS[format]
+    fd, path = tempfile.mkstemp(suffix=extension)
+    os.close(fd)
+
+    try:
+        exporter = ColumnarExporter()
+        exporter.export({table: path}, format, env)
+    except ExportUnavailableError as e:
+        os.unlink(path)
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        os.unlink(path)
+        logger.error(f"Error exporting {table}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error exporting {table}: {str(e)}"
+        )
+
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[format],
+        filename=f"{table}{extension}",
+        background=BackgroundTask(os.unlink, path)
+    )
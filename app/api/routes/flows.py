@@ -1,11 +1,26 @@
 """
 MuleSoft flow scanning routes
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import Any, Dict, Iterator, Optional
+import os
+import json
+import time
 import logging
 
-from app.models.flows import ProjectFlowsResponse
+from app.models.flows import ProjectFlowsResponse, FlowBatchRequest, FlowInfo
+from app.config.settings import settings
 from app.services.flow_scanner import FlowScanner
+from app.services.result_spool import ResultSpool
+from app.services.shared_store import shared_store
+from app.services.response_variants import encode_payload, response_variants
+from app.services.scan_cache import scan_cache
+from app.services.prewarm import prewarmer
+from app.services.sharding import shard_coordinator
+from app.services.endpoint_conflicts import endpoint_conflicts
+from app.utils.git_reader import validate_ref
 
 logger = logging.getLogger(__name__)
 
@@ -13,13 +28,55 @@ router = APIRouter()
 
 
 @router.get("/mule/flows", response_model=ProjectFlowsResponse)
-async def get_mule_flows():
+async def get_mule_flows(
+    env: Optional[str] = Query(None, description="Environment used to resolve ${...} placeholders"),
+    spool: bool = Query(False, description="Spool results to disk to keep memory flat on very large estates"),
+    ref: Optional[str] = Query(None, description="Git branch, tag or commit to scan instead of the working tree"),
+    deadline_ms: Optional[int] = Query(None, ge=1, description="Latency budget; stop and return partial results when it runs out"),
+    warm_remaining: Optional[bool] = Query(None, description="Scan projects skipped by the deadline into the cache in the background"),
+    accept_encoding: Optional[str] = Header(None)
+):
     """
     Scan all MuleSoft projects and return flow information and endpoints
+
+    Complete scans of the working tree are served from pre-compressed
+    variants matching Accept-Encoding, rebuilt when the scan cache changes.
     """
+    if ref:
+        try:
+            validate_ref(ref)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    deadline_ms = deadline_ms or settings.get_scan_deadline_ms()
+    if warm_remaining is None:
+        warm_remaining = settings.get_scan_deadline_warm_remaining()
+    
     try:
-        scanner = FlowScanner()
-        result = scanner.scan_project_flows()
+        if shard_coordinator.enabled:
+            return await run_in_threadpool(shard_coordinator.scan_flows, {
+                "env": env, "ref": ref, "deadline_ms": deadline_ms, "warm_remaining": warm_remaining
+            })
+        
+        if spool:
+            scanner = FlowScanner(use_cache=False, ref=ref, deadline_ms=deadline_ms)
+            result_spool = scanner.scan_project_flows_to_spool(env)
+            return StreamingResponse(_iter_spooled_response(result_spool), media_type="application/json")
+        
+        if not env and not ref:
+            response = shared_store.response("flows", accept_encoding)
+            if response is not None:
+                return response
+        
+        generation = scan_cache.kind_generation("flows")
+        scanner = FlowScanner(ref=ref, deadline_ms=deadline_ms)
+        result = scanner.scan_project_flows(env)
+        if result.partial and warm_remaining and not ref:
+            prewarmer.warm_remaining("flows", result.skipped_projects)
+        # Variants are kept for scans answered from the cache; a scan that parsed a flow file is sent as is
+        if not env and not ref and not result.partial and scan_cache.kind_generation("flows") == generation:
+            # Totals change when flow files are deleted, which does not bump the generation
+            key = (generation, result.total_projects, result.total_flows, result.total_endpoints)
+            return response_variants.response("flows", key, accept_encoding, lambda: encode_payload(result))
         return result
     except Exception as e:
         logger.error(f"Error scanning MuleSoft flows: {str(e)}")
@@ -29,14 +86,193 @@ async def get_mule_flows():
         )
 
 
+def _iter_spooled_response(result_spool: ResultSpool) -> Iterator[bytes]:
+    """
+    Write a ProjectFlowsResponse JSON body record by record from a spool
+    """
+    try:
+        totals = json.dumps(result_spool.metadata)[:-1]
+        yield f'{totals}, "projects": ['.encode("utf-8")
+        for index, record in enumerate(result_spool.iter_raw()):
+            yield b"," + record if index else record
+        yield b"]}"
+    finally:
+        result_spool.close()
+
+
+@router.get("/mule/flows/stream")
+async def stream_mule_flows(
+    env: Optional[str] = Query(None, description="Environment used to resolve ${...} placeholders"),
+    include_flows: bool = Query(False, description="Include each project's flows in its event"),
+    ref: Optional[str] = Query(None, description="Git branch, tag or commit to scan instead of the working tree")
+):
+    """
+    Stream scan progress as Server-Sent Events, one "project" event per scanned
+    project followed by a final "complete" event with the aggregate counts
+    """
+    if ref:
+        try:
+            validate_ref(ref)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        _iter_flow_events(FlowScanner(ref=ref), env, include_flows),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _iter_flow_events(scanner: FlowScanner, env: Optional[str], include_flows: bool) -> Iterator[str]:
+    """
+    Scan projects lazily and format each one as a Server-Sent Event
+
+    The scan only advances when the previous event has been sent, so a slow
+    client pauses the scan instead of results piling up on the server.
+    """
+    started = time.monotonic()
+    total_projects = 0
+    total_flows = 0
+    total_endpoints = 0
+
+    try:
+        for project_data in scanner.iter_project_flows(env):
+            if not project_data["flows"]:
+                continue
+
+            total_projects += 1
+            total_flows += project_data["total_flows"]
+            total_endpoints += project_data["total_endpoints"]
+
+            event = {
+                "project_name": project_data["project_name"],
+                "project_path": project_data["project_path"],
+                "total_flows": project_data["total_flows"],
+                "total_endpoints": project_data["total_endpoints"],
+                "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+                "projects_done": scanner.projects_done,
+                "projects_total": scanner.projects_total,
+                "running_total": {
+                    "total_projects": total_projects,
+                    "total_flows": total_flows,
+                    "total_endpoints": total_endpoints
+                }
+            }
+            if include_flows:
+                event["flows"] = project_data["flows"]
+
+            yield _format_event("project", event)
+
+    except Exception as e:
+        logger.error(f"Error streaming MuleSoft flows: {str(e)}")
+        yield _format_event("error", {"detail": f"Error scanning MuleSoft flows: {str(e)}"})
+        return
+
+    yield _format_event("complete", {
+        "total_projects": total_projects,
+        "total_flows": total_flows,
+        "total_endpoints": total_endpoints,
+        "files_parsed": scanner.files_parsed,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1)
+    })
+
+
+def _format_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/mule/flows/batch")
+async def get_flows_batch(request: FlowBatchRequest):
+    """
+    Get flows for many MuleSoft projects in one call, with per-project errors
+    """
+    max_projects = settings.get_flow_batch_max_projects()
+    if not request.projects:
+        raise HTTPException(status_code=400, detail="No projects requested")
+    if len(request.projects) > max_projects:
+        raise HTTPException(status_code=400, detail=f"At most {max_projects} projects can be requested at once")
+    
+    flow_fields = {name for name, field in FlowInfo.model_fields.items() if not field.exclude}
+    unknown_fields = set(request.fields or []) - flow_fields
+    if unknown_fields:
+        raise HTTPException(status_code=400, detail=f"Unknown flow fields: {', '.join(sorted(unknown_fields))}")
+    if request.ref:
+        try:
+            validate_ref(request.ref)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        started = time.monotonic()
+        scanner = FlowScanner(ref=request.ref)
+        results = scanner.get_projects_flows(request.projects, request.env)
+    except Exception as e:
+        logger.error(f"Error getting flows for projects: {str(e)}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error getting flows for projects: {str(e)}"
+        )
+    
+    name_filter = request.name_contains.lower() if request.name_contains else None
+    include = set(request.fields) if request.fields else None
+    projects = {}
+    for project_name, result in results.items():
+        if isinstance(result, Exception):
+            status_code = 404 if isinstance(result, ValueError) else 500
+            if status_code == 500:
+                logger.error(f"Error getting flows for project {project_name}: {str(result)}")
+            projects[project_name] = {"error": str(result), "status_code": status_code}
+            continue
+        
+        flows = [
+            flow for flow in result
+            if (name_filter is None or name_filter in flow.name.lower())
+            and (not request.with_endpoints_only or flow.endpoints)
+        ]
+        projects[project_name] = {
+            "flows": [flow.dict(include=include) for flow in flows],
+            "total_flows": len(flows),
+            "total_endpoints": sum(len(flow.endpoints) for flow in flows)
+        }
+    
+    return {
+        "total_projects": len(projects),
+        "total_errors": sum(1 for project in projects.values() if "error" in project),
+        "files_parsed": scanner.files_parsed,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        "projects": projects
+    }
+
+
 @router.get("/mule/flows/{project_name}")
-async def get_project_flows(project_name: str):
+async def get_project_flows(
+    project_name: str,
+    env: Optional[str] = Query(None, description="Environment used to resolve ${...} placeholders"),
+    ref: Optional[str] = Query(None, description="Git branch, tag or commit to scan instead of the working tree"),
+    listing: bool = Query(False, description="Only list flow and sub-flow names with their locations, without parsing")
+):
     """
     Get flows for a specific MuleSoft project
     """
+    if ref:
+        try:
+            validate_ref(ref)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if listing and ref:
+        raise HTTPException(status_code=400, detail="Listing is only available for the working tree")
+    
     try:
-        scanner = FlowScanner()
-        flows = scanner.get_project_flows(project_name)
+        scanner = FlowScanner(ref=ref)
+        if listing:
+            locations = scanner.get_project_flow_locations(project_name)
+            return {
+                "project_name": project_name,
+                "flows": [location.dict() for location in locations],
+                "total_flows": len(locations)
+            }
+        
+        flows = scanner.get_project_flows(project_name, env)
         return {
             "project_name": project_name,
             "flows": [flow.dict() for flow in flows],
@@ -53,18 +289,99 @@ async def get_project_flows(project_name: str):
         )
 
 
+@router.get("/mule/flows/{project_name}/{flow_name}")
+async def get_flow(
+    project_name: str,
+    flow_name: str,
+    env: Optional[str] = Query(None, description="Environment used to resolve ${...} placeholders")
+):
+    """
+    Get a single flow or sub-flow, parsing only its own element
+    """
+    try:
+        flow, location = FlowScanner().get_flow(project_name, flow_name, env)
+        return {
+            "project_name": project_name,
+            "flow": flow.dict(),
+            "location": location.dict()
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting flow {flow_name} of project {project_name}: {str(e)}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error getting flow {flow_name} of project {project_name}: {str(e)}"
+        )
+
+
+@router.get("/mule/flows/{project_name}/{flow_name}/source")
+async def get_flow_source(project_name: str, flow_name: str):
+    """
+    Get the XML source of a single flow or sub-flow
+    """
+    try:
+        scanner = FlowScanner()
+        location = scanner.find_flow_location(project_name, flow_name)
+        source = scanner.read_flow_source(location)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error reading flow {flow_name} of project {project_name}: {str(e)}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error reading flow {flow_name} of project {project_name}: {str(e)}"
+        )
+    
+    return Response(
+        content=source,
+        media_type="application/xml",
+        headers={
+            "X-Flow-File": os.path.basename(location.file_path),
+            "X-Flow-Lines": f"{location.start_line}-{location.end_line}"
+        }
+    )
+
+
 @router.get("/mule/endpoints/summary")
-async def get_endpoints_summary():
+async def get_endpoints_summary(
+    env: Optional[str] = Query(None, description="Environment used to resolve ${...} placeholders"),
+    ref: Optional[str] = Query(None, description="Git branch, tag or commit to scan instead of the working tree")
+):
     """
     Get a summary of all endpoints across all MuleSoft projects
     """
+    if ref:
+        try:
+            validate_ref(ref)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     try:
-        scanner = FlowScanner()
-        summary = scanner.get_endpoints_summary()
+        scanner = FlowScanner(ref=ref)
+        summary = scanner.get_endpoints_summary(env)
         return summary
     except Exception as e:
         logger.error(f"Error getting endpoints summary: {str(e)}")
         raise HTTPException(
             status_code=500, 
             detail=f"Error getting endpoints summary: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+
+@router.get("/mule/endpoints/conflicts")
+async def get_endpoint_conflicts(
+    env: Optional[str] = Query(None, description="Environment used to resolve ${...} placeholders"),
+    include_same_project: bool = Query(False, description="Also report endpoints claimed twice within one project")
+):
+    """
+    Find method and normalised path pairs claimed by more than one MuleSoft project
+    """
+    try:
+        endpoint_conflicts.refresh()
+        return endpoint_conflicts.conflicts(env, include_same_project)
+    except Exception as e:
+        logger.error(f"Error detecting endpoint conflicts: {str(e)}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error detecting endpoint conflicts: {str(e)}"
+        )
@@ -2,6 +2,12 @@
 Health check routes
 """
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services.scan_cache import scan_cache
+from app.services.shared_store import shared_store
+from app.services.prewarm import prewarmer
+from app.services.response_variants import response_variants
 
 router = APIRouter()
 
@@ -20,5 +26,32 @@ async def health_check():
     """Health check endpoint to verify the API is running"""
     return {
         "status": "healthy", 
-        "message": "API is running successfully"
+        "message": "API is running successfully",
+        "ready": prewarmer.is_ready(),
+        "scan": scan_cache.stats(),
+        "prewarm": prewarmer.stats(),
+        "shared_cache": {
+            "enabled": shared_store.enabled,
+            "generation": shared_store.generation,
+            "is_leader": shared_store.is_leader
+        },
+        "response_variants": response_variants.stats()
+    }
+
+
+@router.get("/ready", response_model=dict)
+async def readiness_check():
+    """Readiness endpoint that returns 503 until scan data is available"""
+    if not prewarmer.is_ready():
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "not ready",
+                "message": "Waiting for the first scan to complete",
+                "prewarm": prewarmer.stats()
+            }
+        )
+    return {
+        "status": "ready", 
+        "message": "Scan data is available"
     } 
\ No newline at end of file
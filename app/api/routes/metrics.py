@@ -0,0 +1,42 @@
+"""
+MuleSoft flow complexity metrics routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import logging
+
+from app.services.complexity_metrics import complexity_index, COMPLEXITY_FEATURES
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/mule/metrics/complexity")
+async def get_complexity_metrics(
+    sort_by: str = Query("score", description="Rank by 'score' or by a single feature"),
+    limit: int = Query(50, ge=1, le=10000, description="Number of flows to return"),
+    project: Optional[str] = Query(None, description="Only rank flows of this project"),
+    include_percentiles: bool = Query(True, description="Include per-project feature percentiles")
+):
+    """
+    Rank flows by complexity and return per-project percentiles of each feature
+    """
+    try:
+        complexity_index.refresh()
+        ranking = complexity_index.rank(sort_by, limit, project)
+        return {
+            "total_flows": len(complexity_index.flow_names),
+            "features": COMPLEXITY_FEATURES,
+            "sort_by": sort_by,
+            "flows": ranking,
+            "percentiles": complexity_index.percentiles() if include_percentiles else None
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing complexity metrics: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error computing complexity metrics: {str(e)}"
+        )
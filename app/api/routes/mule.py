@@ -1,11 +1,21 @@
 """
 MuleSoft dependency scanning routes
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
 import logging
 
 from app.models.dependencies import MuleDependencyScanResponse
 from app.services.mule_scanner import MuleProjectScanner
+from app.services.shared_store import shared_store
+from app.services.response_variants import encode_payload, response_variants
+from app.services.scan_cache import scan_cache
+from app.services.dependency_graph import dependency_graph
+from app.services.prewarm import prewarmer
+from app.services.sharding import shard_coordinator
+from app.config.settings import settings
+from app.utils.git_reader import validate_ref
 
 logger = logging.getLogger(__name__)
 
@@ -13,17 +23,90 @@ router = APIRouter()
 
 
 @router.get("/mule/dependencies", response_model=MuleDependencyScanResponse)
-async def get_mule_dependencies():
+async def get_mule_dependencies(
+    ref: Optional[str] = Query(None, description="Git branch, tag or commit to scan instead of the working tree"),
+    deadline_ms: Optional[int] = Query(None, ge=1, description="Latency budget; stop and return partial results when it runs out"),
+    warm_remaining: Optional[bool] = Query(None, description="Scan projects skipped by the deadline into the cache in the background"),
+    accept_encoding: Optional[str] = Header(None)
+):
     """
     Scan all MuleSoft projects and return dependency versions and related data
+
+    Complete scans of the working tree are served from pre-compressed
+    variants matching Accept-Encoding, rebuilt when the scan cache changes.
     """
+    if ref:
+        try:
+            validate_ref(ref)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    deadline_ms = deadline_ms or settings.get_scan_deadline_ms()
+    if warm_remaining is None:
+        warm_remaining = settings.get_scan_deadline_warm_remaining()
+    
     try:
-        scanner = MuleProjectScanner()
+        if shard_coordinator.enabled:
+            return await run_in_threadpool(shard_coordinator.scan_dependencies, {
+                "ref": ref, "deadline_ms": deadline_ms, "warm_remaining": warm_remaining
+            })
+        
+        if not ref:
+            response = shared_store.response("dependencies", accept_encoding)
+            if response is not None:
+                return response
+        
+        generation = scan_cache.kind_generation("pom")
+        scanner = MuleProjectScanner(ref=ref, deadline_ms=deadline_ms)
         result = scanner.scan_projects()
+        if result.partial and warm_remaining and not ref:
+            prewarmer.warm_remaining("dependencies", result.skipped_projects)
+        # Variants are kept for scans answered from the cache; a scan that parsed a pom.xml is sent as is
+        if not ref and not result.partial and scan_cache.kind_generation("pom") == generation:
+            # A deleted pom.xml does not bump the generation but changes the project count
+            key = (generation, result.total_projects)
+            return response_variants.response("dependencies", key, accept_encoding, lambda: encode_payload(result))
         return result
     except Exception as e:
         logger.error(f"Error scanning MuleSoft projects: {str(e)}")
         raise HTTPException(
             status_code=500, 
             detail=f"Error scanning MuleSoft projects: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+
+@router.get("/mule/dependencies/graph")
+async def get_dependency_graph():
+    """
+    Get the topological layers of the project-to-project dependency graph
+    """
+    try:
+        dependency_graph.refresh()
+        return dependency_graph.summary()
+    except Exception as e:
+        logger.error(f"Error building dependency graph: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error building dependency graph: {str(e)}"
+        )
+
+
+@router.get("/mule/dependencies/impact/{project_name}")
+async def get_dependency_impact(
+    project_name: str,
+    max_depth: Optional[int] = Query(None, ge=1, description="Only follow this many dependency hops")
+):
+    """
+    Get every project depending on a project directly or transitively,
+    e.g. to evaluate bumping a shared library
+    """
+    try:
+        dependency_graph.refresh()
+        return dependency_graph.impact(project_name, max_depth)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error computing dependency impact: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error computing dependency impact: {str(e)}"
+        )
@@ -0,0 +1,39 @@
+"""
+MuleSoft structural flow query routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import time
+import logging
+
+from app.services.structure_query import structure_index
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/mule/query")
+async def query_flows(
+    q: str = Query(..., min_length=1, description="Structural query, e.g. 'foreach//db:select' or '!until-successful//http:request'"),
+    limit: int = Query(100, ge=1, le=10000, description="Number of flows to return"),
+    project: Optional[str] = Query(None, description="Only return flows of this project")
+):
+    """
+    Find flows by element structure: patterns of nested elements combined with and, or and not
+    """
+    try:
+        started = time.monotonic()
+        structure_index.refresh()
+        result = structure_index.query(q, limit, project)
+        result["elapsed_ms"] = round((time.monotonic() - started) * 1000, 3)
+        result.update(structure_index.stats())
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error querying flows: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error querying flows: {str(e)}"
+        )
@@ -0,0 +1,78 @@
+"""
+Background MuleSoft scan job routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+import logging
+
+from app.models.scans import ScanJobRequest, ScanJobStatus
+from app.services.scan_jobs import scan_jobs, ScanQueueFullError
+from app.services.quarantine import file_quarantine
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/mule/scans", response_model=ScanJobStatus, status_code=202)
+async def start_scan(request: ScanJobRequest = None):
+    """
+    Start a background scan of all MuleSoft projects
+    """
+    request = request or ScanJobRequest()
+    try:
+        job = scan_jobs.submit(request.kind, request.env)
+        return job.to_status()
+    except ScanQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+
+@router.get("/mule/scans", response_model=List[ScanJobStatus])
+async def list_scans():
+    """
+    List queued, running and recently finished scan jobs
+    """
+    return [job.to_status(include_result=False) for job in scan_jobs.list()]
+
+
+@router.get("/mule/scans/{job_id}", response_model=ScanJobStatus)
+async def get_scan(
+    job_id: str,
+    include_result: bool = Query(True, description="Include the scan result once the job has completed")
+):
+    """
+    Get status, progress and results of a scan job
+    """
+    job = scan_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Scan job {job_id} not found")
+    return job.to_status(include_result)
+
+
+@router.delete("/mule/scans/{job_id}", response_model=ScanJobStatus)
+async def cancel_scan(job_id: str):
+    """
+    Cancel a queued or running scan job
+    """
+    job = scan_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Scan job {job_id} not found")
+    return job.to_status(include_result=False)
+
+
+@router.get("/mule/scan/errors")
+async def get_scan_errors(
+    kind: Optional[str] = Query(None, description="Only list 'flow' or 'pom' files")
+):
+    """
+    List files quarantined after failing to parse or exceeding the parsing limits;
+    they are skipped by scans until they change on disk
+    """
+    if kind is not None and kind not in ("flow", "pom"):
+        raise HTTPException(status_code=400, detail=f"Unknown file kind {kind}, expected 'flow' or 'pom'")
+    
+    files = file_quarantine.entries(kind)
+    return {
+        "total_files": len(files),
+        "files": files
+    }
@@ -0,0 +1,39 @@
+"""
+MuleSoft flow search routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import time
+import logging
+
+from app.services.search_index import search_index
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/mule/search")
+async def search_flows(
+    q: str = Query(..., min_length=1, description="Words to find in flow names, labels, attributes, logger messages and DataWeave scripts"),
+    limit: int = Query(50, ge=1, le=1000, description="Number of hits to return"),
+    project: Optional[str] = Query(None, description="Only search flows of this project")
+):
+    """
+    Search flow contents and return ranked hits pointing to project, file and flow
+    """
+    try:
+        started = time.monotonic()
+        search_index.refresh()
+        result = search_index.search(q, limit, project)
+        result["elapsed_ms"] = round((time.monotonic() - started) * 1000, 3)
+        result.update(search_index.stats())
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching flows: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error searching flows: {str(e)}"
+        )
@@ -0,0 +1,54 @@
+"""
+Sharded scanning routes
+"""
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+import logging
+
+from app.config.settings import settings
+from app.services.sharding import shard_coordinator, owned_projects
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/mule/shard")
+async def get_shard():
+    """
+    Get the shard scanned by this instance
+    """
+    try:
+        return {
+            "shard_index": settings.get_shard_index(),
+            "shard_count": settings.get_shard_count(),
+            "projects_owned": len(owned_projects()),
+            "coordinator": shard_coordinator.enabled
+        }
+    except Exception as e:
+        logger.error(f"Error getting shard information: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error getting shard information: {str(e)}"
+        )
+
+
+@router.get("/mule/shards")
+async def get_shards():
+    """
+    Get the status of every shard worker of this coordinator
+    """
+    if not shard_coordinator.enabled:
+        raise HTTPException(status_code=404, detail="This instance is not a shard coordinator (SHARD_URLS is not set)")
+
+    shards = await run_in_threadpool(shard_coordinator.shards)
+    answering = [shard for shard in shards if shard["status"] == "ok"]
+    shard_counts = {shard["shard_count"] for shard in answering}
+    shard_indexes = sorted(shard["shard_index"] for shard in answering if shard["shard_index"] is not None)
+    return {
+        "total_shards": len(shards),
+        "missing_shards": len(shards) - len(answering),
+        # Every worker answers, agrees on the shard count and serves a distinct index
+        "consistent": shard_counts == {len(shards)} and shard_indexes == list(range(len(shards))),
+        "shards": shards
+    }
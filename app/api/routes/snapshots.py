@@ -0,0 +1,64 @@
+"""
+MuleSoft scan snapshot and diff routes
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+import logging
+
+from app.models.snapshots import SnapshotInfo, SnapshotDiff
+from app.services.snapshot_store import snapshot_store
+from app.utils.git_reader import validate_ref
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/mule/snapshots", response_model=SnapshotInfo, status_code=201)
+async def create_snapshot(
+    ref: Optional[str] = Query(None, description="Git branch, tag or commit to scan instead of the working tree")
+):
+    """
+    Scan all MuleSoft projects and store the result as a snapshot
+    """
+    if ref:
+        try:
+            validate_ref(ref)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return snapshot_store.create(ref)
+    except Exception as e:
+        logger.error(f"Error creating snapshot: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error creating snapshot: {str(e)}"
+        )
+
+
+@router.get("/mule/snapshots", response_model=List[SnapshotInfo])
+async def list_snapshots():
+    """
+    List stored snapshots, oldest first
+    """
+    return snapshot_store.list_snapshots()
+
+
+@router.get("/mule/diff", response_model=SnapshotDiff)
+async def diff_snapshots(
+    from_snapshot: str = Query("previous", alias="from", description="Older snapshot id, \"latest\" or \"previous\""),
+    to_snapshot: str = Query("latest", alias="to", description="Newer snapshot id, \"latest\" or \"previous\"")
+):
+    """
+    Get endpoints, flows, processor counts and dependency versions changed between two snapshots
+    """
+    try:
+        return snapshot_store.diff(from_snapshot, to_snapshot)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error comparing snapshots: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error comparing snapshots: {str(e)}"
+        )
@@ -0,0 +1,116 @@
+"""
+Command line interface for Mule Cracks
+
+Usage:
+    python -m app.cli export --output ./export --format parquet
+    python -m app.cli snapshot
+    python -m app.cli loadtest --projects 200 --concurrency 50 --requests 5000
+"""
+import argparse
+import json
+import logging
+import sys
+
+from app.config.settings import settings
+from app.services.columnar_export import ColumnarExporter, ExportUnavailableError, EXPORT_TABLES, EXPORT_FORMATS
+from app.services.snapshot_store import SnapshotStore
+from app.services.load_harness import run_load_test, DEFAULT_MIX, SERVER_MODES
+
+
+def export_command(args: argparse.Namespace) -> int:
+    """Export scan results as columnar tables"""
+    tables = args.tables.split(",") if args.tables else EXPORT_TABLES
+    try:
+        exporter = ColumnarExporter(args.mule_directory, batch_size=args.batch_size)
+        paths = exporter.export_to_directory(args.output, tables, args.format, args.env)
+    except (ExportUnavailableError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(paths, indent=2))
+    return 0
+
+
+def snapshot_command(args: argparse.Namespace) -> int:
+    """Store the current scan as a snapshot"""
+    store = SnapshotStore(args.directory)
+    snapshot = store.create(args.ref, args.mule_directory)
+    print(snapshot.json(indent=2))
+    return 0
+
+
+def loadtest_command(args: argparse.Namespace) -> int:
+    """Drive a concurrent request mix against the API and report latencies"""
+    try:
+        report = run_load_test(
+            mix=args.mix,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            duration=args.duration,
+            projects=args.projects,
+            flows_per_project=args.flows_per_project,
+            mule_directory=args.mule_directory,
+            server=args.server,
+            url=args.url,
+            seed=args.seed
+        )
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line argument parser"""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=settings.API_DESCRIPTION)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export flows, endpoints, processors and dependencies")
+    export_parser.add_argument("--output", "-o", required=True, help="Output directory")
+    export_parser.add_argument("--format", "-f", choices=sorted(EXPORT_FORMATS), default="parquet")
+    export_parser.add_argument("--tables", help=f"Comma-separated tables ({','.join(EXPORT_TABLES)})")
+    export_parser.add_argument("--env", help="Environment used to resolve ${...} placeholders")
+    export_parser.add_argument("--mule-directory", help="MuleSoft projects directory (defaults to MULE_DIRECTORY)")
+    export_parser.add_argument("--batch-size", type=int, default=10000, help="Rows per record batch")
+    export_parser.set_defaults(func=export_command)
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Store the current scan as a content-addressed snapshot")
+    snapshot_parser.add_argument("--ref", help="Git branch, tag or commit to scan instead of the working tree")
+    snapshot_parser.add_argument("--directory", help="Snapshot directory (defaults to SNAPSHOT_DIRECTORY)")
+    snapshot_parser.add_argument("--mule-directory", help="MuleSoft projects directory (defaults to MULE_DIRECTORY)")
+    snapshot_parser.set_defaults(func=snapshot_command)
+
+    loadtest_parser = subparsers.add_parser("loadtest", help="Load-test the API against a synthetic estate")
+    loadtest_parser.add_argument("--mix", default=DEFAULT_MIX,
+                                 help="Weighted request kinds (flows, project, summary, dependencies)")
+    loadtest_parser.add_argument("--concurrency", "-c", type=int, default=50, help="Concurrent clients")
+    loadtest_parser.add_argument("--requests", "-n", type=int, default=1000, help="Total requests")
+    loadtest_parser.add_argument("--duration", "-d", type=float, help="Seconds to run instead of a request count")
+    loadtest_parser.add_argument("--projects", type=int, default=50, help="Projects in the generated estate")
+    loadtest_parser.add_argument("--flows-per-project", type=int, default=10, help="Flows per generated project")
+    loadtest_parser.add_argument("--mule-directory", help="Use an existing projects directory instead of generating one")
+    loadtest_parser.add_argument("--server", choices=SERVER_MODES, default="thread",
+                                 help="Run the API in a thread of this process or as a uvicorn child process")
+    loadtest_parser.add_argument("--url", help="Base URL of an already running API (no local server is started)")
+    loadtest_parser.add_argument("--seed", type=int, default=42, help="Random seed of the estate and request sequence")
+    loadtest_parser.add_argument("--output", "-o", help="Also write the JSON report to this file")
+    loadtest_parser.set_defaults(func=loadtest_command)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """Run the command line interface"""
+    logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 Application configuration settings
 """
 import os
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings:
@@ -21,6 +21,66 @@ class Settings:
     # MuleSoft Projects Configuration
     MULE_DIRECTORY: str = "/Users/gelvy-mondestin.myssie-bingha/Documents/mule"
     
+    # Environment names recognised in property file names (e.g. config-prod.yaml)
+    PROPERTY_ENVIRONMENTS: str = "local,dev,test,qa,uat,stage,staging,preprod,prod,production"
+    
+    # Background Scan Jobs Configuration
+    SCAN_JOB_WORKERS: int = 2
+    SCAN_JOB_QUEUE_SIZE: int = 8
+    SCAN_JOB_HISTORY: int = 50
+    
+    # Scan Deadline Configuration
+    SCAN_DEADLINE_MS: Optional[int] = None
+    SCAN_DEADLINE_WARM_REMAINING: bool = False
+    
+    # Sharded Scanning Configuration
+    SHARD_INDEX: Optional[int] = None
+    SHARD_COUNT: int = 1
+    SHARD_URLS: str = ""
+    SHARD_TIMEOUT_SECONDS: int = 60
+    
+    # Batch Flow Lookup Configuration
+    FLOW_BATCH_WORKERS: int = 8
+    FLOW_BATCH_MAX_PROJECTS: int = 200
+    
+    # Spooled Scan Configuration
+    SCAN_SPOOL_MEMORY_BYTES: int = 8 * 1024 * 1024
+    SCAN_SPOOL_DIRECTORY: Optional[str] = None
+    
+    # Shared Multi-Worker Cache Configuration
+    SHARED_CACHE_DIRECTORY: Optional[str] = None
+    SHARED_CACHE_REFRESH_SECONDS: int = 300
+    
+    # Startup Configuration
+    PREWARM_ON_STARTUP: bool = False
+    PREWARM_MAX_ATTEMPTS: int = 3
+    PREWARM_RETRY_SECONDS: int = 10
+    
+    # Application Archive Configuration
+    ARCHIVE_DIRECTORY: Optional[str] = None
+    ARCHIVE_SCAN_WORKERS: int = os.cpu_count() or 1
+    
+    # Scan Snapshot Configuration
+    SNAPSHOT_DIRECTORY: str = "./snapshots"
+    
+    # XML Parsing Limits
+    XML_MAX_FILE_BYTES: int = 16 * 1024 * 1024
+    XML_MAX_DEPTH: int = 256
+    XML_PARSE_TIMEOUT_MS: int = 10000
+    
+    # Pre-compressed Response Configuration
+    RESPONSE_COMPRESSION_ENCODINGS: str = "zstd,br,gzip"
+    RESPONSE_GZIP_LEVEL: int = 9
+    RESPONSE_BROTLI_LEVEL: int = 9
+    RESPONSE_ZSTD_LEVEL: int = 15
+    
+    # APIkit Specification Configuration
+    APIKIT_SPEC_CACHE_DOCUMENTS: int = 256
+    
+    # Debug Profiling Configuration
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: Optional[str] = None
+    
     # Logging Configuration
     LOG_LEVEL: str = "INFO"
     
@@ -29,6 +89,162 @@ class Settings:
         """Get MuleSoft projects directory path"""
         return os.getenv("MULE_DIRECTORY", cls.MULE_DIRECTORY)
     
+    @classmethod
+    def get_property_environments(cls) -> List[str]:
+        """Get environment names recognised in property file names"""
+        value = os.getenv("PROPERTY_ENVIRONMENTS", cls.PROPERTY_ENVIRONMENTS)
+        return [env.strip().lower() for env in value.split(",") if env.strip()]
+    
+    @classmethod
+    def get_scan_job_workers(cls) -> int:
+        """Get number of scan jobs that run concurrently"""
+        return int(os.getenv("SCAN_JOB_WORKERS", cls.SCAN_JOB_WORKERS))
+    
+    @classmethod
+    def get_scan_job_queue_size(cls) -> int:
+        """Get number of scan jobs that may wait for a free worker"""
+        return int(os.getenv("SCAN_JOB_QUEUE_SIZE", cls.SCAN_JOB_QUEUE_SIZE))
+    
+    @classmethod
+    def get_scan_job_history(cls) -> int:
+        """Get number of finished scan jobs kept for status queries"""
+        return int(os.getenv("SCAN_JOB_HISTORY", cls.SCAN_JOB_HISTORY))
+    
+    @classmethod
+    def get_scan_deadline_ms(cls) -> Optional[int]:
+        """Get default latency budget of /mule/flows and /mule/dependencies scans (no deadline if unset)"""
+        value = os.getenv("SCAN_DEADLINE_MS", cls.SCAN_DEADLINE_MS)
+        return int(value) if value else None
+    
+    @classmethod
+    def get_scan_deadline_warm_remaining(cls) -> bool:
+        """Get whether projects skipped by a deadline are scanned into the cache in the background"""
+        return os.getenv("SCAN_DEADLINE_WARM_REMAINING", str(cls.SCAN_DEADLINE_WARM_REMAINING)).lower() == "true"
+    
+    @classmethod
+    def get_shard_index(cls) -> Optional[int]:
+        """Get index of the shard scanned by this worker instance (not sharded if unset)"""
+        value = os.getenv("SHARD_INDEX", cls.SHARD_INDEX)
+        return int(value) if value not in (None, "") else None
+    
+    @classmethod
+    def get_shard_count(cls) -> int:
+        """Get total number of shards"""
+        return int(os.getenv("SHARD_COUNT", cls.SHARD_COUNT))
+    
+    @classmethod
+    def get_shard_urls(cls) -> List[str]:
+        """Get base URLs of the shard workers when this instance is a coordinator"""
+        urls = os.getenv("SHARD_URLS", cls.SHARD_URLS)
+        return [url.strip() for url in urls.split(",") if url.strip()]
+    
+    @classmethod
+    def get_shard_timeout_seconds(cls) -> int:
+        """Get seconds a coordinator waits for each shard"""
+        return int(os.getenv("SHARD_TIMEOUT_SECONDS", cls.SHARD_TIMEOUT_SECONDS))
+    
+    @classmethod
+    def get_flow_batch_workers(cls) -> int:
+        """Get number of projects parsed concurrently by a batch flow lookup"""
+        return int(os.getenv("FLOW_BATCH_WORKERS", cls.FLOW_BATCH_WORKERS))
+    
+    @classmethod
+    def get_flow_batch_max_projects(cls) -> int:
+        """Get maximum number of projects in one batch flow lookup"""
+        return int(os.getenv("FLOW_BATCH_MAX_PROJECTS", cls.FLOW_BATCH_MAX_PROJECTS))
+    
+    @classmethod
+    def get_scan_spool_memory_bytes(cls) -> int:
+        """Get bytes of spooled scan results kept in memory before spilling to disk"""
+        return int(os.getenv("SCAN_SPOOL_MEMORY_BYTES", cls.SCAN_SPOOL_MEMORY_BYTES))
+    
+    @classmethod
+    def get_scan_spool_directory(cls) -> Optional[str]:
+        """Get directory for spooled scan results (system temp directory if unset)"""
+        return os.getenv("SCAN_SPOOL_DIRECTORY", cls.SCAN_SPOOL_DIRECTORY)
+    
+    @classmethod
+    def get_shared_cache_directory(cls) -> Optional[str]:
+        """Get directory of scan snapshots shared by all workers (disabled if unset)"""
+        return os.getenv("SHARED_CACHE_DIRECTORY", cls.SHARED_CACHE_DIRECTORY)
+    
+    @classmethod
+    def get_shared_cache_refresh_seconds(cls) -> int:
+        """Get seconds between scans by the worker publishing shared snapshots"""
+        return int(os.getenv("SHARED_CACHE_REFRESH_SECONDS", cls.SHARED_CACHE_REFRESH_SECONDS))
+    
+    @classmethod
+    def get_prewarm_on_startup(cls) -> bool:
+        """Get whether the scan cache is warmed in the background at startup"""
+        return os.getenv("PREWARM_ON_STARTUP", str(cls.PREWARM_ON_STARTUP)).lower() == "true"
+    
+    @classmethod
+    def get_prewarm_max_attempts(cls) -> int:
+        """Get number of pre-warm scans tried before giving up"""
+        return int(os.getenv("PREWARM_MAX_ATTEMPTS", cls.PREWARM_MAX_ATTEMPTS))
+    
+    @classmethod
+    def get_prewarm_retry_seconds(cls) -> int:
+        """Get seconds before the first pre-warm retry (doubled for each further retry)"""
+        return int(os.getenv("PREWARM_RETRY_SECONDS", cls.PREWARM_RETRY_SECONDS))
+    
+    @classmethod
+    def get_archive_directory(cls) -> Optional[str]:
+        """Get directory of MuleSoft application archives (.jar)"""
+        return os.getenv("ARCHIVE_DIRECTORY", cls.ARCHIVE_DIRECTORY)
+    
+    @classmethod
+    def get_archive_scan_workers(cls) -> int:
+        """Get number of processes parsing archives in parallel"""
+        return int(os.getenv("ARCHIVE_SCAN_WORKERS", cls.ARCHIVE_SCAN_WORKERS))
+    
+    @classmethod
+    def get_snapshot_directory(cls) -> str:
+        """Get directory of content-addressed scan snapshots"""
+        return os.getenv("SNAPSHOT_DIRECTORY", cls.SNAPSHOT_DIRECTORY)
+    
+    @classmethod
+    def get_xml_max_file_bytes(cls) -> int:
+        """Get size above which flow and pom.xml files are quarantined without being parsed (0: no limit)"""
+        return int(os.getenv("XML_MAX_FILE_BYTES", cls.XML_MAX_FILE_BYTES))
+    
+    @classmethod
+    def get_xml_max_depth(cls) -> int:
+        """Get deepest element nesting accepted when parsing XML files"""
+        return int(os.getenv("XML_MAX_DEPTH", cls.XML_MAX_DEPTH))
+    
+    @classmethod
+    def get_xml_parse_timeout_ms(cls) -> int:
+        """Get time budget for parsing one XML file (0: no limit)"""
+        return int(os.getenv("XML_PARSE_TIMEOUT_MS", cls.XML_PARSE_TIMEOUT_MS))
+    
+    @classmethod
+    def get_response_compression_encodings(cls) -> List[str]:
+        """Get Content-Encodings of pre-compressed scan responses, in order of preference"""
+        value = os.getenv("RESPONSE_COMPRESSION_ENCODINGS", cls.RESPONSE_COMPRESSION_ENCODINGS)
+        return [encoding.strip().lower() for encoding in value.split(",") if encoding.strip()]
+    
+    @classmethod
+    def get_response_compression_level(cls, encoding: str) -> int:
+        """Get compression level used for one Content-Encoding ("gzip", "br" or "zstd")"""
+        name = {"gzip": "RESPONSE_GZIP_LEVEL", "br": "RESPONSE_BROTLI_LEVEL", "zstd": "RESPONSE_ZSTD_LEVEL"}[encoding]
+        return int(os.getenv(name, getattr(cls, name)))
+    
+    @classmethod
+    def get_apikit_spec_cache_documents(cls) -> int:
+        """Get number of parsed RAML/OAS documents kept in memory, shared across projects"""
+        return int(os.getenv("APIKIT_SPEC_CACHE_DOCUMENTS", cls.APIKIT_SPEC_CACHE_DOCUMENTS))
+    
+    @classmethod
+    def get_profiling_enabled(cls) -> bool:
+        """Get whether the debug profiling endpoints are mounted"""
+        return os.getenv("PROFILING_ENABLED", str(cls.PROFILING_ENABLED)).lower() == "true"
+    
+    @classmethod
+    def get_profiling_token(cls) -> Optional[str]:
+        """Get token required in the X-Profiling-Token header of profiling requests"""
+        return os.getenv("PROFILING_TOKEN", cls.PROFILING_TOKEN)
+    
     @classmethod
     def get_host(cls) -> str:
         """Get server host"""
@@ -7,6 +7,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.config.settings import settings
 from app.api.router import router
+from app.services.scan_jobs import scan_jobs
+from app.services.shared_store import shared_store
+from app.services.prewarm import prewarmer
+from app.services.git_source import git_sources
 
 # Configure logging
 logging.basicConfig(
@@ -40,12 +44,18 @@ app.include_router(router)
 async def startup_event():
     """Application startup event"""
     logging.info("Starting Mule Cracks")
+    shared_store.start()
+    if settings.get_prewarm_on_startup() and not shared_store.enabled:
+        prewarmer.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
     logging.info("Shutting down Mule Cracks")
+    scan_jobs.shutdown()
+    shared_store.stop()
+    git_sources.close_all()
 
 
 if __name__ == "__main__":
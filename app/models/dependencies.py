@@ -30,4 +30,7 @@ class ProjectInfo(BaseModel):
 class MuleDependencyScanResponse(BaseModel):
     """Model for the complete dependency scan response"""
     total_projects: int
-    projects: List[ProjectInfo] 
\ No newline at end of file
+    projects: List[ProjectInfo]
+    partial: bool = False  # True if the scan deadline ran out before every project was scanned
+    skipped_projects: List[str] = []
+    missing_shards: List[str] = []  # Shard URLs that did not answer a coordinator
\ No newline at end of file
@@ -1,8 +1,8 @@
 """
 Pydantic models for MuleSoft flow and endpoint data
 """
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Tuple
 
 
 class EndpointInfo(BaseModel):
@@ -13,6 +13,26 @@ class EndpointInfo(BaseModel):
     doc_id: Optional[str] = None
     config_ref: Optional[str] = None
     listener_config: Optional[Dict[str, Any]] = None
+    element: Optional[str] = Field(default=None, exclude=True)  # Source element, None if derived from the flow name
+
+
+class FlowMetrics(BaseModel):
+    """Model for numeric complexity features recorded while parsing a flow"""
+    max_depth: int = 0  # Deepest nesting of processors inside other processors
+    choice_branches: int = 0  # when/otherwise branches across all choice routers
+    foreach_count: int = 0
+    scatter_gather_routes: int = 0
+    error_handler_count: int = 0  # on-error-* handlers, including those in error-handler blocks
+    flow_refs: List[str] = []  # Names referenced by flow-ref elements at any depth
+
+
+class FlowContent(BaseModel):
+    """Model for text and structure of a flow, parsed on first use by the flow indexes"""
+    texts: Dict[str, List[str]] = {}  # field (name, doc:name, attribute, logger, dataweave, text) -> values
+    element_paths: List[str] = []  # Distinct ancestry paths of every element, e.g. "flow/foreach/db:select"
+    scripts: List[Tuple[str, str]] = []  # Inline DataWeave scripts as (target, script), e.g. ("variable:id", "...")
+    script_resources: List[Tuple[str, str]] = []  # DataWeave resource files as (target, resource path)
+    apikit_configs: List[str] = []  # config-ref of apikit:router elements in the flow
 
 
 class FlowInfo(BaseModel):
@@ -24,6 +44,18 @@ class FlowInfo(BaseModel):
     processors_found: List[str]  # List of processor names found in the flow
     error_handlers: List[str]
     sub_flows: List[str]
+    metrics: Optional[FlowMetrics] = Field(default=None, exclude=True)
+
+
+class FlowLocation(BaseModel):
+    """Model for the location of a flow or sub-flow element in its file"""
+    name: str
+    kind: str  # "flow" or "sub-flow"
+    file_path: str
+    start_byte: int  # Offset of the opening "<"
+    end_byte: int  # Offset just past the closing ">"
+    start_line: int
+    end_line: int
 
 
 class ProjectFlowsResponse(BaseModel):
@@ -31,4 +63,17 @@ class ProjectFlowsResponse(BaseModel):
     total_projects: int
     total_flows: int
     total_endpoints: int
-    projects: List[Dict[str, Any]] 
\ No newline at end of file
+    projects: List[Dict[str, Any]]
+    partial: bool = False  # True if the scan deadline ran out before every project was scanned
+    skipped_projects: List[str] = []
+    missing_shards: List[str] = []  # Shard URLs that did not answer a coordinator
+
+
+class FlowBatchRequest(BaseModel):
+    """Model for a request to get the flows of many projects at once"""
+    projects: List[str]
+    env: Optional[str] = None
+    ref: Optional[str] = None
+    fields: Optional[List[str]] = None  # Flow fields to return (all if None)
+    name_contains: Optional[str] = None  # Only flows whose name contains this text (case-insensitive)
+    with_endpoints_only: bool = False  # Only flows exposing at least one endpoint
@@ -0,0 +1,33 @@
+"""
+Pydantic models for background scan jobs
+"""
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional, Dict, Any, Literal
+
+
+class ScanJobRequest(BaseModel):
+    """Model for a request to start a background scan"""
+    kind: Literal["flows", "dependencies"] = "flows"
+    env: Optional[str] = None
+
+
+class ScanJobProgress(BaseModel):
+    """Model for the progress of a background scan"""
+    projects_done: int
+    projects_total: int
+    files_parsed: int
+
+
+class ScanJobStatus(BaseModel):
+    """Model for the status of a background scan"""
+    id: str
+    kind: str
+    env: Optional[str] = None
+    status: str  # queued, running, completed, failed or cancelled
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    progress: ScanJobProgress
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
@@ -0,0 +1,75 @@
+"""
+Pydantic models for scan snapshots and the differences between them
+"""
+from datetime import datetime
+from pydantic import BaseModel
+from typing import List, Optional, Dict
+
+
+class SnapshotInfo(BaseModel):
+    """Model for a stored scan snapshot"""
+    id: str
+    created_at: datetime
+    ref: Optional[str] = None
+    root: str
+    total_projects: int
+    total_flows: int
+    objects_written: int
+
+
+class FlowChange(BaseModel):
+    """Model for a flow added or removed, identified by its file and name"""
+    flow_name: str
+    file_path: str  # Relative to the project directory
+
+
+class EndpointChange(BaseModel):
+    """Model for an endpoint added to or removed from a flow"""
+    flow_name: str
+    file_path: str
+    method: Optional[str] = None
+    path: Optional[str] = None
+
+
+class ProcessorCountChange(BaseModel):
+    """Model for a flow whose processor count changed"""
+    flow_name: str
+    file_path: str
+    before: int
+    after: int
+
+
+class DependencyChange(BaseModel):
+    """Model for a dependency added, removed or changed version"""
+    group_id: str
+    artifact_id: str
+    classifier: Optional[str] = None
+    before: Optional[str] = None  # None if added
+    after: Optional[str] = None  # None if removed
+
+
+class ProjectDiff(BaseModel):
+    """Model for the changes to one project between two snapshots"""
+    project_name: str
+    files_added: List[str] = []
+    files_removed: List[str] = []
+    files_changed: List[str] = []
+    flows_added: List[FlowChange] = []
+    flows_removed: List[FlowChange] = []
+    endpoints_added: List[EndpointChange] = []
+    endpoints_removed: List[EndpointChange] = []
+    processors_changed: List[ProcessorCountChange] = []
+    dependencies_changed: List[DependencyChange] = []
+    attributes_changed: Dict[str, Dict[str, Optional[str]]] = {}
+
+
+class SnapshotDiff(BaseModel):
+    """Model for the differences between two snapshots"""
+    from_snapshot: str
+    to_snapshot: str
+    identical: bool
+    projects_added: List[ProjectDiff]  # Everything in the project reported as added
+    projects_removed: List[ProjectDiff]  # Everything in the project reported as removed
+    projects_changed: List[ProjectDiff]
+    objects_compared: int
+    elapsed_ms: float
@@ -0,0 +1,374 @@
+"""
+Service for cross-checking APIkit RAML/OAS specifications against implemented flows
+"""
+import os
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from app.config.settings import settings
+from app.models.flows import FlowInfo
+from app.services.endpoint_conflicts import normalize_path, parse_attributes, read_flow_text
+from app.services.flow_scanner import FlowScanner
+from app.services.scan_cache import ScanCache, scan_cache
+from app.utils.api_spec_parser import (
+    ApiSpecParser, SPEC_EXTENSIONS, SPEC_SNIFF_BYTES, parse_document, sniff_spec_type
+)
+from app.utils.flow_parser import FlowParser
+
+logger = logging.getLogger(__name__)
+
+# Directory holding APIkit specifications, relative to a project
+API_DIRECTORY = os.path.join("src", "main", "resources", "api")
+
+APIKIT_CONFIG_PATTERN = re.compile(r"<apikit:config\b([^>]*)>")
+
+
+class ApikitCoverage:
+    """
+    Parses APIkit specifications and compares their operations with the APIkit flows
+
+    Parsed documents are kept in an LRU keyed by the SHA-256 of their
+    content, so a large spec (or fragment) copied into many projects is
+    parsed once. Resource/method tables are cached per root spec file and
+    reused while none of the files they were built from changed.
+    """
+
+    def __init__(self, max_documents: Optional[int] = None):
+        """
+        Initialize the service
+
+        Args:
+            max_documents: Parsed documents kept in memory (APIKIT_SPEC_CACHE_DOCUMENTS if None)
+        """
+        self.max_documents = max_documents or settings.get_apikit_spec_cache_documents()
+        self._lock = threading.Lock()
+        self._documents: "OrderedDict[str, Any]" = OrderedDict()
+        self.documents_parsed = 0
+        self.document_hits = 0
+
+    def coverage(self, project: Optional[str] = None, mule_directory: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the APIkit coverage of one or all projects
+
+        Args:
+            project: Project to report (every project if None)
+            mule_directory: MuleSoft projects directory (defaults to MULE_DIRECTORY)
+
+        Returns:
+            Dictionary with operation totals, per-project reports and spec cache statistics
+        """
+        scanner = FlowScanner(mule_directory)
+        if project is not None:
+            scanner.get_project_path(project)
+            project_names = [project]
+        else:
+            project_names = scanner.list_project_names()
+
+        projects = []
+        for project_name in project_names:
+            report = self.project_coverage(scanner, project_name)
+            if project is not None or report["apis"] or report["unused_specs"] or report["errors"]:
+                projects.append(report)
+
+        total_operations = sum(api["total_operations"] for project in projects for api in project["apis"])
+        implemented = sum(api["implemented_operations"] for project in projects for api in project["apis"])
+        return {
+            "total_projects": len(projects),
+            "total_operations": total_operations,
+            "implemented_operations": implemented,
+            "coverage": round(100.0 * implemented / total_operations, 1) if total_operations else None,
+            "total_unimplemented": sum(len(api["unimplemented"]) for project in projects for api in project["apis"]),
+            "total_orphan_flows": sum(len(api["orphan_flows"]) for project in projects for api in project["apis"]),
+            "projects": projects,
+            "spec_cache": self.stats()
+        }
+
+    def project_coverage(self, scanner: FlowScanner, project_name: str) -> Dict[str, Any]:
+        """
+        Compare the specifications of a project with its APIkit flows
+
+        APIkit flows ("method:\\path[:content-type]:config") are grouped by
+        their APIkit configuration, whose api/raml attribute names the spec.
+        A project with a single spec and no matching configuration is checked
+        against that spec.
+
+        Args:
+            scanner: FlowScanner of the projects directory
+            project_name: Name of the project
+
+        Returns:
+            Dictionary with one report per APIkit configuration, unused specs and spec errors
+        """
+        project_path = os.path.join(scanner.mule_directory, project_name)
+        specs = self.find_specs(project_path)
+        configs = self._apikit_configs(project_path)
+
+        # apikit config -> APIkit flows routed by it
+        flows_by_config: Dict[str, List[Tuple[FlowInfo, str, str]]] = {}
+        for flow in scanner.get_project_flows(project_name):
+            for endpoint in flow.endpoints:
+                if endpoint.element is not None or not endpoint.method or endpoint.path is None:
+                    continue
+                config = flow.name.rsplit(":", 1)[-1]
+                if config not in configs and len(configs) == 1:
+                    config = next(iter(configs))
+                flows_by_config.setdefault(config, []).append((flow, endpoint.method.upper(), endpoint.path))
+
+        # apikit config -> spec path relative to the api directory
+        spec_of: Dict[str, Optional[str]] = {
+            config: self._match_spec(api, specs) for config, api in configs.items()
+        }
+        for config in flows_by_config:
+            if config not in spec_of:
+                spec_of[config] = next(iter(specs)) if len(specs) == 1 else None
+
+        apis = []
+        errors = []
+        used_specs = set()
+        for config in sorted(spec_of):
+            spec = spec_of[config]
+            table = None
+            if spec is not None:
+                used_specs.add(spec)
+                try:
+                    table = self.get_spec_table(os.path.join(project_path, API_DIRECTORY, spec), specs[spec])
+                except (OSError, ValueError, yaml.YAMLError) as e:
+                    logger.error(f"Error parsing API specification {spec} of {project_name}: {str(e)}")
+                    errors.append({"spec": spec, "error": str(e)})
+            apis.append(self._compare(config, configs.get(config), spec, table, flows_by_config.get(config, [])))
+
+        return {
+            "project_name": project_name,
+            "apis": apis,
+            "unused_specs": sorted(set(specs) - used_specs),
+            "errors": errors
+        }
+
+    def find_specs(self, project_path: str) -> Dict[str, str]:
+        """
+        Find the root RAML/OAS specifications of a project
+
+        Files are recognised from their first bytes; fragments, libraries,
+        examples and schemas are skipped. Results are cached per file.
+
+        Args:
+            project_path: Path to the MuleSoft project
+
+        Returns:
+            Dictionary of spec path (relative to the api directory) to "raml" or "oas"
+        """
+        api_directory = os.path.join(project_path, API_DIRECTORY)
+        specs: Dict[str, str] = {}
+        for root, dirs, files in os.walk(api_directory):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for file_name in sorted(files):
+                if os.path.splitext(file_name)[1].lower() not in SPEC_EXTENSIONS:
+                    continue
+                file_path = os.path.join(root, file_name)
+                fingerprint = ScanCache.fingerprint(file_path)
+                spec_type = scan_cache.get("api-spec-type", file_path, fingerprint)
+                if spec_type is None:
+                    try:
+                        with open(file_path, 'rb') as f:
+                            spec_type = sniff_spec_type(f.read(SPEC_SNIFF_BYTES), file_path) or ""
+                    except OSError as e:
+                        logger.error(f"Error reading {file_path}: {str(e)}")
+                        continue
+                    scan_cache.put("api-spec-type", file_path, fingerprint, spec_type)
+                if spec_type:
+                    specs[os.path.relpath(file_path, api_directory).replace(os.sep, "/")] = spec_type
+        return specs
+
+    def get_spec_table(self, spec_path: str, spec_type: str) -> Dict[str, Any]:
+        """
+        Get the resource/method table of a root specification
+
+        The table is cached with the fingerprint of every file it was built
+        from (root, !include fragments, libraries, $ref files) and rebuilt
+        when any of them changes.
+
+        Args:
+            spec_path: Path to the root spec file
+            spec_type: "raml" or "oas"
+
+        Returns:
+            Dictionary with the spec type, title, version and (method, path) operations
+        """
+        fingerprint = ScanCache.fingerprint(spec_path)
+        cached = scan_cache.get("api-spec", spec_path, fingerprint)
+        if cached is not None:
+            dependencies, table = cached
+            if all(ScanCache.fingerprint(path) == dependency for path, dependency in dependencies.items()):
+                return table
+
+        parser = ApiSpecParser(self.load_document)
+        table = parser.parse(spec_path, spec_type)
+        dependencies = {path: ScanCache.fingerprint(path) for path in parser.dependencies}
+        scan_cache.put("api-spec", spec_path, fingerprint, (dependencies, table))
+        return table
+
+    def load_document(self, file_path: str) -> Any:
+        """
+        Get the parsed document of a spec file
+
+        The content digest is cached per file path, and parsed documents per
+        digest, so identical files in several projects share one parse.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Parsed document
+        """
+        fingerprint = ScanCache.fingerprint(file_path)
+        if fingerprint is None:
+            raise FileNotFoundError(f"{file_path} not found")
+
+        content = None
+        digest = scan_cache.get("api-spec-digest", file_path, fingerprint)
+        if digest is None:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            digest = hashlib.sha256(content).hexdigest()
+            scan_cache.put("api-spec-digest", file_path, fingerprint, digest)
+
+        with self._lock:
+            if digest in self._documents:
+                self._documents.move_to_end(digest)
+                self.document_hits += 1
+                return self._documents[digest]
+
+        if content is None:
+            with open(file_path, 'rb') as f:
+                content = f.read()
+        document = parse_document(content, file_path)
+
+        with self._lock:
+            self.documents_parsed += 1
+            self._documents[digest] = document
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+        return document
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get statistics of the parsed document cache
+
+        Returns:
+            Dictionary with documents cached, parsed and served from the cache
+        """
+        with self._lock:
+            return {
+                "documents_cached": len(self._documents),
+                "documents_parsed": self.documents_parsed,
+                "document_hits": self.document_hits
+            }
+
+    @staticmethod
+    def _compare(config: str, api: Optional[str], spec: Optional[str], table: Optional[Dict[str, Any]],
+                 flows: List[Tuple[FlowInfo, str, str]]) -> Dict[str, Any]:
+        """
+        Compare the operations of a spec with the flows of its APIkit configuration
+
+        Args:
+            config: Name of the APIkit configuration
+            api: api/raml attribute of the configuration (None if not declared)
+            spec: Spec path relative to the api directory (None if not found)
+            table: Resource/method table of the spec (None if not found or unparseable)
+            flows: (flow, method, path) of the APIkit flows of the configuration
+
+        Returns:
+            Coverage report of the configuration
+        """
+        implemented: Dict[Tuple[str, str], List[str]] = {}
+        for flow, method, path in flows:
+            implemented.setdefault((method, normalize_path(path)), []).append(flow.name)
+
+        operations = table["operations"] if table else []
+        declared = {(method, normalize_path(path)) for method, path in operations}
+        unimplemented = [
+            {"method": method, "path": path}
+            for method, path in operations if (method, normalize_path(path)) not in implemented
+        ]
+        orphan_flows = [] if table is None else [
+            {"flow_name": flow.name, "method": method, "path": path, "file_path": flow.file_path}
+            for flow, method, path in flows if (method, normalize_path(path)) not in declared
+        ]
+
+        total = len(operations)
+        return {
+            "config": config,
+            "api": api,
+            "spec": spec,
+            "spec_type": table["type"] if table else None,
+            "title": table["title"] if table else None,
+            "version": table["version"] if table else None,
+            "total_operations": total,
+            "implemented_operations": total - len(unimplemented),
+            "coverage": round(100.0 * (total - len(unimplemented)) / total, 1) if total else None,
+            "total_flows": len(flows),
+            "unimplemented": unimplemented,
+            "orphan_flows": orphan_flows
+        }
+
+    @staticmethod
+    def _match_spec(api: Optional[str], specs: Dict[str, str]) -> Optional[str]:
+        """
+        Find the spec named by the api/raml attribute of an APIkit configuration
+
+        Exchange references ("resource::group:asset:version:raml:zip:orders.raml")
+        are matched on their file name.
+
+        Args:
+            api: Attribute value
+            specs: Root specs of the project
+
+        Returns:
+            Spec path relative to the api directory, or None if not found
+        """
+        if not api:
+            return next(iter(specs)) if len(specs) == 1 else None
+        path = api.replace("\\", "/").split(":")[-1].lstrip("/")
+        if path.startswith("api/"):
+            path = path[len("api/"):]
+        if path in specs:
+            return path
+        matches = [spec for spec in specs if os.path.basename(spec) == os.path.basename(path)]
+        return matches[0] if len(matches) == 1 else None
+
+    @staticmethod
+    def _apikit_configs(project_path: str) -> Dict[str, Optional[str]]:
+        """
+        Get the APIkit configurations of a project
+
+        Results are cached per flow file until it changes.
+
+        Args:
+            project_path: Path to the MuleSoft project
+
+        Returns:
+            Dictionary of configuration name to its api (Mule 4) or raml (Mule 3) attribute
+        """
+        configs: Dict[str, Optional[str]] = {}
+        for flow_file in FlowParser.find_flow_files(project_path):
+            fingerprint = ScanCache.fingerprint(flow_file)
+            file_configs = scan_cache.get("apikit-configs", flow_file, fingerprint)
+            if file_configs is None:
+                file_configs = {}
+                for match in APIKIT_CONFIG_PATTERN.finditer(read_flow_text(flow_file, fingerprint) or ""):
+                    attributes = parse_attributes(match.group(1))
+                    if attributes.get("name"):
+                        file_configs[attributes["name"]] = attributes.get("api") or attributes.get("raml")
+                scan_cache.put("apikit-configs", flow_file, fingerprint, file_configs)
+            configs.update(file_configs)
+        return configs
+
+
+# Global APIkit coverage instance
+apikit_coverage = ApikitCoverage()
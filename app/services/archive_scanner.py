@@ -0,0 +1,215 @@
+"""
+Service for scanning packaged MuleSoft application archives (.jar)
+"""
+import os
+import glob
+import hashlib
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models.flows import ProjectFlowsResponse, FlowInfo
+from app.models.dependencies import ProjectInfo, MuleDependencyScanResponse
+from app.utils.archive_reader import ArchiveReader
+from app.utils.flow_parser import FlowParser
+from app.utils.xml_parser import XMLParser
+from app.services.mule_scanner import MuleProjectScanner
+from app.services.scan_cache import ScanCache, Fingerprint
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def scan_archive(archive_path: str) -> Tuple[List[FlowInfo], Optional[ProjectInfo]]:
+    """
+    Parse the flows and pom.xml of one archive
+
+    Runs in worker processes, so it only takes and returns picklable values.
+
+    Args:
+        archive_path: Path to the .jar file
+
+    Returns:
+        Tuple of (list of FlowInfo objects, ProjectInfo or None)
+    """
+    flows = []
+    project_info = None
+
+    with ArchiveReader(archive_path) as reader:
+        for entry in reader.find_flow_entries():
+            try:
+                with reader.open(entry) as stream:
+                    flows.extend(FlowParser.parse_flow_content(stream, reader.entry_path(entry)))
+            except Exception as e:
+                logger.error(f"Error parsing flow entry {reader.entry_path(entry)}: {str(e)}")
+
+        pom_entry = reader.find_pom_entry()
+        if pom_entry:
+            with reader.open(pom_entry) as stream:
+                pom_data = XMLParser.parse_pom_content(stream, reader.entry_path(pom_entry))
+            if pom_data:
+                try:
+                    project_info = MuleProjectScanner().build_project_info(
+                        pom_data, reader.project_name, archive_path
+                    )
+                except Exception as e:
+                    logger.error(f"Error processing pom of archive {archive_path}: {str(e)}")
+
+    return flows, project_info
+
+
+class ArchiveScanner:
+    """Service class for scanning MuleSoft application archives in parallel"""
+
+    # Shared across instances: archive checksum -> scan result
+    _results: Dict[str, Tuple[List[FlowInfo], Optional[ProjectInfo]]] = {}
+    # archive path -> (fingerprint, checksum), so unchanged archives are not re-hashed
+    _checksums: Dict[str, Tuple[Fingerprint, str]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, archive_directory: str = None, max_workers: int = None):
+        """
+        Initialize the scanner with the archive directory
+
+        Args:
+            archive_directory: Directory containing .jar files
+            max_workers: Number of processes parsing archives in parallel
+        """
+        self.archive_directory = archive_directory or settings.get_archive_directory()
+        self.max_workers = max_workers or settings.get_archive_scan_workers()
+        if not self.archive_directory:
+            raise ValueError("ARCHIVE_DIRECTORY is not configured")
+
+    def scan_archives(self) -> List[Tuple[str, List[FlowInfo], Optional[ProjectInfo]]]:
+        """
+        Scan all archives, parsing only those whose checksum has not been seen
+
+        Returns:
+            List of (archive path, list of FlowInfo objects, ProjectInfo or None)
+        """
+        archives = sorted(glob.glob(os.path.join(self.archive_directory, "*.jar")))
+        checksums = {path: self._checksum(path) for path in archives}
+
+        pending = sorted({
+            checksum: path for path, checksum in checksums.items() if checksum not in self._results
+        }.items())
+
+        if pending:
+            if self.max_workers > 1 and len(pending) > 1:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                    results = executor.map(self._safe_scan, [path for _, path in pending])
+                    parsed = list(zip([checksum for checksum, _ in pending], results))
+            else:
+                parsed = [(checksum, self._safe_scan(path)) for checksum, path in pending]
+
+            with self._lock:
+                for checksum, result in parsed:
+                    if result is not None:
+                        self._results[checksum] = result
+
+        with self._lock:
+            scanned = [
+                (path, *self._results[checksums[path]])
+                for path in archives if checksums[path] in self._results
+            ]
+            self._evict(set(archives))
+
+        return scanned
+
+    def _evict(self, archives: Set[str]) -> None:
+        """
+        Forget removed archives of this directory and results no archive has anymore
+
+        Must be called with the lock held.
+
+        Args:
+            archives: Paths of the archives currently in the directory
+        """
+        directory = os.path.abspath(self.archive_directory)
+        for path in [path for path in self._checksums if path not in archives]:
+            if os.path.dirname(os.path.abspath(path)) == directory:
+                del self._checksums[path]
+
+        live = {checksum for _, checksum in self._checksums.values()}
+        for checksum in [checksum for checksum in self._results if checksum not in live]:
+            del self._results[checksum]
+
+    def scan_archive_flows(self) -> ProjectFlowsResponse:
+        """
+        Scan all archives and extract flow information
+
+        Returns:
+            ProjectFlowsResponse with one project per archive
+        """
+        projects = []
+        total_flows = 0
+        total_endpoints = 0
+
+        for archive_path, flows, _ in self.scan_archives():
+            if not flows:
+                continue
+            project_endpoints = sum(len(flow.endpoints) for flow in flows)
+            projects.append({
+                "project_name": os.path.splitext(os.path.basename(archive_path))[0],
+                "project_path": archive_path,
+                "flows": [flow.dict() for flow in flows],
+                "total_flows": len(flows),
+                "total_endpoints": project_endpoints
+            })
+            total_flows += len(flows)
+            total_endpoints += project_endpoints
+
+        return ProjectFlowsResponse(
+            total_projects=len(projects),
+            total_flows=total_flows,
+            total_endpoints=total_endpoints,
+            projects=projects
+        )
+
+    def scan_archive_dependencies(self) -> MuleDependencyScanResponse:
+        """
+        Scan all archives and extract dependency information from their pom.xml
+
+        Returns:
+            MuleDependencyScanResponse with one project per archive
+        """
+        projects = [project for _, _, project in self.scan_archives() if project]
+        return MuleDependencyScanResponse(
+            total_projects=len(projects),
+            projects=projects
+        )
+
+    @staticmethod
+    def _safe_scan(archive_path: str) -> Optional[Tuple[List[FlowInfo], Optional[ProjectInfo]]]:
+        """Scan an archive, logging and skipping archives that cannot be read"""
+        try:
+            return scan_archive(archive_path)
+        except Exception as e:
+            logger.error(f"Error scanning archive {archive_path}: {str(e)}")
+            return None
+
+    def _checksum(self, archive_path: str) -> str:
+        """
+        Get the SHA-256 checksum of an archive, re-hashing only when the file changed
+
+        Args:
+            archive_path: Path to the .jar file
+
+        Returns:
+            Hex digest of the archive contents
+        """
+        fingerprint = ScanCache.fingerprint(archive_path)
+        cached = self._checksums.get(archive_path)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        with open(archive_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        checksum = digest.hexdigest()
+
+        with self._lock:
+            self._checksums[archive_path] = (fingerprint, checksum)
+        return checksum
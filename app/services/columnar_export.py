@@ -0,0 +1,318 @@
+"""
+Service for exporting scan results as columnar Arrow IPC and Parquet tables
+"""
+import os
+import logging
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+from app.config.processors import get_processor_category
+from app.services.flow_scanner import FlowScanner
+from app.services.mule_scanner import MuleProjectScanner
+
+logger = logging.getLogger(__name__)
+
+EXPORT_TABLES = ["projects", "flows", "endpoints", "processors", "dependencies"]
+EXPORT_FORMATS = {"arrow": ".arrows", "parquet": ".parquet"}
+
+# Column name and type of each table; "dictionary" columns are dictionary-encoded strings
+TABLE_COLUMNS = {
+    "projects": [
+        ("project_name", "string"),
+        ("project_path", "string"),
+        ("group_id", "string"),
+        ("artifact_id", "string"),
+        ("version", "string"),
+        ("packaging", "dictionary"),
+        ("app_runtime", "dictionary"),
+        ("mule_maven_plugin_version", "dictionary"),
+        ("total_flows", "int32"),
+        ("total_endpoints", "int32"),
+    ],
+    "flows": [
+        ("project_name", "dictionary"),
+        ("flow_name", "string"),
+        ("file_path", "string"),
+        ("processors_count", "int32"),
+        ("endpoints_count", "int32"),
+        ("error_handlers_count", "int32"),
+        ("sub_flows_count", "int32"),
+    ],
+    "endpoints": [
+        ("project_name", "dictionary"),
+        ("flow_name", "string"),
+        ("name", "string"),
+        ("method", "dictionary"),
+        ("path", "string"),
+        ("config_ref", "dictionary"),
+        ("doc_id", "string"),
+    ],
+    "processors": [
+        ("project_name", "dictionary"),
+        ("flow_name", "string"),
+        ("position", "int32"),
+        ("processor", "dictionary"),
+        ("category", "dictionary"),
+    ],
+    "dependencies": [
+        ("project_name", "dictionary"),
+        ("group_id", "dictionary"),
+        ("artifact_id", "dictionary"),
+        ("version", "dictionary"),
+        ("classifier", "dictionary"),
+        ("scope", "dictionary"),
+    ],
+}
+
+
+class ExportUnavailableError(Exception):
+    """Raised when the optional pyarrow dependency is not installed"""
+
+
+class _TableWriter:
+    """Accumulates rows column by column and writes them out in record batches"""
+
+    def __init__(self, table: str, sink: Any, export_format: str, batch_size: int):
+        """
+        Initialize a writer for one table
+
+        Args:
+            table: Name of the table
+            sink: File path or writable file object
+            export_format: "arrow" or "parquet"
+            batch_size: Number of rows per record batch
+        """
+        self.columns = TABLE_COLUMNS[table]
+        self.batch_size = batch_size
+        self.rows = 0
+        self._values: List[List[Any]] = [[] for _ in self.columns]
+        # Per-column vocabulary of dictionary-encoded values, shared by all batches
+        self._vocabularies: List[Dict[str, int]] = [{} for _ in self.columns]
+        self.schema = pa.schema([
+            (name, self._arrow_type(column_type)) for name, column_type in self.columns
+        ])
+
+        if export_format == "parquet":
+            self._writer = pq.ParquetWriter(sink, self.schema)
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_stream(sink, self.schema, options=options)
+
+    @staticmethod
+    def _arrow_type(column_type: str) -> "pa.DataType":
+        """Map a column type name to an Arrow type"""
+        if column_type == "dictionary":
+            return pa.dictionary(pa.int32(), pa.string())
+        if column_type == "int32":
+            return pa.int32()
+        return pa.string()
+
+    def append(self, *row: Any) -> None:
+        """
+        Append a row, flushing a record batch when the batch is full
+
+        Args:
+            row: Column values in table column order
+        """
+        for values, value in zip(self._values, row):
+            values.append(value)
+        self.rows += 1
+        if len(self._values[0]) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows as a record batch"""
+        if not self._values[0]:
+            return
+
+        arrays = []
+        for (name, column_type), values, vocabulary in zip(self.columns, self._values, self._vocabularies):
+            if column_type == "dictionary":
+                indices = [
+                    None if value is None else vocabulary.setdefault(value, len(vocabulary))
+                    for value in values
+                ]
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(indices, type=pa.int32()),
+                    pa.array(list(vocabulary), type=pa.string())
+                ))
+            else:
+                arrays.append(pa.array(values, type=self.schema.field(name).type))
+
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self._values = [[] for _ in self.columns]
+
+    def close(self) -> None:
+        """Flush remaining rows and finish the file"""
+        self.flush()
+        self._writer.close()
+
+
+class ColumnarExporter:
+    """Service class for exporting flows, endpoints, processors and dependencies as columnar tables"""
+
+    def __init__(self, mule_directory: str = None, batch_size: int = 10000):
+        """
+        Initialize the exporter
+
+        Args:
+            mule_directory: Path to MuleSoft projects directory
+            batch_size: Number of rows per record batch
+        """
+        if pa is None:
+            raise ExportUnavailableError("Columnar export requires pyarrow (pip install pyarrow)")
+        self.mule_directory = mule_directory
+        self.batch_size = batch_size
+
+    def export(self, sinks: Dict[str, Any], export_format: str = "parquet", env: Optional[str] = None) -> Dict[str, int]:
+        """
+        Scan all projects and write the requested tables
+
+        Args:
+            sinks: Mapping of table name to file path or writable file object
+            export_format: "arrow" (IPC stream) or "parquet"
+            env: Environment used to resolve ${...} placeholders in endpoints
+
+        Returns:
+            Mapping of table name to number of rows written
+        """
+        unknown = set(sinks) - set(EXPORT_TABLES)
+        if unknown:
+            raise ValueError(f"Unknown export tables: {', '.join(sorted(unknown))}")
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+
+        writers = {
+            table: _TableWriter(table, sink, export_format, self.batch_size)
+            for table, sink in sinks.items()
+        }
+
+        try:
+            projects = {}
+            if "projects" in writers or "dependencies" in writers:
+                projects = self._write_dependencies(writers.get("dependencies"))
+            if writers.keys() & {"projects", "flows", "endpoints", "processors"}:
+                self._write_flows(writers, projects, env)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        return {table: writer.rows for table, writer in writers.items()}
+
+    def export_to_directory(self, directory: str, tables: List[str] = None,
+                            export_format: str = "parquet", env: Optional[str] = None) -> Dict[str, str]:
+        """
+        Write each table to its own file in a directory
+
+        Args:
+            directory: Output directory (created if missing)
+            tables: Tables to export (all tables if None)
+            export_format: "arrow" (IPC stream) or "parquet"
+            env: Environment used to resolve ${...} placeholders in endpoints
+
+        Returns:
+            Mapping of table name to written file path
+        """
+        os.makedirs(directory, exist_ok=True)
+        extension = EXPORT_FORMATS.get(export_format, "")
+        paths = {
+            table: os.path.join(directory, f"{table}{extension}")
+            for table in (tables or EXPORT_TABLES)
+        }
+        self.export(paths, export_format, env)
+        return paths
+
+    def _write_dependencies(self, writer: Optional[_TableWriter]) -> Dict[str, Any]:
+        """
+        Write dependency rows straight from the dependency scanner
+
+        Args:
+            writer: Dependencies table writer, or None to only collect project info
+
+        Returns:
+            Mapping of project name to ProjectInfo, used for the projects table
+        """
+        projects = {}
+        for project in MuleProjectScanner(self.mule_directory).iter_projects():
+            projects[project.project_name] = project
+            if writer is None:
+                continue
+            for dependency in project.dependencies:
+                writer.append(
+                    project.project_name,
+                    dependency.group_id,
+                    dependency.artifact_id,
+                    dependency.version,
+                    dependency.classifier,
+                    dependency.scope
+                )
+        return projects
+
+    def _write_flows(self, writers: Dict[str, _TableWriter], projects: Dict[str, Any], env: Optional[str]) -> None:
+        """
+        Write project, flow, endpoint and processor rows straight from the flow scanner
+
+        Args:
+            writers: Table writers by table name
+            projects: ProjectInfo by project name from the dependency scan
+            env: Environment used to resolve ${...} placeholders in endpoints
+        """
+        project_writer = writers.get("projects")
+        flow_writer = writers.get("flows")
+        endpoint_writer = writers.get("endpoints")
+        processor_writer = writers.get("processors")
+
+        scanner = FlowScanner(self.mule_directory)
+        for project_name, project_dir, flows in scanner.iter_project_flow_infos(env):
+            if project_writer:
+                info = projects.get(project_name)
+                project_writer.append(
+                    project_name,
+                    project_dir,
+                    info.group_id if info else None,
+                    info.artifact_id if info else None,
+                    info.version if info else None,
+                    info.packaging if info else None,
+                    info.app_runtime if info else None,
+                    info.mule_maven_plugin_version if info else None,
+                    len(flows),
+                    sum(len(flow.endpoints) for flow in flows)
+                )
+
+            for flow in flows:
+                if flow_writer:
+                    flow_writer.append(
+                        project_name,
+                        flow.name,
+                        flow.file_path,
+                        flow.processors_count,
+                        len(flow.endpoints),
+                        len(flow.error_handlers),
+                        len(flow.sub_flows)
+                    )
+                if endpoint_writer:
+                    for endpoint in flow.endpoints:
+                        endpoint_writer.append(
+                            project_name,
+                            flow.name,
+                            endpoint.name,
+                            endpoint.method,
+                            endpoint.path,
+                            endpoint.config_ref,
+                            endpoint.doc_id
+                        )
+                if processor_writer:
+                    for position, processor in enumerate(flow.processors_found):
+                        processor_writer.append(
+                            project_name,
+                            flow.name,
+                            position,
+                            processor,
+                            get_processor_category(processor)
+                        )
@@ -0,0 +1,250 @@
+"""
+Service for ranking flows by complexity across all MuleSoft projects
+"""
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.flow_scanner import FlowScanner
+from app.services.scan_cache import scan_cache
+
+logger = logging.getLogger(__name__)
+
+# Feature columns, in array column order
+COMPLEXITY_FEATURES = [
+    "processors_count",
+    "max_depth",
+    "choice_branches",
+    "foreach_count",
+    "scatter_gather_routes",
+    "error_handler_count",
+    "has_error_handler",
+    "flow_ref_fan_out",
+    "flow_ref_fan_in",
+]
+
+PERCENTILES = [50, 90, 99]
+
+
+class ComplexityIndex:
+    """
+    Column-oriented table of flow complexity features for the whole estate
+
+    Rows are the flows of every project; sub-flows are not ranked, so
+    flow-refs pointing at a sub-flow count towards the caller's fan-out but
+    not towards any fan-in.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._lock = threading.Lock()
+        self._signature = None
+        self.project_names: List[str] = []
+        self.flow_names: List[str] = []
+        self.file_paths: List[str] = []
+        self.project_codes = np.zeros(0, dtype=np.int32)
+        self.features = np.zeros((0, len(COMPLEXITY_FEATURES)), dtype=np.float64)
+        self.scores = np.zeros(0, dtype=np.float64)
+        self._percentiles: Optional[Dict[str, Dict[str, Dict[str, float]]]] = None
+
+    def refresh(self, scanner: FlowScanner = None) -> None:
+        """
+        Scan all projects and rebuild the feature arrays if any flow file changed
+
+        Unchanged files are served from the scan cache; the arrays and
+        percentiles are only rebuilt when parsed flows were stored since the
+        last refresh or a project gained or lost flows (e.g. a deleted file).
+        Other cached kinds, such as flow locations, do not trigger a rebuild.
+
+        Args:
+            scanner: FlowScanner to use (a new one if None)
+        """
+        scanner = scanner or FlowScanner()
+        projects = list(scanner.iter_project_flow_infos())
+        signature = (scan_cache.kind_generation("flows"), tuple((name, len(flows)) for name, _, flows in projects))
+
+        with self._lock:
+            if signature == self._signature:
+                return
+            self._build(projects)
+            self._signature = signature
+
+    def _build(self, projects: List[Any]) -> None:
+        """
+        Build the feature arrays from scanned projects
+
+        Args:
+            projects: Tuples of (project name, project path, list of FlowInfo objects)
+        """
+        project_names = []
+        project_codes = []
+        flow_names = []
+        file_paths = []
+        rows = []
+        flow_index: Dict[tuple, int] = {}
+        ref_targets: List[tuple] = []
+
+        for code, (project_name, _, flows) in enumerate(projects):
+            project_names.append(project_name)
+            for flow in flows:
+                metrics = flow.metrics
+                flow_refs = metrics.flow_refs if metrics else flow.sub_flows
+                flow_index.setdefault((code, flow.name), len(flow_names))
+                ref_targets.extend((code, name) for name in flow_refs)
+
+                project_codes.append(code)
+                flow_names.append(flow.name)
+                file_paths.append(flow.file_path)
+                rows.append((
+                    flow.processors_count,
+                    metrics.max_depth if metrics else 0,
+                    metrics.choice_branches if metrics else 0,
+                    metrics.foreach_count if metrics else 0,
+                    metrics.scatter_gather_routes if metrics else 0,
+                    metrics.error_handler_count if metrics else 0,
+                    1 if flow.error_handlers or (metrics and metrics.error_handler_count) else 0,
+                    len(flow_refs),
+                    0,
+                ))
+
+        features = np.array(rows, dtype=np.float64).reshape(len(rows), len(COMPLEXITY_FEATURES))
+
+        # Fan-in: number of flow-refs in the same project pointing at each flow (refs to sub-flows have no row)
+        targets = np.fromiter(
+            (flow_index.get(target, -1) for target in ref_targets), dtype=np.int64, count=len(ref_targets)
+        )
+        targets = targets[targets >= 0]
+        features[:, COMPLEXITY_FEATURES.index("flow_ref_fan_in")] = np.bincount(targets, minlength=len(rows))
+
+        self.project_names = project_names
+        self.project_codes = np.array(project_codes, dtype=np.int32)
+        self.flow_names = flow_names
+        self.file_paths = file_paths
+        self.features = features
+        self.scores = self._compute_scores(features)
+        self._percentiles = None
+
+    @staticmethod
+    def _compute_scores(features: np.ndarray) -> np.ndarray:
+        """
+        Combine features into a single score: the sum of per-feature z-scores
+
+        Error handler coverage lowers the score, every other feature raises it.
+
+        Args:
+            features: Feature matrix (flows x features)
+
+        Returns:
+            Score per flow
+        """
+        if not len(features):
+            return np.zeros(0, dtype=np.float64)
+
+        std = features.std(axis=0)
+        z_scores = (features - features.mean(axis=0)) / np.where(std > 0, std, 1.0)
+        z_scores[:, COMPLEXITY_FEATURES.index("has_error_handler")] *= -1
+        return z_scores.sum(axis=1)
+
+    def rank(self, sort_by: str = "score", limit: int = 50, project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most complex flows
+
+        Args:
+            sort_by: "score" or a feature name
+            limit: Maximum number of flows returned
+            project: Only rank flows of this project
+
+        Returns:
+            List of flows with their score and features, most complex first
+        """
+        if sort_by == "score":
+            values = self.scores
+        elif sort_by in COMPLEXITY_FEATURES:
+            values = self.features[:, COMPLEXITY_FEATURES.index(sort_by)]
+        else:
+            raise ValueError(f"Unknown sort key {sort_by}")
+
+        candidates = np.arange(len(values))
+        if project is not None:
+            if project not in self.project_names:
+                raise ValueError(f"Project {project} not found")
+            candidates = np.flatnonzero(self.project_codes == self.project_names.index(project))
+
+        limit = min(limit, len(candidates))
+        if limit <= 0:
+            return []
+
+        # Partial selection of the top values, then sort only the flows reaching them;
+        # ties are broken by scan order so the ranking does not depend on the numpy version
+        candidate_values = values[candidates]
+        threshold = -np.partition(-candidate_values, limit - 1)[limit - 1]
+        chosen = np.flatnonzero(candidate_values >= threshold)
+        top = candidates[chosen[np.lexsort((chosen, -candidate_values[chosen]))][:limit]]
+
+        return [
+            {
+                "project_name": self.project_names[self.project_codes[i]],
+                "flow_name": self.flow_names[i],
+                "file_path": self.file_paths[i],
+                "score": round(float(self.scores[i]), 4),
+                "features": {
+                    name: int(value) for name, value in zip(COMPLEXITY_FEATURES, self.features[i])
+                }
+            }
+            for i in top
+        ]
+
+    def percentiles(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Get per-project percentiles of every feature
+
+        Flows are sorted by (project, value) once per feature; percentile
+        positions are then computed for all projects at once. The table is
+        kept until the next rebuild.
+
+        Returns:
+            Mapping of project name to feature name to percentile values
+        """
+        with self._lock:
+            if self._percentiles is None:
+                self._percentiles = self._compute_percentiles()
+            return self._percentiles
+
+    def _compute_percentiles(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Compute the per-project percentile table"""
+        if not len(self.features):
+            return {}
+
+        counts = np.bincount(self.project_codes, minlength=len(self.project_names))
+        present = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[present]
+        sizes = counts[present]
+
+        table: Dict[str, Dict[str, Dict[str, float]]] = {
+            self.project_names[code]: {} for code in present
+        }
+        for column, feature in enumerate(COMPLEXITY_FEATURES):
+            values = self.features[:, column]
+            ordered = values[np.lexsort((values, self.project_codes))]
+
+            stats = {}
+            for q in PERCENTILES:
+                position = starts + (q / 100.0) * (sizes - 1)
+                lower = np.floor(position).astype(np.int64)
+                upper = np.ceil(position).astype(np.int64)
+                stats[f"p{q}"] = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+            stats["max"] = ordered[starts + sizes - 1]
+            stats["mean"] = np.bincount(self.project_codes, weights=values)[present] / sizes
+
+            for i, code in enumerate(present):
+                table[self.project_names[code]][feature] = {
+                    name: round(float(array[i]), 4) for name, array in stats.items()
+                }
+
+        return table
+
+
+# Global complexity index instance
+complexity_index = ComplexityIndex()
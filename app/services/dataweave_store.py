@@ -0,0 +1,338 @@
+"""
+Service for finding duplicated DataWeave scripts across all MuleSoft projects
+"""
+import os
+import re
+import glob
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models.flows import FlowInfo, FlowContent
+from app.services.flow_scanner import FlowScanner
+from app.services.incremental_index import IncrementalFlowIndex
+from app.services.scan_cache import ScanCache
+
+logger = logging.getLogger(__name__)
+
+# Directory holding DataWeave modules and resource scripts
+DATAWEAVE_RESOURCE_DIRECTORY = "src/main/resources"
+
+# Usage site: (project name, file path, flow name or None for .dwl files, target)
+UsageSite = Tuple[str, str, Optional[str], str]
+
+# Comments, string literals and whitespace runs in a DataWeave script
+SCRIPT_TOKEN_PATTERN = re.compile(
+    r'(?P<string>"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|`(?:\\.|[^`\\])*`)'
+    r'|(?P<comment>//[^\n]*|/\*.*?\*/)'
+    r'|(?P<space>\s+)',
+    re.DOTALL
+)
+
+
+def normalize_script(script: str) -> str:
+    """
+    Normalise a DataWeave script so formatting-only copies hash the same
+
+    Comments are removed and whitespace runs outside string literals are
+    collapsed to a single space.
+
+    Args:
+        script: Script text
+
+    Returns:
+        Normalised script
+    """
+    def replace(match: re.Match) -> str:
+        if match.group("string") is not None:
+            return match.group("string")
+        return " "
+
+    return SCRIPT_TOKEN_PATTERN.sub(replace, script).strip()
+
+
+def analyze_script(script: str) -> Dict[str, Any]:
+    """
+    Extract header information and references from a DataWeave script
+
+    Args:
+        script: Script text
+
+    Returns:
+        Dictionary with version, output type, imports, functions and variables used
+    """
+    version = re.search(r"%dw\s+([\d.]+)", script)
+    output = re.search(r"^\s*output\s+([\w/+.\-*]+)", script, re.MULTILINE)
+    return {
+        "version": version.group(1) if version else None,
+        "output": output.group(1) if output else None,
+        "imports": sorted(set(re.findall(r"^\s*import\s+(.+?)\s*$", script, re.MULTILINE))),
+        "functions": sorted(set(re.findall(r"\bfun\s+(\w+)", script))),
+        "variables": sorted(set(re.findall(r"\bvars\.(\w+)", script))),
+        "line_count": script.count("\n") + 1,
+        "size_bytes": len(script.encode("utf-8"))
+    }
+
+
+class ScriptEntry:
+    """One distinct script and everywhere it is used"""
+
+    __slots__ = ("hash", "script", "analysis", "sites")
+
+    def __init__(self, script_hash: str, script: str):
+        """
+        Initialize the entry and analyse the script
+
+        Args:
+            script_hash: SHA-256 of the normalised script
+            script: Script text as first seen
+        """
+        self.hash = script_hash
+        self.script = script
+        self.analysis = analyze_script(script)
+        self.sites: Set[UsageSite] = set()
+
+
+class DataWeaveStore(IncrementalFlowIndex):
+    """
+    Content-addressed store of DataWeave scripts
+
+    Inline ee:transform scripts recorded by FlowParser and .dwl files under
+    src/main/resources are normalised and stored once per SHA-256 of their
+    normalised text; every occurrence only adds a usage site to the entry.
+    Entries are dropped when their last usage site disappears.
+    """
+
+    def __init__(self):
+        """Initialize an empty store"""
+        super().__init__()
+        self._scripts: Dict[str, ScriptEntry] = {}
+        # Normalised-text hash per raw script text, so exact copies are normalised once
+        self._hashes: Dict[str, str] = {}
+        # file path -> (script hash, usage site) pairs recorded from it
+        self._file_sites: Dict[str, List[Tuple[str, UsageSite]]] = {}
+        # (project name, resource path) -> flow usage sites referencing a .dwl file
+        self._resource_refs: Dict[Tuple[str, str], Set[UsageSite]] = {}
+        # .dwl file path -> (fingerprint, project name, resource path)
+        self._dwl_files: Dict[str, Tuple[Any, str, str]] = {}
+
+    def refresh(self, scanner: FlowScanner = None) -> None:
+        """
+        Scan all projects and update the store from changed flow and .dwl files
+
+        Args:
+            scanner: FlowScanner to use (a new one if None)
+        """
+        scanner = scanner or FlowScanner()
+        super().refresh(scanner)
+        with self._lock:
+            self._refresh_dwl_files(scanner.mule_directory)
+
+    def _add_file(self, project_name: str, file_path: str, flows: List[FlowInfo],
+                  contents: List[FlowContent]) -> None:
+        """
+        Record the inline scripts and resource references of one flow file
+
+        Args:
+            project_name: Name of the project
+            file_path: Path to the flow file
+            flows: FlowInfo objects parsed from the file
+            contents: Text and structure of each flow, in the same order
+        """
+        sites = []
+        for flow, content in zip(flows, contents):
+            for target, script in content.scripts:
+                site = (project_name, file_path, flow.name, target)
+                sites.append((self._add_site(script, site), site))
+            for target, resource in content.script_resources:
+                site = (project_name, file_path, flow.name, target)
+                self._resource_refs.setdefault((project_name, resource.lstrip("/")), set()).add(site)
+                sites.append(("resource:" + resource.lstrip("/"), site))
+        self._file_sites[file_path] = sites
+
+    def _remove_file(self, file_path: str) -> None:
+        """
+        Remove the usage sites recorded from one flow or .dwl file
+
+        Args:
+            file_path: Path to the file
+        """
+        for script_hash, site in self._file_sites.pop(file_path, []):
+            if script_hash.startswith("resource:"):
+                key = (site[0], script_hash[len("resource:"):])
+                refs = self._resource_refs.get(key)
+                if refs is not None:
+                    refs.discard(site)
+                    if not refs:
+                        del self._resource_refs[key]
+                continue
+
+            entry = self._scripts.get(script_hash)
+            if entry is None:
+                continue
+            entry.sites.discard(site)
+            if not entry.sites:
+                del self._scripts[script_hash]
+
+        if len(self._hashes) > 4 * len(self._scripts) + 1024:
+            # Forget hashes of scripts that are no longer used anywhere
+            self._hashes = {script: h for script, h in self._hashes.items() if h in self._scripts}
+
+    def _add_site(self, script: str, site: UsageSite) -> str:
+        """
+        Store a script if it is new and record where it is used
+
+        Args:
+            script: Script text
+            site: Usage site
+
+        Returns:
+            Hash of the normalised script
+        """
+        script_hash = self._hashes.get(script)
+        if script_hash is None:
+            script_hash = hashlib.sha256(normalize_script(script).encode("utf-8")).hexdigest()
+            self._hashes[script] = script_hash
+
+        entry = self._scripts.get(script_hash)
+        if entry is None:
+            entry = self._scripts[script_hash] = ScriptEntry(script_hash, script)
+        entry.sites.add(site)
+        return script_hash
+
+    def _refresh_dwl_files(self, mule_directory: str) -> None:
+        """
+        Update the store from .dwl files that changed since the last refresh
+
+        Args:
+            mule_directory: MuleSoft projects directory
+        """
+        found: Dict[str, Tuple[str, str]] = {}
+        if os.path.exists(mule_directory):
+            for project_name in os.listdir(mule_directory):
+                resource_dir = os.path.join(mule_directory, project_name, DATAWEAVE_RESOURCE_DIRECTORY)
+                if project_name.startswith('.') or not os.path.isdir(resource_dir):
+                    continue
+                for dwl_file in glob.glob(os.path.join(resource_dir, "**", "*.dwl"), recursive=True):
+                    resource = os.path.relpath(dwl_file, resource_dir).replace(os.sep, "/")
+                    found[dwl_file] = (project_name, resource)
+
+        for dwl_file in [path for path in self._dwl_files if path not in found]:
+            self._remove_file(dwl_file)
+            del self._dwl_files[dwl_file]
+
+        for dwl_file, (project_name, resource) in found.items():
+            fingerprint = ScanCache.fingerprint(dwl_file)
+            indexed = self._dwl_files.get(dwl_file)
+            if indexed and indexed[0] == fingerprint:
+                continue
+            if indexed:
+                self._remove_file(dwl_file)
+
+            try:
+                with open(dwl_file, 'r', encoding='utf-8') as f:
+                    script = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                logger.error(f"Error reading DataWeave file {dwl_file}: {str(e)}")
+                continue
+
+            site = (project_name, dwl_file, None, f"resource:{resource}")
+            self._file_sites[dwl_file] = [(self._add_site(script, site), site)]
+            self._dwl_files[dwl_file] = (fingerprint, project_name, resource)
+
+    def duplicates(self, min_occurrences: int = 2, min_projects: int = 1,
+                   limit: int = 100) -> Dict[str, Any]:
+        """
+        Get clusters of identical (after normalisation) scripts
+
+        Args:
+            min_occurrences: Minimum number of usage sites of a script
+            min_projects: Minimum number of distinct projects using a script
+            limit: Maximum number of clusters returned
+
+        Returns:
+            Dictionary with store totals and clusters, most copied first
+        """
+        with self._lock:
+            clusters = []
+            total_occurrences = 0
+            for entry in self._scripts.values():
+                sites = self._entry_sites(entry)
+                total_occurrences += len(sites)
+                projects = {site[0] for site in sites}
+                if len(sites) >= min_occurrences and len(projects) >= min_projects:
+                    clusters.append((entry, sites, projects))
+
+            clusters.sort(key=lambda cluster: (-len(cluster[1]), -cluster[0].analysis["size_bytes"], cluster[0].hash))
+            return {
+                "unique_scripts": len(self._scripts),
+                "total_occurrences": total_occurrences,
+                "total_clusters": len(clusters),
+                "clusters": [
+                    {
+                        "hash": entry.hash,
+                        "occurrences": len(sites),
+                        "projects": sorted(projects),
+                        "line_count": entry.analysis["line_count"],
+                        "size_bytes": entry.analysis["size_bytes"],
+                        "preview": entry.script.strip()[:200]
+                    }
+                    for entry, sites, projects in clusters[:limit]
+                ]
+            }
+
+    def get_script(self, hash_prefix: str) -> Dict[str, Any]:
+        """
+        Get a script with its analysis and every place it is used
+
+        Args:
+            hash_prefix: Full hash or unique prefix of at least 8 characters
+
+        Returns:
+            Dictionary with the script, its analysis and usage sites
+
+        Raises:
+            ValueError: If no single script matches the prefix
+        """
+        if len(hash_prefix) < 8:
+            raise ValueError("Script hash prefix must have at least 8 characters")
+
+        with self._lock:
+            matching = [entry for script_hash, entry in self._scripts.items() if script_hash.startswith(hash_prefix)]
+            if not matching:
+                raise ValueError(f"Script {hash_prefix} not found")
+            if len(matching) > 1:
+                raise ValueError(f"Script hash prefix {hash_prefix} is ambiguous")
+
+            entry = matching[0]
+            sites = sorted(self._entry_sites(entry), key=lambda site: (site[0], site[1], site[2] or "", site[3]))
+            return {
+                "hash": entry.hash,
+                "script": entry.script,
+                "analysis": entry.analysis,
+                "occurrences": len(sites),
+                "usages": [
+                    {"project_name": project_name, "file_path": file_path, "flow_name": flow_name, "target": target}
+                    for project_name, file_path, flow_name, target in sites
+                ]
+            }
+
+    def _entry_sites(self, entry: ScriptEntry) -> Set[UsageSite]:
+        """
+        Get the usage sites of a script, including flows using it as a .dwl resource
+
+        Args:
+            entry: Script entry
+
+        Returns:
+            Set of usage sites
+        """
+        sites = set(entry.sites)
+        for project_name, _, flow_name, target in entry.sites:
+            if flow_name is None:
+                sites.update(self._resource_refs.get((project_name, target[len("resource:"):]), ()))
+        return sites
+
+
+# Global DataWeave store instance
+dataweave_store = DataWeaveStore()
@@ -0,0 +1,291 @@
+"""
+Service for the project-to-project artifact dependency graph
+"""
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.dependencies import ProjectInfo
+from app.services.mule_scanner import MuleProjectScanner
+from app.services.scan_cache import scan_cache
+
+logger = logging.getLogger(__name__)
+
+# Group id reported for a pom.xml that does not declare one
+UNKNOWN_GROUP_ID = "Unknown"
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, node_count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build compressed sparse row adjacency arrays
+
+    Args:
+        sources: Source node of each edge
+        targets: Target node of each edge
+        node_count: Number of nodes
+
+    Returns:
+        Tuple of (row offsets, target nodes grouped by source, edge ids in that order)
+    """
+    order = np.argsort(sources, kind="stable")
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+    return indptr, targets[order].astype(np.int32), order.astype(np.int32)
+
+
+def _neighbours(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """
+    Get the concatenated adjacency rows of several nodes
+
+    Args:
+        indptr: CSR row offsets
+        indices: CSR column indices
+        nodes: Nodes whose rows are read
+
+    Returns:
+        Neighbour nodes, with repeats
+    """
+    if not len(nodes):
+        return np.zeros(0, dtype=np.int32)
+    return np.concatenate([indices[indptr[node]:indptr[node + 1]] for node in nodes])
+
+
+class GraphSnapshot:
+    """
+    Immutable arrays of one build of the dependency graph
+
+    A refresh builds a new snapshot and swaps it in whole, so queries that
+    hold a snapshot never see arrays from two different builds.
+    """
+
+    def __init__(self, projects: List[ProjectInfo], edge_sources: np.ndarray, edge_targets: np.ndarray,
+                 edge_versions: List[str]):
+        """
+        Build the adjacency arrays and layers of a graph
+
+        Args:
+            projects: ProjectInfo objects sorted by project name
+            edge_sources: Dependent project of each edge
+            edge_targets: Project depended on by each edge
+            edge_versions: Version declared by each edge
+        """
+        node_count = len(projects)
+        self.projects = projects
+        self.project_index: Dict[str, int] = {project.project_name: index for index, project in enumerate(projects)}
+        # Edge i: dependent edge_sources[i] declares edge_versions[i] of edge_targets[i]
+        self.edge_sources = edge_sources
+        self.edge_targets = edge_targets
+        self.edge_versions = edge_versions
+        # CSR adjacency: project -> its dependencies, and project -> its dependents
+        self.dependencies_indptr, self.dependencies_indices, _ = _csr(edge_sources, edge_targets, node_count)
+        self.dependents_indptr, self.dependents_indices, self.dependents_edges = _csr(
+            edge_targets, edge_sources, node_count
+        )
+        # Topological layer of each project (0: no internal dependency, -1: in or above a cycle)
+        self.layers = self._compute_layers(node_count)
+
+    def _compute_layers(self, node_count: int) -> np.ndarray:
+        """
+        Assign each project a topological layer (Kahn's algorithm, one layer at a time)
+
+        Layer 0 holds projects without internal dependencies; a project is one
+        layer above its highest dependency. Projects in or above a cycle get -1.
+
+        Args:
+            node_count: Number of projects
+
+        Returns:
+            Layer per project
+        """
+        layers = np.full(node_count, -1, dtype=np.int32)
+        remaining = np.diff(self.dependencies_indptr).astype(np.int64)
+        frontier = np.flatnonzero(remaining == 0)
+        layer = 0
+        while len(frontier):
+            layers[frontier] = layer
+            dependents = _neighbours(self.dependents_indptr, self.dependents_indices, frontier)
+            np.subtract.at(remaining, dependents, 1)
+            frontier = np.unique(dependents[remaining[dependents] == 0])
+            layer += 1
+        return layers
+
+
+class DependencyGraph:
+    """
+    Graph of the projects depending on other projects of the estate
+
+    An edge goes from a project to every project whose groupId:artifactId
+    it declares as a dependency. Edges are kept as integer CSR arrays in
+    both directions, so transitive dependents and dependencies are found
+    by walking arrays rather than rescanning pom.xml files.
+    """
+
+    def __init__(self):
+        """Initialize an empty graph"""
+        self._lock = threading.Lock()
+        self._signature = None
+        self._graph = GraphSnapshot([], np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), [])
+
+    def refresh(self, scanner: MuleProjectScanner = None) -> None:
+        """
+        Scan all pom.xml files and rebuild the graph if any of them changed
+
+        Args:
+            scanner: MuleProjectScanner to use (a new one if None)
+        """
+        scanner = scanner or MuleProjectScanner()
+
+        # Scanned under the lock, so a slower refresh cannot replace a newer graph
+        with self._lock:
+            generation = scan_cache.kind_generation("pom")
+            projects = sorted(scanner.iter_projects(), key=lambda project: project.project_name)
+            # A scan that parsed any pom.xml is not recorded, so the next refresh rebuilds from a settled cache
+            signature = None
+            if scan_cache.kind_generation("pom") == generation:
+                signature = (generation, tuple(project.project_name for project in projects))
+                if signature == self._signature:
+                    return
+            self._graph = self._build(projects)
+            self._signature = signature
+
+    @staticmethod
+    def _build(projects: List[ProjectInfo]) -> GraphSnapshot:
+        """
+        Build a graph snapshot from scanned projects
+
+        Dependencies are matched on groupId:artifactId. A project whose
+        groupId is inherited from a parent pom (reported as "Unknown") is
+        matched on its artifactId alone when that is unambiguous.
+
+        Args:
+            projects: ProjectInfo objects sorted by project name
+
+        Returns:
+            GraphSnapshot of the projects
+        """
+        by_coordinates: Dict[Tuple[str, str], List[int]] = {}
+        by_artifact: Dict[str, List[int]] = {}
+        for index, project in enumerate(projects):
+            by_coordinates.setdefault((project.group_id, project.artifact_id), []).append(index)
+            by_artifact.setdefault(project.artifact_id, []).append(index)
+
+        sources: List[int] = []
+        targets: List[int] = []
+        versions: List[str] = []
+        for index, project in enumerate(projects):
+            matched = set()
+            for dependency in project.dependencies:
+                candidates = by_coordinates.get((dependency.group_id, dependency.artifact_id))
+                if candidates is None:
+                    candidates = [
+                        candidate for candidate in by_artifact.get(dependency.artifact_id, [])
+                        if projects[candidate].group_id == UNKNOWN_GROUP_ID
+                    ]
+                    if len(candidates) != 1:
+                        continue
+                for target in candidates:
+                    if target != index and target not in matched:
+                        matched.add(target)
+                        sources.append(index)
+                        targets.append(target)
+                        versions.append(dependency.version)
+
+        return GraphSnapshot(
+            projects, np.array(sources, dtype=np.int32), np.array(targets, dtype=np.int32), versions
+        )
+
+    def impact(self, project_name: str, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get every project depending on a project, directly or transitively
+
+        Args:
+            project_name: Name of the project (typically a shared library)
+            max_depth: Only follow this many dependency hops (all if None)
+
+        Returns:
+            Dictionary with the project coordinates and its dependents ordered by depth
+        """
+        graph = self._graph
+        index = graph.project_index.get(project_name)
+        if index is None:
+            raise ValueError(f"Project {project_name} not found or has no usable pom.xml")
+
+        # Breadth-first walk over the dependents adjacency, one depth at a time
+        depths = np.full(len(graph.projects), -1, dtype=np.int32)
+        depths[index] = 0
+        frontier = np.array([index], dtype=np.int32)
+        depth = 0
+        while len(frontier) and (max_depth is None or depth < max_depth):
+            depth += 1
+            dependents = np.unique(_neighbours(graph.dependents_indptr, graph.dependents_indices, frontier))
+            frontier = dependents[depths[dependents] == -1]
+            depths[frontier] = depth
+
+        library = graph.projects[index]
+        dependents = []
+        for dependent in np.flatnonzero(depths > 0):
+            dependencies = graph.dependencies_indices[
+                graph.dependencies_indptr[dependent]:graph.dependencies_indptr[dependent + 1]
+            ]
+            # Affected dependencies through which the change reaches this project
+            via = sorted(
+                graph.projects[dependency].project_name for dependency in dependencies
+                if depths[dependency] == depths[dependent] - 1
+            )
+            declared_version = None
+            if depths[dependent] == 1:
+                edges = graph.dependents_edges[graph.dependents_indptr[index]:graph.dependents_indptr[index + 1]]
+                declared_version = next(
+                    graph.edge_versions[edge] for edge in edges if graph.edge_sources[edge] == dependent
+                )
+            project = graph.projects[dependent]
+            dependents.append({
+                "project_name": project.project_name,
+                "group_id": project.group_id,
+                "artifact_id": project.artifact_id,
+                "version": project.version,
+                "depth": int(depths[dependent]),
+                "layer": int(graph.layers[dependent]),
+                "declared_version": declared_version,
+                "via": via
+            })
+        dependents.sort(key=lambda dependent: (dependent["depth"], dependent["project_name"]))
+
+        return {
+            "project_name": library.project_name,
+            "group_id": library.group_id,
+            "artifact_id": library.artifact_id,
+            "version": library.version,
+            "layer": int(graph.layers[index]),
+            "total_dependents": len(dependents),
+            "direct_dependents": sum(1 for dependent in dependents if dependent["depth"] == 1),
+            "outdated_direct_dependents": sorted(
+                dependent["project_name"] for dependent in dependents
+                if dependent["depth"] == 1 and dependent["declared_version"] != library.version
+            ),
+            "dependents": dependents
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the topological layers of the graph
+
+        Returns:
+            Dictionary with node and edge counts, projects per layer and projects in cycles
+        """
+        graph = self._graph
+        layers: Dict[int, List[str]] = {}
+        for project, layer in zip(graph.projects, graph.layers):
+            layers.setdefault(int(layer), []).append(project.project_name)
+        return {
+            "total_projects": len(graph.projects),
+            "total_edges": len(graph.edge_sources),
+            "layers": [layers[layer] for layer in sorted(layers) if layer >= 0],
+            "cyclic_projects": layers.get(-1, [])
+        }
+
+
+# Global dependency graph instance
+dependency_graph = DependencyGraph()
@@ -0,0 +1,310 @@
+"""
+Service for detecting HTTP endpoints claimed by more than one MuleSoft project
+"""
+import os
+import re
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.flows import FlowInfo, FlowContent
+from app.services.flow_scanner import FlowScanner
+from app.services.incremental_index import IncrementalFlowIndex
+from app.services.property_resolver import property_resolver
+from app.services.quarantine import file_quarantine
+from app.services.scan_cache import ScanCache, scan_cache
+from app.utils.flow_parser import FlowParser
+from app.utils.property_parser import PropertyParser
+from app.utils.xml_parser import XMLLimitError, read_xml_file
+
+logger = logging.getLogger(__name__)
+
+# Elements that expose an inbound endpoint (None: endpoint derived from an APIkit flow name)
+INBOUND_ELEMENTS = {"http:listener", "api-gateway:listener", "listener", None}
+
+# Any method, for listeners without a method restriction
+ANY_METHOD = "*"
+
+LISTENER_CONFIG_PATTERN = re.compile(r"<http:listener-config\b([^>]*)>")
+ATTRIBUTE_PATTERN = re.compile(r"""([\w:.\-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+PARAMETER_SEGMENT_PATTERN = re.compile(r"^(\{[^}]*\}|\([^)]*\)|:[^/]+)$")
+
+# Raw endpoint: (flow name, element, config-ref, path, methods, apikit config of the flow name)
+RawEndpoint = Tuple[str, Optional[str], Optional[str], str, Tuple[str, ...], Optional[str]]
+
+
+def parse_attributes(text: str) -> Dict[str, str]:
+    """
+    Parse the attributes of an element's start tag
+
+    Args:
+        text: Start tag content after the element name
+
+    Returns:
+        Dictionary of attribute name to value (single or double quoted)
+    """
+    return {name: double or single for name, double, single in ATTRIBUTE_PATTERN.findall(text)}
+
+
+def read_flow_text(flow_file: str, fingerprint: Any) -> Optional[str]:
+    """
+    Read a flow file for pattern matching, honouring the parsing safeguards
+
+    Quarantined file versions and files over XML_MAX_FILE_BYTES are skipped.
+
+    Args:
+        flow_file: Path to the flow file
+        fingerprint: Current fingerprint of the file
+
+    Returns:
+        File content, or None if the file was skipped or unreadable
+    """
+    if file_quarantine.is_quarantined(flow_file, fingerprint):
+        return None
+    try:
+        return read_xml_file(flow_file).decode("utf-8")
+    except (OSError, UnicodeDecodeError, XMLLimitError) as e:
+        logger.error(f"Error reading {flow_file}: {str(e)}")
+        return None
+
+
+def normalize_path(path: str) -> str:
+    """
+    Normalise an endpoint path for comparison
+
+    Repeated slashes are collapsed, the trailing slash is removed and
+    parameter segments ({id}, (id), :id) are replaced by {}.
+
+    Args:
+        path: Endpoint path
+
+    Returns:
+        Normalised path
+    """
+    segments = [segment for segment in path.strip().replace("\\", "/").split("/") if segment]
+    segments = ["{}" if PARAMETER_SEGMENT_PATTERN.match(segment) else segment for segment in segments]
+    return "/" + "/".join(segments)
+
+
+def join_path(*parts: str) -> str:
+    """
+    Join path parts with single slashes
+
+    Args:
+        parts: Path parts, e.g. a base path and a listener path
+
+    Returns:
+        Joined path starting with a slash
+    """
+    return "/" + "/".join(part.strip("/") for part in parts if part.strip("/"))
+
+
+class EndpointConflictIndex(IncrementalFlowIndex):
+    """
+    Inbound endpoints of every project, grouped by method and normalised path
+
+    Endpoints are recorded per flow file as projects are rescanned. Full
+    paths are resolved when conflicts are requested: listener paths are
+    prefixed with the basePath of their http:listener-config, and APIkit
+    flow endpoints with the listener path of the flow routing to their
+    APIkit configuration. Endpoints are then grouped in one hash pass.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        super().__init__()
+        self.mule_directory: Optional[str] = None
+        # file path -> (project name, raw endpoints, listener paths per apikit config)
+        self._files: Dict[str, Tuple[str, List[RawEndpoint], Dict[str, List[Tuple[Optional[str], str]]]]] = {}
+
+    def refresh(self, scanner: FlowScanner = None) -> None:
+        """
+        Scan all projects and re-record the endpoints of changed flow files
+
+        Args:
+            scanner: FlowScanner to use (a new one if None)
+        """
+        scanner = scanner or FlowScanner()
+        self.mule_directory = scanner.mule_directory
+        super().refresh(scanner)
+
+    def _add_file(self, project_name: str, file_path: str, flows: List[FlowInfo],
+                  contents: List[FlowContent]) -> None:
+        """
+        Record the inbound endpoints of one flow file
+
+        Args:
+            project_name: Name of the project
+            file_path: Path to the flow file
+            flows: FlowInfo objects parsed from the file
+            contents: Text and structure of each flow, in the same order
+        """
+        endpoints: List[RawEndpoint] = []
+        routers: Dict[str, List[Tuple[Optional[str], str]]] = {}
+        for flow, content in zip(flows, contents):
+            apikit_configs = content.apikit_configs
+            for endpoint in flow.endpoints:
+                if endpoint.element not in INBOUND_ELEMENTS or endpoint.path is None:
+                    continue
+
+                if endpoint.element is None:
+                    # APIkit flow "method:\path[:content-type]:config"
+                    methods = (endpoint.method,) if endpoint.method else (ANY_METHOD,)
+                    apikit_config = flow.name.rsplit(":", 1)[-1]
+                    endpoints.append((flow.name, None, None, endpoint.path, methods, apikit_config))
+                    continue
+
+                allowed = (endpoint.listener_config or {}).get("@allowedMethods") or endpoint.method
+                methods = tuple(sorted({
+                    method.strip().upper() for method in allowed.split(",") if method.strip()
+                })) if allowed else (ANY_METHOD,)
+                endpoints.append((flow.name, endpoint.element, endpoint.config_ref, endpoint.path, methods, None))
+                for apikit_config in apikit_configs:
+                    routers.setdefault(apikit_config, []).append((endpoint.config_ref, endpoint.path))
+
+        self._files[file_path] = (project_name, endpoints, routers)
+
+    def _remove_file(self, file_path: str) -> None:
+        """
+        Forget the endpoints of one flow file
+
+        Args:
+            file_path: Path to the flow file
+        """
+        self._files.pop(file_path, None)
+
+    def conflicts(self, env: Optional[str] = None, include_same_project: bool = False) -> Dict[str, Any]:
+        """
+        Find method and normalised path pairs claimed by more than one project
+
+        A listener without a method restriction claims every method.
+
+        Args:
+            env: Environment used to resolve ${...} placeholders in paths
+            include_same_project: Also report pairs claimed twice within one project
+
+        Returns:
+            Dictionary with endpoint totals and the conflicts found
+        """
+        with self._lock:
+            projects: Dict[str, List[Tuple]] = {}
+            for file_path, (project_name, endpoints, routers) in self._files.items():
+                projects.setdefault(project_name, []).append((file_path, endpoints, routers))
+
+        # path -> method -> endpoint sites
+        buckets: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        total_endpoints = 0
+        for project_name, files in projects.items():
+            for site in self._resolve_project(project_name, files, env):
+                total_endpoints += 1
+                bucket = buckets.setdefault(site.pop("normalized_path"), {})
+                for method in site["methods"]:
+                    bucket.setdefault(method, []).append(site)
+
+        conflicts = []
+        for path, bucket in buckets.items():
+            any_method_sites = bucket.get(ANY_METHOD, [])
+            for method, sites in bucket.items():
+                if method != ANY_METHOD:
+                    sites = sites + any_method_sites
+                elif len(bucket) > 1:
+                    continue  # Reported with each specific method
+                claimants = {(site["project_name"], site["flow_name"]) for site in sites}
+                project_names = {site["project_name"] for site in sites}
+                if len(project_names) > 1 or (include_same_project and len(claimants) > 1):
+                    conflicts.append({
+                        "method": method,
+                        "path": path,
+                        "projects": sorted(project_names),
+                        "endpoints": sorted(sites, key=lambda site: (site["project_name"], site["flow_name"]))
+                    })
+
+        conflicts.sort(key=lambda conflict: (conflict["path"], conflict["method"]))
+        return {
+            "total_endpoints": total_endpoints,
+            "total_conflicts": len(conflicts),
+            "conflicts": conflicts
+        }
+
+    def _resolve_project(self, project_name: str, files: List[Tuple], env: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Resolve the full paths of a project's inbound endpoints
+
+        Args:
+            project_name: Name of the project
+            files: (file path, raw endpoints, listener paths per apikit config) per flow file
+            env: Environment used to resolve ${...} placeholders
+
+        Returns:
+            Endpoint sites with their methods and normalised full path
+        """
+        project_path = os.path.join(self.mule_directory, project_name)
+        properties = property_resolver.get_properties(project_path, env)
+        base_paths = self._listener_base_paths(project_path)
+
+        def resolve(value: str) -> str:
+            return PropertyParser.resolve_value(value, properties) if properties else value
+
+        # Path prefix of each APIkit configuration: the path of the listener routing to it
+        apikit_prefixes: Dict[str, List[str]] = {}
+        for _, _, routers in files:
+            for apikit_config, listeners in routers.items():
+                for config_ref, listener_path in listeners:
+                    prefix = join_path(resolve(base_paths.get(config_ref, "")), resolve(listener_path))
+                    apikit_prefixes.setdefault(apikit_config, []).append(re.sub(r"/\*+$", "", prefix))
+
+        sites = []
+        for file_path, endpoints, _ in files:
+            for flow_name, element, config_ref, path, methods, apikit_config in endpoints:
+                if element is None:
+                    prefixes = apikit_prefixes.get(apikit_config)
+                    base_path_resolved = prefixes is not None
+                    full_paths = [join_path(prefix, path) for prefix in prefixes] if prefixes else [path]
+                else:
+                    base_path_resolved = config_ref in base_paths
+                    full_paths = [join_path(resolve(base_paths.get(config_ref, "")), resolve(path))]
+
+                for full_path in full_paths:
+                    sites.append({
+                        "project_name": project_name,
+                        "file_path": file_path,
+                        "flow_name": flow_name,
+                        "methods": methods,
+                        "path": path,
+                        "full_path": full_path,
+                        "base_path_resolved": base_path_resolved,
+                        "normalized_path": normalize_path(full_path)
+                    })
+        return sites
+
+    @staticmethod
+    def _listener_base_paths(project_path: str) -> Dict[str, str]:
+        """
+        Get the basePath of each http:listener-config of a project
+
+        Listener configurations usually live in a global file without flows,
+        so every flow file is read for them; results are cached per file
+        until it changes.
+
+        Args:
+            project_path: Path to the MuleSoft project
+
+        Returns:
+            Dictionary of listener configuration name to base path
+        """
+        base_paths: Dict[str, str] = {}
+        for flow_file in FlowParser.find_flow_files(project_path):
+            fingerprint = ScanCache.fingerprint(flow_file)
+            configs = scan_cache.get("listener-configs", flow_file, fingerprint)
+            if configs is None:
+                configs = {}
+                for match in LISTENER_CONFIG_PATTERN.finditer(read_flow_text(flow_file, fingerprint) or ""):
+                    attributes = parse_attributes(match.group(1))
+                    if attributes.get("name"):
+                        configs[attributes["name"]] = attributes.get("basePath", "")
+                scan_cache.put("listener-configs", flow_file, fingerprint, configs)
+            base_paths.update(configs)
+        return base_paths
+
+
+# Global endpoint conflict index instance
+endpoint_conflicts = EndpointConflictIndex()
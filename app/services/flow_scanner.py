@@ -2,33 +2,75 @@
 Service for scanning MuleSoft projects and extracting flow information
 """
 import os
+import mmap
+import time
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 
-from app.models.flows import ProjectFlowsResponse, FlowInfo
+from app.models.flows import ProjectFlowsResponse, FlowInfo, FlowLocation, FlowContent
 from app.utils.flow_parser import FlowParser
+from app.utils.xml_parser import read_xml_file
+from app.services.scan_cache import ScanCache, scan_cache
+from app.services.quarantine import file_quarantine
+from app.services.property_resolver import property_resolver
+from app.services.result_spool import ResultSpool
+from app.services.git_source import git_sources
+from app.services.sharding import owns_project
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
+class ScanDeadlineExceeded(Exception):
+    """Raised inside a project scan when the scanner's deadline has passed"""
+
+
 class FlowScanner:
     """Service class for scanning MuleSoft project flows"""
     
-    def __init__(self, mule_directory: str = None):
+    def __init__(self, mule_directory: str = None, use_cache: bool = True, ref: Optional[str] = None,
+                 deadline_ms: Optional[int] = None):
         """
         Initialize the scanner with MuleSoft projects directory
         
         Args:
             mule_directory: Path to MuleSoft projects directory
+            use_cache: Reuse parsed flow files that have not changed since the last scan
+            ref: Git revision to read flows from instead of the working tree
+            deadline_ms: Milliseconds from now after which scans stop and return partial results
         """
         self.mule_directory = mule_directory or settings.get_mule_directory()
         self.flow_parser = FlowParser()
+        self.use_cache = use_cache
+        self.ref = ref
+        self.deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms else None
+        self.skipped_projects: List[str] = []
+        self.projects_total = 0
+        self.projects_done = 0
+        self.files_parsed = 0
+    
+    @property
+    def partial(self) -> bool:
+        """Whether the last scan stopped at the deadline before scanning every project"""
+        return bool(self.skipped_projects)
+    
+    def deadline_exceeded(self) -> bool:
+        """
+        Check whether the scanner's deadline has passed
+        
+        Returns:
+            True if a deadline was set and has passed
+        """
+        return self.deadline is not None and time.monotonic() >= self.deadline
     
-    def scan_project_flows(self) -> ProjectFlowsResponse:
+    def scan_project_flows(self, env: Optional[str] = None) -> ProjectFlowsResponse:
         """
         Scan all MuleSoft projects and extract flow information
         
+        Args:
+            env: Environment used to resolve ${...} placeholders in endpoints
+            
         Returns:
             ProjectFlowsResponse with project and flow data
         """
@@ -36,53 +78,160 @@ class FlowScanner:
         total_flows = 0
         total_endpoints = 0
         
+        for project_data in self.iter_project_flows(env):
+            if project_data["flows"]:
+                projects.append(project_data)
+                total_flows += project_data["total_flows"]
+                total_endpoints += project_data["total_endpoints"]
+        
+        return ProjectFlowsResponse(
+            total_projects=len(projects),
+            total_flows=total_flows,
+            total_endpoints=total_endpoints,
+            projects=projects,
+            partial=self.partial,
+            skipped_projects=self.skipped_projects
+        )
+    
+    def scan_project_flows_to_spool(self, env: Optional[str] = None) -> ResultSpool:
+        """
+        Scan all MuleSoft projects, writing each project to an on-disk spool
+        
+        Only one project is held in memory at a time, so memory use does not
+        grow with the number of projects. Use with use_cache=False to also
+        keep parsed files out of the in-memory scan cache. The caller owns
+        the returned spool and must close it.
+        
+        Args:
+            env: Environment used to resolve ${...} placeholders in endpoints
+            
+        Returns:
+            ResultSpool of project data dictionaries, with the response totals in its metadata
+        """
+        spool = ResultSpool()
+        total_flows = 0
+        total_endpoints = 0
+        
+        try:
+            for project_data in self.iter_project_flows(env):
+                if project_data["flows"]:
+                    spool.append(project_data)
+                    total_flows += project_data["total_flows"]
+                    total_endpoints += project_data["total_endpoints"]
+        except Exception:
+            spool.close()
+            raise
+        
+        spool.metadata = {
+            "total_projects": spool.count,
+            "total_flows": total_flows,
+            "total_endpoints": total_endpoints,
+            "partial": self.partial,
+            "skipped_projects": self.skipped_projects
+        }
+        return spool
+    
+    def iter_project_flows(self, env: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Scan MuleSoft projects one at a time, yielding each project as it finishes
+        
+        Projects without flows are yielded with an empty flow list; projects that
+        fail to scan are logged and skipped. Progress is tracked in
+        projects_total, projects_done and files_parsed. When the deadline
+        passes the scan stops and the projects not scanned are listed in
+        skipped_projects.
+        
+        Args:
+            env: Environment used to resolve ${...} placeholders in endpoints
+            
+        Yields:
+            Project data dictionaries
+        """
+        for project_name, project_dir, project_flows in self.iter_project_flow_infos(env):
+            yield {
+                "project_name": project_name,
+                "project_path": project_dir,
+                "flows": [flow.dict() for flow in project_flows],
+                "total_flows": len(project_flows),
+                "total_endpoints": sum(len(flow.endpoints) for flow in project_flows)
+            }
+    
+    def iter_project_flow_infos(self, env: Optional[str] = None) -> Iterator[Tuple[str, str, List[FlowInfo]]]:
+        """
+        Scan MuleSoft projects one at a time, yielding each project's FlowInfo objects
+        
+        Args:
+            env: Environment used to resolve ${...} placeholders in endpoints
+            
+        Yields:
+            Tuples of (project name, project path, list of FlowInfo objects)
+        """
+        started = time.monotonic()
+        
         # Get all project directories
         project_dirs = self._get_project_directories()
+        self.projects_total = len(project_dirs)
+        self.projects_done = 0
+        self.skipped_projects = []
         
-        for project_dir in project_dirs:
+        for index, project_dir in enumerate(project_dirs):
             project_name = os.path.basename(project_dir)
             
             try:
+                if self.deadline_exceeded():
+                    raise ScanDeadlineExceeded()
+                
                 # Scan flows for this project
                 project_flows = self._scan_single_project(project_dir)
+                if env:
+                    project_flows = property_resolver.resolve_flows(project_dir, project_flows, env)
                 
-                if project_flows:
-                    project_data = {
-                        "project_name": project_name,
-                        "project_path": project_dir,
-                        "flows": [flow.dict() for flow in project_flows],
-                        "total_flows": len(project_flows),
-                        "total_endpoints": sum(len(flow.endpoints) for flow in project_flows)
-                    }
-                    
-                    projects.append(project_data)
-                    total_flows += len(project_flows)
-                    total_endpoints += sum(len(flow.endpoints) for flow in project_flows)
-                
+            except ScanDeadlineExceeded:
+                self.skipped_projects = [os.path.basename(path) for path in project_dirs[index:]]
+                logger.warning(f"Flow scan deadline exceeded, skipped {len(self.skipped_projects)} projects")
+                break
+            
             except Exception as e:
                 logger.error(f"Error scanning flows for project {project_name}: {str(e)}")
+                self.projects_done += 1
                 continue
+            
+            self.projects_done += 1
+            yield project_name, project_dir, project_flows
         
-        return ProjectFlowsResponse(
-            total_projects=len(projects),
-            total_flows=total_flows,
-            total_endpoints=total_endpoints,
-            projects=projects
-        )
+        if self.use_cache and not self.ref and not self.partial:
+            scan_cache.record_full_scan("flows", time.monotonic() - started)
+    
+    def list_project_names(self) -> List[str]:
+        """
+        Get the names of all projects in the MuleSoft directory
+        
+        Returns:
+            List of project names
+        """
+        return [os.path.basename(project_dir) for project_dir in self._get_project_directories()]
     
     def _get_project_directories(self) -> List[str]:
         """
         Get all project directories in the MuleSoft directory
         
+        With a git revision the projects are listed as they were at it.
+        
         Returns:
             List of project directory paths
         """
+        if self.ref:
+            return [
+                project_dir for project_dir in git_sources.list_project_directories(self.mule_directory, self.ref)
+                if owns_project(os.path.basename(project_dir))
+            ]
+        
         project_dirs = []
         
         if os.path.exists(self.mule_directory):
             for item in os.listdir(self.mule_directory):
                 item_path = os.path.join(self.mule_directory, item)
-                if os.path.isdir(item_path) and not item.startswith('.'):
+                if os.path.isdir(item_path) and not item.startswith('.') and owns_project(item):
                     project_dirs.append(item_path)
         
         return project_dirs
@@ -97,15 +246,21 @@ class FlowScanner:
         Returns:
             List of FlowInfo objects
         """
+        if self.ref:
+            return self._scan_single_project_at_ref(project_path)
+        
         flows = []
         
         # Find all flow files in the project
         flow_files = self.flow_parser.find_flow_files(project_path)
         
         for flow_file in flow_files:
+            if self.deadline_exceeded():
+                raise ScanDeadlineExceeded()
+            
             try:
                 # Parse the flow file and get all flows
-                flow_infos = self.flow_parser.parse_flow_file_all_flows(flow_file)
+                flow_infos = self._parse_flow_file(flow_file)
                 if flow_infos:
                     flows.extend(flow_infos)
                     
@@ -115,12 +270,96 @@ class FlowScanner:
         
         return flows
     
-    def get_project_flows(self, project_name: str) -> List[FlowInfo]:
+    def _scan_single_project_at_ref(self, project_path: str) -> List[FlowInfo]:
+        """
+        Scan flows for a single MuleSoft project at the scanner's git revision
+        
+        Flow files are read from the git object store; parsed results are
+        cached by blob sha, so files unchanged between revisions are parsed once.
+        
+        Args:
+            project_path: Path to the MuleSoft project
+            
+        Returns:
+            List of FlowInfo objects
+        """
+        source = git_sources.get_project_source(project_path, self.mule_directory)
+        if source is None:
+            raise ValueError(f"Project {os.path.basename(project_path)} is not in a git repository")
+        
+        flows = []
+        for path, blob_sha in source.find_flow_files(self.ref):
+            if self.deadline_exceeded():
+                raise ScanDeadlineExceeded()
+            
+            file_path = os.path.join(source.reader.repo_path, path)
+            if file_quarantine.is_quarantined(file_path, blob_sha):
+                continue
+            
+            started = time.monotonic()
+            try:
+                flow_infos = scan_cache.get("flows-blob", blob_sha, blob_sha) if self.use_cache else None
+                if flow_infos is None:
+                    self.files_parsed += 1
+                    flow_infos = self.flow_parser.parse_flow_content(source.read_blob(blob_sha), file_path)
+                    if self.use_cache:
+                        scan_cache.put("flows-blob", blob_sha, blob_sha, flow_infos)
+                elif flow_infos and flow_infos[0].file_path != file_path:
+                    # Same content at another path (e.g. a renamed file)
+                    flow_infos = [flow.copy(update={"file_path": file_path}) for flow in flow_infos]
+                
+                flows.extend(flow_infos)
+                
+            except Exception as e:
+                file_quarantine.add("flow", file_path, blob_sha, e, time.monotonic() - started)
+                continue
+        
+        return flows
+    
+    def _parse_flow_file(self, flow_file: str) -> List[FlowInfo]:
+        """
+        Parse a flow file, reusing the cached result if the file is unchanged
+        
+        Files that fail to parse or exceed the parsing limits are quarantined
+        and skipped, even by uncached scans, until they change.
+        
+        Args:
+            flow_file: Path to the flow file
+            
+        Returns:
+            List of FlowInfo objects
+        """
+        fingerprint = ScanCache.fingerprint(flow_file)
+        if self.use_cache:
+            flow_infos = scan_cache.get("flows", flow_file, fingerprint)
+            if flow_infos is not None:
+                return flow_infos
+        
+        if file_quarantine.is_quarantined(flow_file, fingerprint):
+            return []
+        
+        started = time.monotonic()
+        self.files_parsed += 1
+        try:
+            flow_infos, locations = self.flow_parser.load_flow_file(flow_file)
+            file_quarantine.release(flow_file)
+        except Exception as e:
+            file_quarantine.add("flow", flow_file, fingerprint, e, time.monotonic() - started)
+            flow_infos, locations = [], []
+        
+        if self.use_cache:
+            scan_cache.put("flows", flow_file, fingerprint, flow_infos)
+            scan_cache.put("flow-locations", flow_file, fingerprint, locations)
+        
+        return flow_infos
+    
+    def get_project_flows(self, project_name: str, env: Optional[str] = None) -> List[FlowInfo]:
         """
         Get flows for a specific project
         
         Args:
             project_name: Name of the project
+            env: Environment used to resolve ${...} placeholders in endpoints
             
         Returns:
             List of FlowInfo objects for the project
@@ -130,16 +369,237 @@ class FlowScanner:
         if not os.path.exists(project_path):
             raise ValueError(f"Project {project_name} not found")
         
-        return self._scan_single_project(project_path)
+        flows = self._scan_single_project(project_path)
+        if env:
+            flows = property_resolver.resolve_flows(project_path, flows, env)
+        
+        return flows
+    
+    def get_project_flow_locations(self, project_name: str) -> List[FlowLocation]:
+        """
+        List the flows and sub-flows of a project with their locations, without parsing them
+        
+        Args:
+            project_name: Name of the project
+            
+        Returns:
+            List of FlowLocation objects
+        """
+        project_path = self.get_project_path(project_name)
+        locations = []
+        for flow_file in self.flow_parser.find_flow_files(project_path):
+            locations.extend(self.get_flow_locations(flow_file))
+        return locations
+    
+    def get_flow_locations(self, flow_file: str) -> List[FlowLocation]:
+        """
+        Get the locations of the flow and sub-flow elements of a flow file
+        
+        Locations recorded while scanning are reused if the file is unchanged;
+        otherwise only the tags of the file are scanned.
+        
+        Args:
+            flow_file: Path to the flow file
+            
+        Returns:
+            List of FlowLocation objects
+        """
+        fingerprint = ScanCache.fingerprint(flow_file)
+        locations = scan_cache.get("flow-locations", flow_file, fingerprint) if self.use_cache else None
+        if locations is None:
+            try:
+                with open(flow_file, 'rb') as f:
+                    locations = self.flow_parser.locate_flows(f.read(), flow_file)
+            except OSError as e:
+                logger.error(f"Error reading flow file {flow_file}: {str(e)}")
+                return []
+            if self.use_cache:
+                scan_cache.put("flow-locations", flow_file, fingerprint, locations)
+        return locations
+    
+    def get_flow_contents(self, flow_file: str, flows: List[FlowInfo]) -> List[FlowContent]:
+        """
+        Get the searchable text and structure of the flows of a flow file
+        
+        Contents are not recorded by regular scans; they are parsed on the
+        first request and cached until the file changes.
+        
+        Args:
+            flow_file: Path to the flow file
+            flows: FlowInfo objects scanned from the file
+            
+        Returns:
+            One FlowContent per flow (only the flow name if the file cannot be parsed
+            or no longer matches the scanned flows)
+        """
+        fingerprint = ScanCache.fingerprint(flow_file)
+        contents = scan_cache.get("flow-contents", flow_file, fingerprint) if self.use_cache else None
+        if contents is None:
+            try:
+                contents = self.flow_parser.extract_flow_contents(read_xml_file(flow_file), flow_file)
+            except Exception as e:
+                logger.error(f"Error reading flow contents of {flow_file}: {str(e)}")
+                contents = []
+            if self.use_cache:
+                scan_cache.put("flow-contents", flow_file, fingerprint, contents)
+        
+        if len(contents) != len(flows):
+            return [FlowContent(texts={"name": [flow.name]}) for flow in flows]
+        return contents
+    
+    def find_flow_location(self, project_name: str, flow_name: str) -> FlowLocation:
+        """
+        Find the location of a flow or sub-flow of a project
+        
+        Args:
+            project_name: Name of the project
+            flow_name: Name of the flow or sub-flow
+            
+        Returns:
+            FlowLocation of the first element with that name
+        """
+        for location in self.get_project_flow_locations(project_name):
+            if location.name == flow_name:
+                return location
+        raise ValueError(f"Flow {flow_name} not found in project {project_name}")
     
-    def get_endpoints_summary(self) -> Dict[str, Any]:
+    def read_flow_source(self, location: FlowLocation) -> bytes:
+        """
+        Read the XML of one flow element from a memory map of its file
+        
+        Args:
+            location: Location of the flow
+            
+        Returns:
+            Raw XML of the element
+        """
+        with open(location.file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                source = mapped[location.start_byte:location.end_byte]
+        
+        if not source.startswith(b"<" + location.kind.encode()):
+            raise ValueError(f"Flow {location.name} moved in {location.file_path} while being read, retry")
+        return source
+    
+    def get_flow(self, project_name: str, flow_name: str,
+                 env: Optional[str] = None) -> Tuple[FlowInfo, FlowLocation]:
+        """
+        Get a single flow or sub-flow, parsing only its own element
+        
+        A flow already cached by a full scan of its file is returned directly.
+        
+        Args:
+            project_name: Name of the project
+            flow_name: Name of the flow or sub-flow
+            env: Environment used to resolve ${...} placeholders in endpoints
+            
+        Returns:
+            Tuple of (FlowInfo, FlowLocation)
+        """
+        location = self.find_flow_location(project_name, flow_name)
+        
+        flow = None
+        if self.use_cache and location.kind == "flow":
+            cached = scan_cache.get("flows", location.file_path, ScanCache.fingerprint(location.file_path))
+            flow = next((flow for flow in cached or [] if flow.name == flow_name), None)
+        if flow is None:
+            flow = self.flow_parser.parse_flow_element(self.read_flow_source(location), location.file_path)
+            if flow is None:
+                raise ValueError(f"Flow {flow_name} not found in project {project_name}")
+        
+        if env:
+            flow = property_resolver.resolve_flows(self.get_project_path(project_name), [flow], env)[0]
+        return flow, location
+    
+    def get_project_path(self, project_name: str) -> str:
+        """
+        Get the path of a project directory
+        
+        Args:
+            project_name: Name of the project
+            
+        Returns:
+            Path to the project
+        """
+        project_path = os.path.join(self.mule_directory, project_name)
+        if project_name in ("", ".", "..") or os.path.basename(project_name) != project_name:
+            raise ValueError(f"Project {project_name} not found")
+        if self.ref:
+            exists = project_path in git_sources.list_project_directories(self.mule_directory, self.ref)
+        else:
+            exists = os.path.isdir(project_path)
+        if not exists:
+            raise ValueError(f"Project {project_name} not found")
+        return project_path
+    
+    def get_projects_flows(self, project_names: List[str], env: Optional[str] = None,
+                           max_workers: Optional[int] = None) -> Dict[str, Union[List[FlowInfo], Exception]]:
+        """
+        Get flows for many projects with this scanner
+        
+        Projects whose flow files are all cached are served directly; the
+        others are parsed concurrently. A failing project does not stop the others.
+        
+        Args:
+            project_names: Names of the projects (duplicates are ignored)
+            env: Environment used to resolve ${...} placeholders in endpoints
+            max_workers: Maximum number of projects parsed concurrently
+            
+        Returns:
+            Dictionary of project name to its FlowInfo objects, or to the error raised for it
+        """
+        def get_flows(project_name: str) -> Union[List[FlowInfo], Exception]:
+            try:
+                return self.get_project_flows(project_name, env)
+            except Exception as e:
+                return e
+        
+        results: Dict[str, Union[List[FlowInfo], Exception]] = {}
+        uncached = []
+        for project_name in dict.fromkeys(project_names):
+            project_path = os.path.join(self.mule_directory, project_name)
+            if os.path.basename(project_name) != project_name or not os.path.isdir(project_path):
+                results[project_name] = ValueError(f"Project {project_name} not found")
+            elif self.has_cached_flows(project_path):
+                results[project_name] = get_flows(project_name)
+            else:
+                uncached.append(project_name)
+        
+        if uncached:
+            workers = min(len(uncached), max_workers or settings.get_flow_batch_workers())
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="flow-batch") as executor:
+                results.update(zip(uncached, executor.map(get_flows, uncached)))
+        
+        return {project_name: results[project_name] for project_name in dict.fromkeys(project_names)}
+    
+    def has_cached_flows(self, project_path: str) -> bool:
+        """
+        Check whether every flow file of a project is cached and unchanged
+        
+        Args:
+            project_path: Path to the MuleSoft project
+            
+        Returns:
+            True if scanning the project would not parse any file
+        """
+        if not self.use_cache or self.ref:
+            return False
+        return all(
+            scan_cache.get("flows", flow_file, ScanCache.fingerprint(flow_file)) is not None
+            for flow_file in self.flow_parser.find_flow_files(project_path)
+        )
+    
+    def get_endpoints_summary(self, env: Optional[str] = None) -> Dict[str, Any]:
         """
         Get a summary of all endpoints across projects
         
+        Args:
+            env: Environment used to resolve ${...} placeholders in endpoints
+            
         Returns:
             Dictionary with endpoint summary statistics
         """
-        response = self.scan_project_flows()
+        response = self.scan_project_flows(env)
         
         endpoint_summary = {
             "total_endpoints": response.total_endpoints,
@@ -0,0 +1,197 @@
+"""
+Service for reading MuleSoft project files at any git revision without a checkout
+"""
+import os
+import fnmatch
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.git_reader import GitObjectReader, GitObjectError, validate_ref
+from app.utils.flow_parser import FLOW_FILE_DIRECTORIES
+
+logger = logging.getLogger(__name__)
+
+
+class GitProjectSource:
+    """Lists and reads the flow and pom files of one project at a given revision"""
+
+    def __init__(self, reader: GitObjectReader, project_prefix: str = ""):
+        """
+        Initialize the source
+
+        Args:
+            reader: Batch object reader of the repository containing the project
+            project_prefix: Path of the project inside the repository ("" for the root)
+        """
+        self.reader = reader
+        self.project_prefix = project_prefix.strip("/")
+
+    def _project_tree(self, ref: str) -> Optional[str]:
+        """Resolve the project directory tree at a revision"""
+        root = self.reader.resolve_tree(validate_ref(ref))
+        if root is None:
+            return None
+        return self.reader.find_tree(root, self.project_prefix)
+
+    def find_flow_files(self, ref: str) -> List[Tuple[str, str]]:
+        """
+        Find flow files of the project at a revision
+
+        Args:
+            ref: Branch, tag or commit
+
+        Returns:
+            List of (path relative to the repository, blob sha)
+
+        Raises:
+            ValueError: If the ref is invalid or the revision does not exist
+        """
+        project_tree = self._project_tree(ref)
+        if project_tree is None:
+            raise ValueError(f"Revision {ref} not found in {self.reader.repo_path}")
+
+        flow_files = []
+        for directory in FLOW_FILE_DIRECTORIES:
+            tree = self.reader.find_tree(project_tree, directory)
+            if tree is None:
+                continue
+            for mode, name, sha in self.reader.read_tree(tree):
+                if not mode.startswith("40") and fnmatch.fnmatch(name, "*.xml"):
+                    flow_files.append((self._repo_path(f"{directory}/{name}"), sha))
+
+        return flow_files
+
+    def find_pom_file(self, ref: str) -> Optional[Tuple[str, str]]:
+        """
+        Find the pom.xml of the project at a revision
+
+        Args:
+            ref: Branch, tag or commit
+
+        Returns:
+            Tuple of (path relative to the repository, blob sha) or None if missing
+
+        Raises:
+            ValueError: If the ref is not a valid branch, tag or commit name
+        """
+        project_tree = self._project_tree(ref)
+        if project_tree is None:
+            return None
+
+        for mode, name, sha in self.reader.read_tree(project_tree):
+            if name == "pom.xml" and not mode.startswith("40"):
+                return self._repo_path("pom.xml"), sha
+        return None
+
+    def read_blob(self, blob_sha: str) -> bytes:
+        """
+        Read a file's content by blob sha
+
+        Args:
+            blob_sha: Sha of the blob
+
+        Returns:
+            File content
+        """
+        return self.reader.read_blob(blob_sha)
+
+    def _repo_path(self, path: str) -> str:
+        """Prefix a project-relative path with the project location in the repository"""
+        return f"{self.project_prefix}/{path}" if self.project_prefix else path
+
+
+class GitSourceRegistry:
+    """Keeps one long-lived batch object reader per repository"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._lock = threading.Lock()
+        self._readers: Dict[str, GitObjectReader] = {}
+
+    def get_project_source(self, project_path: str, mule_directory: str) -> Optional[GitProjectSource]:
+        """
+        Get the git source of a project
+
+        A project is read from its own repository if it has one, otherwise
+        from a repository at the root of the MuleSoft directory (monorepo).
+
+        Args:
+            project_path: Path to the project directory
+            mule_directory: Path to the MuleSoft projects directory
+
+        Returns:
+            GitProjectSource or None if the project is not in a git repository
+        """
+        if os.path.exists(os.path.join(project_path, ".git")):
+            return GitProjectSource(self._get_reader(project_path))
+        if os.path.exists(os.path.join(mule_directory, ".git")):
+            prefix = os.path.relpath(project_path, mule_directory).replace(os.sep, "/")
+            return GitProjectSource(self._get_reader(mule_directory), prefix)
+        return None
+
+    def list_project_directories(self, mule_directory: str, ref: str) -> List[str]:
+        """
+        List the project directories of the MuleSoft directory at a revision
+
+        In a monorepo the projects are the subdirectories of the repository
+        tree at the revision, so projects added or deleted since then are
+        listed as they were. Otherwise the projects with their own repository
+        are listed if the revision exists in it.
+
+        Args:
+            mule_directory: Path to the MuleSoft projects directory
+            ref: Branch, tag or commit
+
+        Returns:
+            Sorted list of project directory paths
+
+        Raises:
+            ValueError: If the ref is not a valid branch, tag or commit name
+        """
+        validate_ref(ref)
+        if os.path.exists(os.path.join(mule_directory, ".git")):
+            reader = self._get_reader(mule_directory)
+            root = reader.resolve_tree(ref)
+            if root is None:
+                logger.warning(f"Revision {ref} not found in {reader.repo_path}")
+                return []
+            return sorted(
+                os.path.join(mule_directory, name)
+                for mode, name, _ in reader.read_tree(root)
+                if mode == "40000" and not name.startswith('.')
+            )
+
+        project_dirs = []
+        if os.path.exists(mule_directory):
+            for item in sorted(os.listdir(mule_directory)):
+                project_dir = os.path.join(mule_directory, item)
+                if item.startswith('.') or not os.path.exists(os.path.join(project_dir, ".git")):
+                    continue
+                if self._get_reader(project_dir).resolve_tree(ref) is not None:
+                    project_dirs.append(project_dir)
+        return project_dirs
+
+    def _get_reader(self, repo_path: str) -> GitObjectReader:
+        """Get or start the batch reader of a repository"""
+        repo_path = os.path.abspath(repo_path)
+        with self._lock:
+            reader = self._readers.get(repo_path)
+            if reader is None or not reader.alive:
+                reader = GitObjectReader(repo_path)
+                self._readers[repo_path] = reader
+            return reader
+
+    def close_all(self) -> None:
+        """Stop all batch readers"""
+        with self._lock:
+            for reader in self._readers.values():
+                try:
+                    reader.close()
+                except (OSError, GitObjectError):
+                    pass
+            self._readers.clear()
+
+
+# Global git source registry instance
+git_sources = GitSourceRegistry()
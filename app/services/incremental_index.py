@@ -0,0 +1,88 @@
+"""
+Base class for indexes over parsed flows that are updated one flow file at a time
+"""
+import threading
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+from app.models.flows import FlowInfo, FlowContent
+from app.services.flow_scanner import FlowScanner
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalFlowIndex(ABC):
+    """
+    Index over the flows of every flow file, refreshed from a scan
+
+    Files whose parsed flows are the same objects as at the last refresh
+    (unchanged files served from the scan cache) are skipped, changed files
+    are removed and re-added, and deleted files are removed. The text and
+    structure of a file's flows are only parsed when the file is (re)added.
+    Subclasses implement _add_file and _remove_file; both run under the
+    index lock.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._lock = threading.Lock()
+        # file path -> flows the file was indexed from
+        self._indexed_flows: Dict[str, List[FlowInfo]] = {}
+
+    def refresh(self, scanner: FlowScanner = None) -> None:
+        """
+        Scan all projects and re-index the flow files that changed
+
+        Args:
+            scanner: FlowScanner to use (a new one if None)
+        """
+        scanner = scanner or FlowScanner()
+
+        files: Dict[str, Tuple[str, List[FlowInfo]]] = {}
+        for project_name, _, flows in scanner.iter_project_flow_infos():
+            for flow in flows:
+                files.setdefault(flow.file_path, (project_name, []))[1].append(flow)
+
+        with self._lock:
+            for file_path in [path for path in self._indexed_flows if path not in files]:
+                self._remove_file(file_path)
+                del self._indexed_flows[file_path]
+
+            for file_path, (project_name, flows) in files.items():
+                indexed = self._indexed_flows.get(file_path)
+                if indexed is not None and len(indexed) == len(flows) and all(
+                    old is new for old, new in zip(indexed, flows)
+                ):
+                    continue
+                if indexed is not None:
+                    self._remove_file(file_path)
+                self._add_file(project_name, file_path, flows, scanner.get_flow_contents(file_path, flows))
+                self._indexed_flows[file_path] = flows
+
+    @property
+    def files_indexed(self) -> int:
+        """Number of flow files currently indexed"""
+        return len(self._indexed_flows)
+
+    @abstractmethod
+    def _add_file(self, project_name: str, file_path: str, flows: List[FlowInfo],
+                  contents: List[FlowContent]) -> None:
+        """
+        Index the flows of one file
+
+        Args:
+            project_name: Name of the project
+            file_path: Path to the flow file
+            flows: FlowInfo objects parsed from the file
+            contents: Text and structure of each flow, in the same order
+        """
+
+    @abstractmethod
+    def _remove_file(self, file_path: str) -> None:
+        """
+        Remove everything indexed from one file
+
+        Args:
+            file_path: Path to the flow file
+        """
@@ -0,0 +1,614 @@
+"""
+HTTP load-test harness for the MuleSoft scanning API
+
+Generates a synthetic estate of MuleSoft projects, starts the API against it
+(in a background thread of this process or as a local uvicorn process) and
+drives a weighted mix of concurrent requests, reporting throughput, latency
+percentiles and peak RSS as JSON.
+"""
+import os
+import sys
+import time
+import random
+import socket
+import logging
+import tempfile
+import platform
+import threading
+import subprocess
+import http.client
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, quote
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Request kinds of a mix and the path they request
+MIX_ROUTES = {
+    "flows": "/mule/flows",
+    "project": "/mule/flows/{project_name}",
+    "summary": "/mule/endpoints/summary",
+    "dependencies": "/mule/dependencies",
+}
+
+DEFAULT_MIX = "flows=1,project=4,summary=2,dependencies=1"
+
+SERVER_MODES = ("thread", "process")
+
+# Shared libraries and connectors the generated projects depend on
+CONNECTORS = [
+    ("org.mule.connectors", "mule-http-connector", ["1.7.3", "1.8.0", "1.9.1"]),
+    ("org.mule.connectors", "mule-db-connector", ["1.13.0", "1.14.2"]),
+    ("org.mule.modules", "mule-apikit-module", ["1.8.1", "1.10.2"]),
+    ("com.mulesoft.connectors", "mule-salesforce-connector", ["10.14.0", "10.16.1"]),
+]
+
+FLOW_FILE_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<mule xmlns="http://www.mulesoft.org/schema/mule/core"
+      xmlns:http="http://www.mulesoft.org/schema/mule/http"
+      xmlns:ee="http://www.mulesoft.org/schema/mule/ee/core"
+      xmlns:db="http://www.mulesoft.org/schema/mule/db"
+      xmlns:doc="http://www.mulesoft.org/schema/mule/documentation">
+"""
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """
+    Parse a request mix such as "flows=1,project=4"
+
+    Args:
+        mix: Comma-separated kind=weight pairs (kinds: flows, project, summary, dependencies)
+
+    Returns:
+        Dictionary of request kind to weight
+
+    Raises:
+        ValueError: If the mix is malformed
+    """
+    weights: Dict[str, int] = {}
+    for part in mix.split(","):
+        if not part.strip():
+            continue
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in MIX_ROUTES:
+            raise ValueError(f"Unknown request kind {kind}, expected one of {', '.join(MIX_ROUTES)}")
+        try:
+            weights[kind] = int(weight) if weight.strip() else 1
+        except ValueError:
+            raise ValueError(f"Invalid weight for {kind}: {weight}")
+        if weights[kind] < 0:
+            raise ValueError(f"Invalid weight for {kind}: {weight}")
+
+    if not any(weights.values()):
+        raise ValueError("Request mix has no positive weight")
+    return weights
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """
+    Get a nearest-rank percentile
+
+    Args:
+        sorted_values: Values sorted in ascending order
+        fraction: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        The percentile, or None if there are no values
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, int(-(-fraction * len(sorted_values) // 1)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def generate_estate(directory: str, projects: int = 50, flows_per_project: int = 10,
+                    files_per_project: int = 2, seed: int = 42) -> List[str]:
+    """
+    Generate a synthetic tree of MuleSoft projects
+
+    Each project gets a pom.xml with connector and shared library
+    dependencies, flow files with listeners, loggers, transforms, choices and
+    database calls, and a config.yaml resolving its listener placeholders.
+
+    Args:
+        directory: Directory to create the projects in
+        projects: Number of projects
+        flows_per_project: Number of flows per project
+        files_per_project: Number of flow files the flows are spread over
+        seed: Random seed, so the same arguments generate the same tree
+
+    Returns:
+        Names of the generated projects
+    """
+    rng = random.Random(seed)
+    files_per_project = max(1, min(files_per_project, flows_per_project))
+    names = [f"synthetic-api-{index:04d}" for index in range(projects)]
+
+    for project_index, project_name in enumerate(names):
+        project_dir = os.path.join(directory, project_name)
+        mule_dir = os.path.join(project_dir, "src", "main", "mule")
+        resources_dir = os.path.join(project_dir, "src", "main", "resources")
+        os.makedirs(mule_dir, exist_ok=True)
+        os.makedirs(resources_dir, exist_ok=True)
+
+        dependencies = []
+        for group_id, artifact_id, versions in rng.sample(CONNECTORS, rng.randint(1, len(CONNECTORS))):
+            dependencies.append((group_id, artifact_id, rng.choice(versions)))
+        for library_index in rng.sample(range(max(1, projects // 10)), min(2, max(1, projects // 10))):
+            dependencies.append(("com.synthetic", f"shared-lib-{library_index:02d}", f"1.{rng.randint(0, 3)}.0"))
+
+        with open(os.path.join(project_dir, "pom.xml"), "w", encoding="utf-8") as f:
+            f.write(
+                "<project><groupId>com.synthetic</groupId>"
+                f"<artifactId>{project_name}</artifactId><version>1.0.{project_index}</version>"
+                "<packaging>mule-application</packaging>"
+                "<properties><app.runtime>4.4.0</app.runtime></properties><dependencies>"
+                + "".join(
+                    f"<dependency><groupId>{group_id}</groupId><artifactId>{artifact_id}</artifactId>"
+                    f"<version>{version}</version><classifier>mule-plugin</classifier></dependency>"
+                    for group_id, artifact_id, version in dependencies
+                )
+                + "</dependencies></project>\n"
+            )
+
+        with open(os.path.join(resources_dir, "config.yaml"), "w", encoding="utf-8") as f:
+            f.write(f"http:\n  port: \"8081\"\n  basePath: \"/{project_name}\"\n")
+
+        for file_index in range(files_per_project):
+            flows = []
+            if file_index == 0:
+                flows.append(
+                    '  <http:listener-config name="listener-config" basePath="${http.basePath}">\n'
+                    '    <http:listener-connection host="0.0.0.0" port="${http.port}"/>\n'
+                    '  </http:listener-config>\n'
+                )
+            for flow_index in range(file_index, flows_per_project, files_per_project):
+                flows.append(_synthetic_flow(rng, project_name, flow_index))
+
+            file_path = os.path.join(mule_dir, f"{project_name}-{file_index}.xml")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(FLOW_FILE_HEADER + "".join(flows) + "</mule>\n")
+
+    return names
+
+
+def _synthetic_flow(rng: random.Random, project_name: str, flow_index: int) -> str:
+    """
+    Build the XML of one synthetic flow
+
+    Args:
+        rng: Random generator
+        project_name: Name of the project
+        flow_index: Index of the flow in the project
+
+    Returns:
+        Flow XML
+    """
+    path = f"resource{flow_index}"
+    method = rng.choice(["GET", "POST", "PUT", "DELETE"])
+    steps = [f'    <http:listener config-ref="listener-config" path="/{path}" '
+             f'allowedMethods="{method}" doc:name="Listener"/>\n',
+             f'    <logger level="INFO" message="{project_name} {path} #[correlationId]" doc:name="Log request"/>\n']
+    for _ in range(rng.randint(1, 4)):
+        step = rng.choice(["transform", "choice", "db", "foreach"])
+        if step == "transform":
+            steps.append(
+                '    <ee:transform doc:name="Map payload"><ee:message><ee:set-payload><![CDATA[%dw 2.0\n'
+                'output application/json\n---\n'
+                f'payload map {{ id: $.id, source: "{path}" }}\n'
+                ']]></ee:set-payload></ee:message></ee:transform>\n'
+            )
+        elif step == "choice":
+            steps.append(
+                '    <choice doc:name="Route"><when expression="#[payload != null]">'
+                '<set-variable variableName="found" value="#[true]"/></when>'
+                '<otherwise><raise-error type="APP:NOT_FOUND"/></otherwise></choice>\n'
+            )
+        elif step == "db":
+            steps.append(f'    <db:select config-ref="db-config"><db:sql>select * from {path}</db:sql></db:select>\n')
+        else:
+            steps.append('    <foreach collection="#[payload]"><logger level="DEBUG" message="#[payload]"/></foreach>\n')
+
+    error_handler = ('    <error-handler><on-error-propagate type="ANY">'
+                     '<logger level="ERROR" message="#[error.description]"/>'
+                     '</on-error-propagate></error-handler>\n') if rng.random() < 0.7 else ""
+    return f'  <flow name="{project_name}-{path}-flow">\n' + "".join(steps) + error_handler + "  </flow>\n"
+
+
+def _free_port(host: str) -> int:
+    """Get a free TCP port on a host"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def _current_peak_rss() -> Optional[int]:
+    """Get the peak RSS of this process in bytes"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class LocalServer:
+    """
+    API server started for a load run
+
+    In "thread" mode uvicorn runs in a background thread of this process; in
+    "process" mode it runs as a child process, so the client threads do not
+    compete with the server for the GIL.
+    """
+
+    def __init__(self, mule_directory: str, mode: str = "thread", host: str = "127.0.0.1"):
+        """
+        Initialize the server
+
+        Args:
+            mule_directory: MuleSoft projects directory served
+            mode: "thread" or "process"
+            host: Interface to listen on
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in SERVER_MODES:
+            raise ValueError(f"Unknown server mode {mode}, expected one of {', '.join(SERVER_MODES)}")
+        self.mule_directory = mule_directory
+        self.mode = mode
+        self.host = host
+        self.port = _free_port(host)
+        self.base_url = f"http://{host}:{self.port}"
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._peak_rss: Optional[int] = None
+        # MULE_DIRECTORY of this process before a thread-mode server replaced it
+        self._replaced_mule_directory = False
+        self._previous_mule_directory: Optional[str] = None
+
+    def start(self, timeout: float = 60.0) -> None:
+        """
+        Start the server and wait until it answers /health
+
+        Args:
+            timeout: Seconds to wait for the server
+
+        Raises:
+            RuntimeError: If the server does not come up in time
+        """
+        if self.mode == "thread":
+            import uvicorn
+            # The in-process app reads MULE_DIRECTORY on every request; restored by stop()
+            self._previous_mule_directory = os.environ.get("MULE_DIRECTORY")
+            self._replaced_mule_directory = True
+            os.environ["MULE_DIRECTORY"] = self.mule_directory
+            config = uvicorn.Config("app.main:app", host=self.host, port=self.port,
+                                    log_level="warning", access_log=False)
+            self._server = uvicorn.Server(config)
+            self._thread = threading.Thread(target=self._server.run, name="load-harness-server", daemon=True)
+            self._thread.start()
+        else:
+            env = dict(os.environ, MULE_DIRECTORY=self.mule_directory)
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", self.host,
+                 "--port", str(self.port), "--log-level", "warning", "--no-access-log"],
+                env=env
+            )
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._process is not None and self._process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self._process.returncode}")
+            try:
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=1.0)
+                connection.request("GET", "/health")
+                if connection.getresponse().status == 200:
+                    connection.close()
+                    return
+            except OSError:
+                pass
+            time.sleep(0.05)
+        self.stop()
+        raise RuntimeError(f"Server did not answer on {self.base_url} within {timeout} seconds")
+
+    def peak_rss(self) -> Optional[int]:
+        """
+        Get the peak RSS of the server in bytes
+
+        In thread mode this includes the load-generating client threads.
+
+        Returns:
+            Peak RSS, or None if it cannot be measured on this platform
+        """
+        if self._process is None:
+            return _current_peak_rss()
+        if self._process.poll() is None:
+            try:
+                with open(f"/proc/{self._process.pid}/status", "r") as f:
+                    for line in f:
+                        if line.startswith("VmHWM:"):
+                            self._peak_rss = int(line.split()[1]) * 1024
+            except OSError:
+                pass
+        return self._peak_rss
+
+    def stop(self) -> None:
+        """Stop the server"""
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=10)
+            self._server = None
+        if self._replaced_mule_directory:
+            if self._previous_mule_directory is None:
+                os.environ.pop("MULE_DIRECTORY", None)
+            else:
+                os.environ["MULE_DIRECTORY"] = self._previous_mule_directory
+            self._replaced_mule_directory = False
+        if self._process is not None and self._process.poll() is None:
+            self.peak_rss()
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            if self._peak_rss is None and resource is not None:
+                self._peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * (
+                    1 if sys.platform == "darwin" else 1024)
+
+    def __enter__(self) -> "LocalServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class LoadHarness:
+    """Drives a concurrent request mix against a running API"""
+
+    def __init__(self, base_url: str, mix: Dict[str, int], project_names: List[str],
+                 concurrency: int = 50, timeout: float = 120.0, seed: int = 42):
+        """
+        Initialize the harness
+
+        Args:
+            base_url: Base URL of the API, e.g. http://127.0.0.1:8000
+            mix: Request kind to weight
+            project_names: Projects requested by "project" requests
+            concurrency: Number of concurrent clients
+            timeout: Timeout of a single request in seconds
+            seed: Random seed of the request sequence
+
+        Raises:
+            ValueError: If "project" requests are weighted but no projects are given
+        """
+        if mix.get("project") and not project_names:
+            raise ValueError("Project requests need at least one project name")
+        url = urlsplit(base_url)
+        self.base_url = base_url
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.prefix = url.path.rstrip("/")
+        self.mix = {kind: weight for kind, weight in mix.items() if weight > 0}
+        self.project_names = project_names
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.seed = seed
+
+    def run(self, requests: Optional[int] = 1000, duration: Optional[float] = None,
+            warmup: bool = True) -> Dict[str, Any]:
+        """
+        Run the request mix
+
+        Args:
+            requests: Total number of requests (ignored if duration is set)
+            duration: Seconds to keep sending requests
+            warmup: Send each request kind once before measuring, so cold scans are not counted
+
+        Returns:
+            Dictionary with throughput, latency percentiles and per-kind results
+        """
+        if warmup:
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            for kind in self.mix:
+                self._request(connection, kind, random.Random(self.seed))
+            connection.close()
+
+        lock = threading.Lock()
+        samples: List[Tuple[str, float, int]] = []
+        remaining = [requests if duration is None else None]
+
+        def take() -> bool:
+            with lock:
+                if remaining[0] is None:
+                    return time.monotonic() < deadline
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+                return True
+
+        def client(index: int) -> None:
+            rng = random.Random(self.seed + index)
+            kinds = list(self.mix)
+            weights = [self.mix[kind] for kind in kinds]
+            connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            thread_samples = []
+            while take():
+                kind = rng.choices(kinds, weights)[0]
+                latency, status = self._request(connection, kind, rng)
+                if status == 0:
+                    connection.close()
+                    connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                thread_samples.append((kind, latency, status))
+            connection.close()
+            with lock:
+                samples.extend(thread_samples)
+
+        started = time.monotonic()
+        deadline = started + (duration or 0)
+        threads = [threading.Thread(target=client, args=(index,), name=f"load-client-{index}")
+                   for index in range(self.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        return self._report(samples, elapsed)
+
+    def _request(self, connection: http.client.HTTPConnection, kind: str,
+                 rng: random.Random) -> Tuple[float, int]:
+        """
+        Send one request and read the whole response
+
+        Args:
+            connection: Keep-alive connection of the client
+            kind: Request kind
+            rng: Random generator of the client
+
+        Returns:
+            Latency in milliseconds and HTTP status (0 on connection errors)
+        """
+        path = MIX_ROUTES[kind]
+        if kind == "project":
+            path = path.format(project_name=quote(rng.choice(self.project_names), safe=""))
+
+        started = time.perf_counter()
+        try:
+            connection.request("GET", self.prefix + path)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException) as e:
+            logger.debug(f"Request to {path} failed: {str(e)}")
+            status = 0
+        return (time.perf_counter() - started) * 1000, status
+
+    def _report(self, samples: List[Tuple[str, float, int]], elapsed: float) -> Dict[str, Any]:
+        """
+        Summarise the samples of a run
+
+        Args:
+            samples: (kind, latency in ms, status) per request
+            elapsed: Wall-clock seconds of the run
+
+        Returns:
+            Report dictionary
+        """
+        def summary(latencies: List[float], errors: int) -> Dict[str, Any]:
+            latencies.sort()
+            return {
+                "requests": len(latencies),
+                "errors": errors,
+                "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+                "latency_ms": {
+                    "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+                    "p50": _round(percentile(latencies, 0.50)),
+                    "p95": _round(percentile(latencies, 0.95)),
+                    "p99": _round(percentile(latencies, 0.99)),
+                    "max": _round(latencies[-1] if latencies else None),
+                }
+            }
+
+        by_kind: Dict[str, Tuple[List[float], List[int]]] = {kind: ([], []) for kind in self.mix}
+        for kind, latency, status in samples:
+            by_kind[kind][0].append(latency)
+            by_kind[kind][1].append(status)
+
+        report = summary([latency for _, latency, _ in samples],
+                         sum(1 for _, _, status in samples if not 200 <= status < 400))
+        report["duration_seconds"] = round(elapsed, 3)
+        report["kinds"] = {
+            kind: dict(summary(latencies, sum(1 for status in statuses if not 200 <= status < 400)),
+                       path=MIX_ROUTES[kind])
+            for kind, (latencies, statuses) in by_kind.items()
+        }
+        return report
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    """Round a latency for the report"""
+    return round(value, 3) if value is not None else None
+
+
+def run_load_test(mix: str = DEFAULT_MIX, concurrency: int = 50, requests: Optional[int] = 1000,
+                  duration: Optional[float] = None, projects: int = 50, flows_per_project: int = 10,
+                  mule_directory: Optional[str] = None, server: str = "thread",
+                  url: Optional[str] = None, seed: int = 42) -> Dict[str, Any]:
+    """
+    Run a complete load test and build its JSON report
+
+    Without mule_directory a synthetic estate is generated in a temporary
+    directory; without url a local server is started against it.
+
+    Args:
+        mix: Request mix, e.g. "flows=1,project=4,summary=2,dependencies=1"
+        concurrency: Number of concurrent clients
+        requests: Total number of requests (ignored if duration is set)
+        duration: Seconds to keep sending requests
+        projects: Number of generated projects
+        flows_per_project: Number of flows per generated project
+        mule_directory: Existing MuleSoft projects directory to use instead of a generated one
+        server: "thread" or "process" for the local server
+        url: Base URL of an already running API (peak RSS is then not reported)
+        seed: Random seed of the estate and the request sequence
+
+    Returns:
+        Report dictionary
+
+    Raises:
+        ValueError: If the mix or server mode is invalid
+    """
+    weights = parse_mix(mix)
+    with tempfile.TemporaryDirectory(prefix="mule-load-") as temporary_directory:
+        if mule_directory:
+            project_names = sorted(
+                name for name in os.listdir(mule_directory)
+                if not name.startswith(".") and os.path.isdir(os.path.join(mule_directory, name))
+            )
+            estate = {"mule_directory": mule_directory, "generated": False, "projects": len(project_names)}
+        else:
+            mule_directory = temporary_directory
+            generate_started = time.monotonic()
+            project_names = generate_estate(mule_directory, projects, flows_per_project, seed=seed)
+            estate = {
+                "mule_directory": None,
+                "generated": True,
+                "projects": projects,
+                "flows_per_project": flows_per_project,
+                "generation_seconds": round(time.monotonic() - generate_started, 3)
+            }
+
+        local_server = None if url else LocalServer(mule_directory, server)
+        if local_server is not None:
+            local_server.start()
+        try:
+            harness = LoadHarness(url or local_server.base_url, weights, project_names,
+                                  concurrency=concurrency, seed=seed)
+            results = harness.run(requests=requests, duration=duration)
+        finally:
+            if local_server is not None:
+                local_server.stop()
+
+    report = {
+        "api_version": settings.API_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": "external" if url else server,
+        "estate": estate,
+        "mix": weights,
+        "concurrency": concurrency,
+        "peak_rss_bytes": local_server.peak_rss() if local_server is not None else None,
+    }
+    report.update(results)
+    return report
+
@@ -3,12 +3,17 @@ Service for scanning MuleSoft projects and extracting dependency information
 """
 import os
 import glob
+import time
 import logging
-from typing import List
+from typing import Iterator, List, Optional
 from pathlib import Path
 
 from app.models.dependencies import ProjectInfo, DependencyInfo, MuleDependencyScanResponse
-from app.utils.xml_parser import XMLParser
+from app.utils.xml_parser import XMLParser, parse_xml
+from app.services.scan_cache import ScanCache, scan_cache
+from app.services.quarantine import file_quarantine
+from app.services.git_source import git_sources
+from app.services.sharding import owns_project
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -17,15 +22,26 @@ logger = logging.getLogger(__name__)
 class MuleProjectScanner:
     """Service class for scanning MuleSoft projects"""
     
-    def __init__(self, mule_directory: str = None):
+    def __init__(self, mule_directory: str = None, use_cache: bool = True, ref: Optional[str] = None,
+                 deadline_ms: Optional[int] = None):
         """
         Initialize the scanner with MuleSoft projects directory
         
         Args:
             mule_directory: Path to MuleSoft projects directory
+            use_cache: Reuse processed pom.xml files that have not changed since the last scan
+            ref: Git revision to read pom.xml files from instead of the working tree
+            deadline_ms: Milliseconds from now after which scans stop and return partial results
         """
         self.mule_directory = mule_directory or settings.get_mule_directory()
         self.xml_parser = XMLParser()
+        self.use_cache = use_cache
+        self.ref = ref
+        self.deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms else None
+        self.skipped_projects: List[str] = []
+        self.projects_total = 0
+        self.projects_done = 0
+        self.files_parsed = 0
     
     def scan_projects(self) -> MuleDependencyScanResponse:
         """
@@ -34,20 +50,177 @@ class MuleProjectScanner:
         Returns:
             MuleDependencyScanResponse with project and dependency data
         """
-        projects = []
+        projects = list(self.iter_projects())
+        
+        return MuleDependencyScanResponse(
+            total_projects=len(projects),
+            projects=projects,
+            partial=self.partial,
+            skipped_projects=self.skipped_projects
+        )
+    
+    @property
+    def partial(self) -> bool:
+        """Whether the last scan stopped at the deadline before scanning every project"""
+        return bool(self.skipped_projects)
+    
+    def deadline_exceeded(self) -> bool:
+        """
+        Check whether the scanner's deadline has passed
+        
+        Returns:
+            True if a deadline was set and has passed
+        """
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    def iter_projects(self) -> Iterator[ProjectInfo]:
+        """
+        Scan MuleSoft projects one at a time, yielding each project as it finishes
+        
+        Projects whose pom.xml cannot be processed are skipped. Progress is
+        tracked in projects_total, projects_done and files_parsed. When the
+        deadline passes the scan stops and the projects not scanned are
+        listed in skipped_projects.
+        
+        Yields:
+            ProjectInfo objects
+        """
+        if self.ref:
+            yield from self._iter_projects_at_ref()
+            return
+        
+        started = time.monotonic()
         
         # Find all pom.xml files in the mule directory
         pom_files = self._find_pom_files()
+        self.projects_total = len(pom_files)
+        self.projects_done = 0
+        self.skipped_projects = []
         
-        for pom_file in pom_files:
-            project_info = self._process_project(pom_file)
+        for index, pom_file in enumerate(pom_files):
+            if self.deadline_exceeded():
+                self.skipped_projects = [os.path.basename(os.path.dirname(path)) for path in pom_files[index:]]
+                logger.warning(f"Dependency scan deadline exceeded, skipped {len(self.skipped_projects)} projects")
+                break
+            
+            project_info = self._process_project_cached(pom_file)
+            self.projects_done += 1
             if project_info:
-                projects.append(project_info)
+                yield project_info
         
-        return MuleDependencyScanResponse(
-            total_projects=len(projects),
-            projects=projects
-        )
+        if self.use_cache and not self.partial:
+            scan_cache.record_full_scan("dependencies", time.monotonic() - started)
+    
+    def _iter_projects_at_ref(self) -> Iterator[ProjectInfo]:
+        """
+        Scan each project's pom.xml at the scanner's git revision
+        
+        Projects are listed as they were at the revision. Parsed results are
+        cached by blob sha, so a pom.xml unchanged between revisions is parsed once.
+        
+        Yields:
+            ProjectInfo objects
+        """
+        project_dirs = [
+            project_dir for project_dir in git_sources.list_project_directories(self.mule_directory, self.ref)
+            if owns_project(os.path.basename(project_dir))
+        ]
+        self.projects_total = len(project_dirs)
+        self.projects_done = 0
+        self.skipped_projects = []
+        
+        for index, project_dir in enumerate(project_dirs):
+            if self.deadline_exceeded():
+                self.skipped_projects = [os.path.basename(path) for path in project_dirs[index:]]
+                logger.warning(f"Dependency scan deadline exceeded, skipped {len(self.skipped_projects)} projects")
+                break
+            
+            try:
+                project_info = self._process_project_at_ref(project_dir)
+            except Exception as e:
+                logger.error(f"Error processing project {project_dir} at {self.ref}: {str(e)}")
+                project_info = None
+            
+            self.projects_done += 1
+            if project_info:
+                yield project_info
+    
+    def _process_project_at_ref(self, project_dir: str) -> Optional[ProjectInfo]:
+        """
+        Process a project's pom.xml at the scanner's git revision
+        
+        Args:
+            project_dir: Path to the project directory
+            
+        Returns:
+            ProjectInfo object or None if the project has no pom.xml at the revision
+        """
+        source = git_sources.get_project_source(project_dir, self.mule_directory)
+        if source is None:
+            return None
+        
+        pom_file = source.find_pom_file(self.ref)
+        if pom_file is None:
+            return None
+        
+        path, blob_sha = pom_file
+        file_path = os.path.join(source.reader.repo_path, path)
+        if file_quarantine.is_quarantined(file_path, blob_sha):
+            return None
+        
+        pom_data = scan_cache.get("pom-blob", blob_sha, blob_sha) if self.use_cache else None
+        if pom_data is None:
+            started = time.monotonic()
+            self.files_parsed += 1
+            try:
+                pom_data = parse_xml(source.read_blob(blob_sha), f"{path}@{self.ref}")
+            except Exception as e:
+                file_quarantine.add("pom", file_path, blob_sha, e, time.monotonic() - started)
+                return None
+            if pom_data and self.use_cache:
+                scan_cache.put("pom-blob", blob_sha, blob_sha, pom_data)
+        
+        if not pom_data:
+            return None
+        
+        return self.build_project_info(pom_data, os.path.basename(project_dir), project_dir)
+    
+    def scan_project(self, project_name: str) -> Optional[ProjectInfo]:
+        """
+        Scan the pom.xml of a single project
+        
+        Args:
+            project_name: Name of the project
+            
+        Returns:
+            ProjectInfo object or None if the project has no usable pom.xml
+        """
+        pom_file = os.path.join(self.mule_directory, project_name, "pom.xml")
+        if not os.path.isfile(pom_file):
+            return None
+        return self._process_project_cached(pom_file)
+    
+    def _process_project_cached(self, pom_file: str) -> ProjectInfo:
+        """
+        Process a pom.xml file, reusing the cached result if the file is unchanged
+        
+        Args:
+            pom_file: Path to the pom.xml file
+            
+        Returns:
+            ProjectInfo object or None if processing fails
+        """
+        if not self.use_cache:
+            return self._process_project(pom_file)
+        
+        fingerprint = ScanCache.fingerprint(pom_file)
+        cached = scan_cache.get("pom", pom_file, fingerprint)
+        if cached is None:
+            # Failed projects are cached as False so they are not retried until the file changes
+            cached = self._process_project(pom_file) or False
+            scan_cache.put("pom", pom_file, fingerprint, cached)
+        
+        return cached or None
     
     def _find_pom_files(self) -> List[str]:
         """
@@ -57,7 +230,10 @@ class MuleProjectScanner:
             List of pom.xml file paths
         """
         pom_pattern = os.path.join(self.mule_directory, "*/pom.xml")
-        return glob.glob(pom_pattern)
+        return [
+            pom_file for pom_file in glob.glob(pom_pattern)
+            if owns_project(os.path.basename(os.path.dirname(pom_file)))
+        ]
     
     def _process_project(self, pom_file: str) -> ProjectInfo:
         """
@@ -69,43 +245,66 @@ class MuleProjectScanner:
         Returns:
             ProjectInfo object or None if processing fails
         """
+        fingerprint = ScanCache.fingerprint(pom_file)
+        if file_quarantine.is_quarantined(pom_file, fingerprint):
+            return None
+        
+        started = time.monotonic()
+        self.files_parsed += 1
         try:
             # Parse the pom.xml file
-            pom_data = self.xml_parser.parse_pom_xml(pom_file)
+            pom_data = self.xml_parser.load_pom_xml(pom_file)
             if not pom_data:
                 return None
             
-            # Extract project data
-            project_data = self.xml_parser.extract_project_data(pom_data)
-            
             # Extract project information
             project_name = os.path.basename(os.path.dirname(pom_file))
             project_path = os.path.dirname(pom_file)
             
-            # Extract properties
-            properties = project_data['properties']
-            app_runtime = properties.get('app.runtime')
-            mule_maven_plugin_version = properties.get('mule.maven.plugin.version')
-            
-            # Extract dependencies from dependencies
-            dependencies = self._extract_dependencies(project_data['dependencies'])
-            
-            # Create project info
-            return ProjectInfo(
-                project_name=project_name,
-                project_path=project_path,
-                group_id=project_data['group_id'],
-                artifact_id=project_data['artifact_id'],
-                version=project_data['version'],
-                packaging=project_data['packaging'],
-                app_runtime=app_runtime,
-                mule_maven_plugin_version=mule_maven_plugin_version,
-                dependencies=dependencies
-            )
+            project_info = self.build_project_info(pom_data, project_name, project_path)
             
         except Exception as e:
-            logger.error(f"Error processing project {pom_file}: {str(e)}")
+            file_quarantine.add("pom", pom_file, fingerprint, e, time.monotonic() - started)
             return None
+        
+        file_quarantine.release(pom_file)
+        return project_info
+    
+    def build_project_info(self, pom_data: dict, project_name: str, project_path: str) -> ProjectInfo:
+        """
+        Build project information from parsed pom.xml data
+        
+        Args:
+            pom_data: Parsed pom.xml data
+            project_name: Name of the project
+            project_path: Path of the project (directory or archive)
+            
+        Returns:
+            ProjectInfo object
+        """
+        # Extract project data
+        project_data = self.xml_parser.extract_project_data(pom_data)
+        
+        # Extract properties
+        properties = project_data['properties']
+        app_runtime = properties.get('app.runtime')
+        mule_maven_plugin_version = properties.get('mule.maven.plugin.version')
+        
+        # Extract dependencies from dependencies
+        dependencies = self._extract_dependencies(project_data['dependencies'])
+        
+        # Create project info
+        return ProjectInfo(
+            project_name=project_name,
+            project_path=project_path,
+            group_id=project_data['group_id'],
+            artifact_id=project_data['artifact_id'],
+            version=project_data['version'],
+            packaging=project_data['packaging'],
+            app_runtime=app_runtime,
+            mule_maven_plugin_version=mule_maven_plugin_version,
+            dependencies=dependencies
+        )
     
     def _extract_dependencies(self, dependencies_data: dict) -> List[DependencyInfo]:
         """
@@ -0,0 +1,147 @@
+"""
+Service for warming the scan cache in the background after startup
+"""
+import time
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import settings
+from app.services.flow_scanner import FlowScanner
+from app.services.mule_scanner import MuleProjectScanner
+from app.services.scan_cache import scan_cache
+from app.services.shared_store import shared_store
+
+logger = logging.getLogger(__name__)
+
+
+class ScanPrewarmer:
+    """Service class that scans the MuleSoft directory into the cache once at startup"""
+
+    def __init__(self):
+        """Initialize an idle pre-warmer"""
+        self.status = "disabled"  # disabled, running, completed or failed
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        # Background scans of projects skipped by a deadline, per scan kind
+        self._remaining: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the pre-warm scan on a background thread"""
+        if self._thread:
+            return
+
+        self.status = "running"
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="scan-prewarm", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """
+        Scan flows and dependencies so that the first requests hit a warm cache
+
+        A failed scan is retried after PREWARM_RETRY_SECONDS, doubling each time,
+        up to PREWARM_MAX_ATTEMPTS attempts.
+        """
+        max_attempts = max(1, settings.get_prewarm_max_attempts())
+        delay = settings.get_prewarm_retry_seconds()
+        while True:
+            self.attempts += 1
+            try:
+                FlowScanner().scan_project_flows()
+                MuleProjectScanner().scan_projects()
+                self.error = None
+                self.status = "completed"
+                logger.info(f"Scan cache pre-warmed with {scan_cache.files_indexed} files")
+                break
+            except Exception as e:
+                logger.error(f"Error pre-warming scan cache (attempt {self.attempts} of {max_attempts}): {str(e)}")
+                self.error = str(e)
+                if self.attempts >= max_attempts:
+                    self.status = "failed"
+                    break
+            time.sleep(delay)
+            delay *= 2
+        self.finished_at = time.time()
+
+    def warm_remaining(self, kind: str, project_names: List[str]) -> bool:
+        """
+        Scan projects skipped by a deadline into the cache on a background thread
+
+        Only one such scan runs per kind at a time; requests made while it runs
+        are ignored, so repeated timed-out requests do not pile up scans.
+
+        Args:
+            kind: "flows" or "dependencies"
+            project_names: Names of the projects to scan
+
+        Returns:
+            True if a background scan was started
+        """
+        if not project_names:
+            return False
+
+        with self._lock:
+            running = self._remaining.get(kind)
+            if running is not None and running.is_alive():
+                return False
+            thread = threading.Thread(target=self._run_remaining, args=(kind, list(project_names)),
+                                      name=f"scan-warm-{kind}", daemon=True)
+            self._remaining[kind] = thread
+            thread.start()
+            return True
+
+    @staticmethod
+    def _run_remaining(kind: str, project_names: List[str]) -> None:
+        """Scan the given projects so that their files are cached"""
+        scanner = FlowScanner() if kind == "flows" else MuleProjectScanner()
+        for project_name in project_names:
+            try:
+                if kind == "flows":
+                    scanner.get_project_flows(project_name)
+                else:
+                    scanner.scan_project(project_name)
+            except Exception as e:
+                logger.error(f"Error warming {kind} of project {project_name}: {str(e)}")
+        logger.info(f"Warmed {kind} of {len(project_names)} projects skipped by a scan deadline")
+
+    def is_ready(self) -> bool:
+        """
+        Whether scan data is available to serve requests
+
+        Without pre-warming, requests scan on demand and the instance is always
+        ready; the same applies once pre-warming has given up after its last
+        retry, which is reported by stats().
+
+        Returns:
+            True unless the pre-warm scan is still running or, with the shared
+            cache, no snapshot has been mapped yet
+        """
+        if scan_cache.has_full_scan("flows", "dependencies"):
+            return True
+        if shared_store.enabled:
+            return shared_store.get("flows") is not None
+        return self.status != "running"
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pre-warm status
+
+        Returns:
+            Dictionary with status, last error, attempts and timings
+        """
+        return {
+            "status": self.status,
+            "error": self.error,
+            "attempts": self.attempts,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+# Global pre-warmer instance
+prewarmer = ScanPrewarmer()
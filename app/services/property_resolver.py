@@ -0,0 +1,182 @@
+"""
+Service for resolving ${...} property placeholders per project and environment
+"""
+import os
+import glob
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.flows import FlowInfo, EndpointInfo
+from app.utils.property_parser import PropertyParser
+from app.services.scan_cache import ScanCache, Fingerprint
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Resource subdirectories holding files that are not properties (APIkit RAML/OAS specs)
+EXCLUDED_RESOURCE_DIRECTORIES = {"api"}
+
+
+class PropertyResolver:
+    """Service class for loading project properties and resolving placeholders"""
+
+    def __init__(self):
+        """Initialize the resolver with empty per-project caches"""
+        self._lock = threading.Lock()
+        # project path -> (property files signature, {environment: merged properties})
+        self._projects: Dict[str, Tuple[Tuple, Dict[Optional[str], Dict[str, str]]]] = {}
+        # property file path -> (fingerprint, parsed properties)
+        self._files: Dict[str, Tuple[Fingerprint, Dict[str, str]]] = {}
+
+    @staticmethod
+    def find_property_files(project_path: str) -> List[str]:
+        """
+        Find all property files in a MuleSoft project
+
+        YAML files under src/main/resources/api are API specifications and
+        are skipped.
+
+        Args:
+            project_path: Path to the MuleSoft project
+
+        Returns:
+            Sorted list of property file paths
+        """
+        property_patterns = [
+            os.path.join(project_path, "src/main/resources/*.yaml"),
+            os.path.join(project_path, "src/main/resources/*.yml"),
+            os.path.join(project_path, "src/main/resources/*.properties"),
+            os.path.join(project_path, "src/main/resources/*/*.yaml"),
+            os.path.join(project_path, "src/main/resources/*/*.yml"),
+            os.path.join(project_path, "src/main/resources/*/*.properties")
+        ]
+
+        resources_path = os.path.join(project_path, "src", "main", "resources")
+        property_files = []
+        for pattern in property_patterns:
+            property_files.extend(
+                path for path in glob.glob(pattern)
+                if os.path.relpath(path, resources_path).split(os.sep)[0] not in EXCLUDED_RESOURCE_DIRECTORIES
+            )
+
+        return sorted(property_files)
+
+    def get_properties(self, project_path: str, env: Optional[str] = None) -> Dict[str, str]:
+        """
+        Get the merged property map of a project for an environment
+
+        Files without an environment token in their name are loaded first,
+        then files named after the requested environment override them.
+
+        Args:
+            project_path: Path to the MuleSoft project
+            env: Environment key (e.g. "prod"), or None for shared files only
+
+        Returns:
+            Merged dictionary of property keys to values
+        """
+        env = env.lower() if env else None
+        property_files = self.find_property_files(project_path)
+        signature = tuple((path, ScanCache.fingerprint(path)) for path in property_files)
+
+        with self._lock:
+            cached = self._projects.get(project_path)
+            if cached is None or cached[0] != signature:
+                cached = (signature, {})
+                self._projects[project_path] = cached
+            if env in cached[1]:
+                return cached[1][env]
+
+        known_envs = set(settings.get_property_environments())
+        if env:
+            known_envs.add(env)
+
+        common_files = []
+        env_files = []
+        for path, _ in signature:
+            tokens = PropertyParser.environment_tokens(path)
+            if env and env in tokens:
+                env_files.append(path)
+            elif not tokens & known_envs:
+                common_files.append(path)
+
+        fingerprints = dict(signature)
+        merged = {}
+        for path in common_files + env_files:
+            merged.update(self._load_file(path, fingerprints[path]))
+
+        with self._lock:
+            cached[1][env] = merged
+
+        return merged
+
+    def _load_file(self, file_path: str, fingerprint: Optional[Fingerprint]) -> Dict[str, str]:
+        """
+        Load a single property file, reusing the parsed result while it is unchanged
+
+        Args:
+            file_path: Path to the property file
+            fingerprint: Current fingerprint of the file
+
+        Returns:
+            Parsed properties of the file
+        """
+        cached = self._files.get(file_path)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+        properties = PropertyParser.parse_property_file(file_path)
+        self._files[file_path] = (fingerprint, properties)
+        return properties
+
+    def resolve_flows(self, project_path: str, flows: List[FlowInfo], env: Optional[str]) -> List[FlowInfo]:
+        """
+        Resolve placeholders in flow endpoints for an environment
+
+        The given flows are not modified; resolved copies are returned.
+
+        Args:
+            project_path: Path to the MuleSoft project
+            flows: Parsed flows of the project
+            env: Environment key (e.g. "prod")
+
+        Returns:
+            List of FlowInfo objects with resolved endpoints
+        """
+        properties = self.get_properties(project_path, env)
+        if not properties:
+            return flows
+
+        resolved_flows = []
+        for flow in flows:
+            endpoints = [
+                EndpointInfo(**self._resolve(endpoint.dict(), properties), element=endpoint.element)
+                for endpoint in flow.endpoints
+            ]
+            resolved_flows.append(flow.copy(update={"endpoints": endpoints}))
+
+        return resolved_flows
+
+    def _resolve(self, value: Any, properties: Dict[str, str]) -> Any:
+        """
+        Recursively resolve placeholders in strings, dicts and lists
+
+        Args:
+            value: Value to resolve
+            properties: Property map to resolve against
+
+        Returns:
+            Resolved copy of the value
+        """
+        if isinstance(value, str):
+            return PropertyParser.resolve_value(value, properties)
+        if isinstance(value, dict):
+            return {key: self._resolve(item, properties) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(item, properties) for item in value]
+        return value
+
+
+# Global property resolver instance
+property_resolver = PropertyResolver()
@@ -0,0 +1,114 @@
+"""
+Negative cache of files that failed to parse
+"""
+import time
+import threading
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.utils.xml_parser import failure_reason
+
+logger = logging.getLogger(__name__)
+
+
+class FileQuarantine:
+    """
+    Files that failed to parse, skipped by scans until they change
+
+    Entries are keyed by file path and hold the fingerprint (or git blob
+    sha) of the failing version; a file whose fingerprint differs is parsed
+    again. Unlike the scan cache, the quarantine also applies to uncached
+    scans and survives cache clears.
+    """
+
+    def __init__(self):
+        """Initialize an empty quarantine"""
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def is_quarantined(self, file_path: str, fingerprint: Any) -> bool:
+        """
+        Check whether a file version is quarantined, counting the skip if so
+
+        Args:
+            file_path: Path to the file
+            fingerprint: Current fingerprint of the file
+
+        Returns:
+            True if this version of the file failed before
+        """
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is None or entry["fingerprint"] != fingerprint:
+                return False
+            entry["skipped"] += 1
+            return True
+
+    def add(self, kind: str, file_path: str, fingerprint: Any, error: Exception, elapsed: float) -> None:
+        """
+        Quarantine a file version that failed to parse
+
+        Args:
+            kind: Kind of file ("flow" or "pom")
+            file_path: Path to the file
+            fingerprint: Fingerprint of the failing version
+            error: Exception raised while parsing
+            elapsed: Seconds spent before the failure
+        """
+        reason = failure_reason(error)
+        logger.error(f"Quarantined {kind} file {file_path} ({reason}): {str(error)}")
+        with self._lock:
+            self._entries[file_path] = {
+                "file_path": file_path,
+                "kind": kind,
+                "fingerprint": fingerprint,
+                "reason": reason,
+                "error": str(error),
+                "elapsed_ms": round(elapsed * 1000, 1),
+                "quarantined_at": time.time(),
+                "skipped": 0
+            }
+
+    def release(self, file_path: str) -> None:
+        """
+        Remove a file from the quarantine, e.g. after it parsed successfully
+
+        Args:
+            file_path: Path to the file
+        """
+        if file_path in self._entries:
+            with self._lock:
+                self._entries.pop(file_path, None)
+
+    def clear(self) -> int:
+        """
+        Remove every entry so all files are parsed again
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    def entries(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List the quarantined files
+
+        Args:
+            kind: Only list files of this kind ("flow" or "pom")
+
+        Returns:
+            Entries sorted by file path, without their fingerprints
+        """
+        with self._lock:
+            entries = [
+                {key: value for key, value in entry.items() if key != "fingerprint"}
+                for entry in self._entries.values() if kind is None or entry["kind"] == kind
+            ]
+        return sorted(entries, key=lambda entry: entry["file_path"])
+
+
+# Global file quarantine instance
+file_quarantine = FileQuarantine()
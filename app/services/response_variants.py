@@ -0,0 +1,238 @@
+"""
+Service for pre-compressed variants of large scan responses
+"""
+import gzip
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Uncompressed representation
+IDENTITY = "identity"
+
+
+def _compress_gzip(payload: bytes, level: int) -> bytes:
+    """Compress with gzip; mtime is fixed so a variant only depends on its payload"""
+    return gzip.compress(payload, compresslevel=level, mtime=0)
+
+
+def _compress_brotli(payload: bytes, level: int) -> bytes:
+    """Compress with brotli"""
+    return brotli.compress(payload, quality=level)
+
+
+def _compress_zstd(payload: bytes, level: int) -> bytes:
+    """Compress with zstd"""
+    return zstandard.ZstdCompressor(level=level).compress(payload)
+
+
+# Content-Encoding -> (compressor, whether its module is installed)
+COMPRESSORS: Dict[str, Tuple[Callable[[bytes, int], bytes], bool]] = {
+    "zstd": (_compress_zstd, zstandard is not None),
+    "br": (_compress_brotli, brotli is not None),
+    "gzip": (_compress_gzip, True)
+}
+
+
+def encode_payload(result: Any) -> bytes:
+    """
+    Serialise a scan result as the JSON body sent to clients
+
+    Args:
+        result: Pydantic response model or plain dictionary
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    data = result.dict() if isinstance(result, BaseModel) else result
+    return json.dumps(data, default=str).encode("utf-8")
+
+
+def parse_accept_encoding(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip;q=0.8, br"
+
+    Returns:
+        Dictionary of lower-cased coding to its q-value
+    """
+    codings: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, parameters = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+class ResponseVariants:
+    """
+    Keeps each large scan response serialised once and compressed once per encoding
+
+    Variants are built on first request and kept until the key of the
+    underlying scan (its cache generation) changes, so repeated requests are
+    answered from memory without serialising or compressing again.
+    """
+
+    def __init__(self, encodings: Optional[List[str]] = None):
+        """
+        Initialize the cache
+
+        Args:
+            encodings: Content-Encodings in order of preference (RESPONSE_COMPRESSION_ENCODINGS if None)
+        """
+        configured = encodings if encodings is not None else settings.get_response_compression_encodings()
+        unknown = [encoding for encoding in configured if encoding not in COMPRESSORS]
+        if unknown:
+            logger.warning(f"Ignoring unknown response encodings: {', '.join(unknown)}")
+        self.encodings = [encoding for encoding in configured if COMPRESSORS.get(encoding, (None, False))[1]]
+        self._lock = threading.Lock()
+        # kind -> (key, encoding -> body)
+        self._variants: Dict[str, Tuple[Any, Dict[str, bytes]]] = {}
+        self.builds = 0
+        self.hits = 0
+
+    @staticmethod
+    def compress(payload: bytes, encoding: str) -> bytes:
+        """
+        Compress a payload at the configured level of an encoding
+
+        Args:
+            payload: Uncompressed body
+            encoding: Content-Encoding ("gzip", "br" or "zstd")
+
+        Returns:
+            Compressed body
+        """
+        compressor, _ = COMPRESSORS[encoding]
+        return compressor(payload, settings.get_response_compression_level(encoding))
+
+    def negotiate(self, accept_encoding: Optional[str], available: Optional[List[str]] = None) -> str:
+        """
+        Choose the encoding of a response
+
+        The client's highest q-value wins; ties go to the first encoding in
+        RESPONSE_COMPRESSION_ENCODINGS.
+
+        Args:
+            accept_encoding: Accept-Encoding header of the request
+            available: Encodings the body exists in (every configured encoding if None)
+
+        Returns:
+            An available encoding, or "identity"
+        """
+        codings = parse_accept_encoding(accept_encoding)
+        best, best_quality = IDENTITY, 0.0
+        for encoding in self.encodings:
+            if available is not None and encoding not in available:
+                continue
+            quality = codings.get(encoding, codings.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def get(self, kind: str, key: Any, encoding: str, build: Callable[[], bytes]) -> bytes:
+        """
+        Get a response body variant, building it if the key changed
+
+        Args:
+            kind: Response kind (e.g. "flows")
+            key: Value identifying the underlying scan; variants are rebuilt when it changes
+            encoding: Content-Encoding of the variant, or "identity"
+            build: Function returning the uncompressed body
+
+        Returns:
+            Body in the requested encoding
+        """
+        with self._lock:
+            current_key, variants = self._variants.get(kind, (None, {}))
+            if current_key != key:
+                variants = {}
+                self._variants[kind] = (key, variants)
+            body = variants.get(encoding)
+            if body is not None:
+                self.hits += 1
+                return body
+
+        payload = variants.get(IDENTITY)
+        if payload is None:
+            payload = build()
+        body = payload if encoding == IDENTITY else self.compress(payload, encoding)
+
+        with self._lock:
+            current_key, variants = self._variants.get(kind, (None, {}))
+            if current_key == key:
+                variants.setdefault(IDENTITY, payload)
+                variants[encoding] = body
+                self.builds += 1
+        return body
+
+    def response(self, kind: str, key: Any, accept_encoding: Optional[str], build: Callable[[], bytes]) -> Response:
+        """
+        Build a JSON response from the variant matching Accept-Encoding
+
+        Args:
+            kind: Response kind (e.g. "flows")
+            key: Value identifying the underlying scan
+            accept_encoding: Accept-Encoding header of the request
+            build: Function returning the uncompressed body
+
+        Returns:
+            Response with Content-Encoding and Vary headers set
+        """
+        encoding = self.negotiate(accept_encoding)
+        body = self.get(kind, key, encoding, build)
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding != IDENTITY:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get variant cache statistics
+
+        Returns:
+            Dictionary with the available encodings, cached variant sizes, builds and hits
+        """
+        with self._lock:
+            return {
+                "encodings": self.encodings,
+                "variants": {
+                    kind: {encoding: len(body) for encoding, body in variants.items()}
+                    for kind, (_, variants) in self._variants.items()
+                },
+                "builds": self.builds,
+                "hits": self.hits
+            }
+
+
+# Global response variant cache instance
+response_variants = ResponseVariants()
@@ -0,0 +1,87 @@
+"""
+Temporary on-disk spool for scan results too large to keep in memory
+"""
+import json
+import struct
+import tempfile
+import logging
+from typing import Any, Dict, Iterator, Optional
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Each record is prefixed with its length as a 4-byte big-endian unsigned int
+RECORD_HEADER = struct.Struct(">I")
+
+
+class ResultSpool:
+    """Append-only spool of JSON records that spills to disk past a memory limit"""
+
+    def __init__(self, max_memory_bytes: int = None, directory: Optional[str] = None):
+        """
+        Initialize an empty spool
+
+        Args:
+            max_memory_bytes: Bytes kept in memory before the spool moves to a temporary file
+            directory: Directory for the temporary file (system default if None)
+        """
+        if max_memory_bytes is None:
+            max_memory_bytes = settings.get_scan_spool_memory_bytes()
+        self._file = tempfile.SpooledTemporaryFile(
+            max_size=max_memory_bytes,
+            dir=directory or settings.get_scan_spool_directory()
+        )
+        self.count = 0
+        self.metadata: Dict[str, Any] = {}
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Append a record to the end of the spool
+
+        Args:
+            record: JSON-serialisable record
+        """
+        data = json.dumps(record, default=str).encode("utf-8")
+        self._file.seek(0, 2)
+        self._file.write(RECORD_HEADER.pack(len(data)))
+        self._file.write(data)
+        self.count += 1
+
+    def iter_raw(self) -> Iterator[bytes]:
+        """
+        Read the records back as encoded JSON, one at a time
+
+        Yields:
+            JSON-encoded records in the order they were appended
+        """
+        self._file.seek(0)
+        for _ in range(self.count):
+            header = self._file.read(RECORD_HEADER.size)
+            (length,) = RECORD_HEADER.unpack(header)
+            yield self._file.read(length)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read the records back as dictionaries, one at a time
+
+        Yields:
+            Records in the order they were appended
+        """
+        for data in self.iter_raw():
+            yield json.loads(data)
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the spool has moved from memory to disk"""
+        return getattr(self._file, "_rolled", True)
+
+    def close(self) -> None:
+        """Close the spool and delete its temporary file"""
+        self._file.close()
+
+    def __enter__(self) -> "ResultSpool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,183 @@
+"""
+In-memory cache of parsed MuleSoft project files
+"""
+import os
+import sys
+import time
+import threading
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# File fingerprint: (modification time in nanoseconds, size in bytes)
+Fingerprint = Tuple[int, int]
+
+
+class ScanCache:
+    """Cache of parsed file results keyed by file path and fingerprint"""
+
+    def __init__(self):
+        """Initialize an empty cache"""
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Tuple[Fingerprint, Any, int]] = {}
+        self.generation = 0
+        # kind -> generation of the last put of that kind
+        self._kind_generations: Dict[str, int] = {}
+        self._cleared_generation = 0
+        self.memory_bytes = 0
+        # kind -> (time the last full scan finished, its duration in seconds)
+        self.full_scans: Dict[str, Tuple[float, float]] = {}
+
+    @staticmethod
+    def fingerprint(file_path: str) -> Optional[Fingerprint]:
+        """
+        Get the fingerprint of a file on disk
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Fingerprint tuple or None if the file cannot be read
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, kind: str, file_path: str, fingerprint: Fingerprint) -> Optional[Any]:
+        """
+        Get a cached result if the file has not changed
+
+        Args:
+            kind: Kind of parsed result (e.g. "flows")
+            file_path: Path to the file
+            fingerprint: Current fingerprint of the file
+
+        Returns:
+            Cached result or None if missing or stale
+        """
+        entry = self._entries.get((kind, file_path))
+        if entry and entry[0] == fingerprint:
+            return entry[1]
+        return None
+
+    def put(self, kind: str, file_path: str, fingerprint: Fingerprint, value: Any) -> None:
+        """
+        Store a parsed result and bump the cache generation
+
+        Args:
+            kind: Kind of parsed result (e.g. "flows")
+            file_path: Path to the file
+            fingerprint: Fingerprint of the file when it was parsed
+            value: Parsed result
+        """
+        size = estimate_size(value)
+        with self._lock:
+            previous = self._entries.get((kind, file_path))
+            if previous:
+                self.memory_bytes -= previous[2]
+            self._entries[(kind, file_path)] = (fingerprint, value, size)
+            self.memory_bytes += size
+            self.generation += 1
+            self._kind_generations[kind] = self.generation
+
+    def clear(self) -> None:
+        """Remove all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self._kind_generations.clear()
+            self.memory_bytes = 0
+            self.generation += 1
+            self._cleared_generation = self.generation
+
+    def kind_generation(self, kind: str) -> int:
+        """
+        Get the generation of the last change to results of one kind
+
+        Unlike generation, it does not move when results of other kinds are
+        stored, e.g. flow locations or contents filled in on first use.
+
+        Args:
+            kind: Kind of parsed result (e.g. "flows")
+
+        Returns:
+            Generation of the last put of that kind or of the last clear
+        """
+        return max(self._kind_generations.get(kind, 0), self._cleared_generation)
+
+    def record_full_scan(self, kind: str, duration: float) -> None:
+        """
+        Record that a scan of the whole MuleSoft directory completed
+
+        Args:
+            kind: Kind of scan ("flows" or "dependencies")
+            duration: Duration of the scan in seconds
+        """
+        self.full_scans[kind] = (time.time(), duration)
+
+    def has_full_scan(self, *kinds: str) -> bool:
+        """
+        Check whether full scans of the given kinds have completed
+
+        Args:
+            kinds: Kinds of scan to check
+
+        Returns:
+            True if every kind has completed at least once
+        """
+        return all(kind in self.full_scans for kind in kinds)
+
+    @property
+    def files_indexed(self) -> int:
+        """Number of files currently cached"""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with generation, scan age, file count and estimated memory use
+        """
+        now = time.time()
+        return {
+            "generation": self.generation,
+            "full_scans": {
+                kind: {
+                    "finished_at": finished_at,
+                    "age_seconds": round(now - finished_at, 3),
+                    "duration_seconds": round(duration, 3)
+                }
+                for kind, (finished_at, duration) in self.full_scans.items()
+            },
+            "files_indexed": self.files_indexed,
+            "memory_bytes": self.memory_bytes
+        }
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory used by a parsed result
+
+    Args:
+        value: Parsed result made of models, dicts, lists and scalars
+
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, BaseModel):
+        size += estimate_size(value.__dict__)
+    elif isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+# Global scan cache instance
+scan_cache = ScanCache()
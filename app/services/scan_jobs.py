@@ -0,0 +1,284 @@
+"""
+Service for running MuleSoft scans as background jobs
+"""
+import uuid
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime
+from typing import List, Optional
+
+from app.models.scans import ScanJobStatus, ScanJobProgress
+from app.services.flow_scanner import FlowScanner
+from app.services.mule_scanner import MuleProjectScanner
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ScanQueueFullError(Exception):
+    """Raised when no more scan jobs can be accepted"""
+
+
+class ScanJobCancelled(Exception):
+    """Raised inside a running scan job when it has been cancelled"""
+
+
+class ScanJob:
+    """State of a single background scan job"""
+
+    def __init__(self, kind: str, env: Optional[str] = None):
+        """
+        Initialize a queued scan job
+
+        Args:
+            kind: Kind of scan ("flows" or "dependencies")
+            env: Environment used to resolve ${...} placeholders in flows
+        """
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.env = env
+        self.status = "queued"
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        self.result: Optional[dict] = None
+        self.scanner = None
+        self.future: Optional[Future] = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has reached a final state"""
+        return self.status in ("completed", "failed", "cancelled")
+
+    def to_status(self, include_result: bool = True) -> ScanJobStatus:
+        """
+        Build the status model of the job
+
+        Args:
+            include_result: Include the scan result when the job has completed
+
+        Returns:
+            ScanJobStatus object
+        """
+        scanner = self.scanner
+        return ScanJobStatus(
+            id=self.id,
+            kind=self.kind,
+            env=self.env,
+            status=self.status,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            progress=ScanJobProgress(
+                projects_done=scanner.projects_done if scanner else 0,
+                projects_total=scanner.projects_total if scanner else 0,
+                files_parsed=scanner.files_parsed if scanner else 0
+            ),
+            error=self.error,
+            result=self.result if include_result else None
+        )
+
+
+class ScanJobManager:
+    """Service class for queueing, running and cancelling background scans"""
+
+    def __init__(self, max_workers: int = None, max_queued: int = None, history: int = None):
+        """
+        Initialize the job manager
+
+        Args:
+            max_workers: Number of scan jobs that run concurrently
+            max_queued: Number of scan jobs that may wait for a free worker
+            history: Number of finished jobs kept for status queries
+        """
+        self.max_workers = max_workers or settings.get_scan_job_workers()
+        self.max_queued = max_queued if max_queued is not None else settings.get_scan_job_queue_size()
+        self.history = history or settings.get_scan_job_history()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scan-job")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ScanJob]" = OrderedDict()
+
+    def submit(self, kind: str, env: Optional[str] = None) -> ScanJob:
+        """
+        Queue a new scan job
+
+        Args:
+            kind: Kind of scan ("flows" or "dependencies")
+            env: Environment used to resolve ${...} placeholders in flows
+
+        Returns:
+            The queued ScanJob
+
+        Raises:
+            ScanQueueFullError: If all workers are busy and the queue is full
+        """
+        with self._lock:
+            active = sum(1 for job in self._jobs.values() if not job.finished)
+            if active >= self.max_workers + self.max_queued:
+                raise ScanQueueFullError(
+                    f"Scan queue is full ({active} active jobs), try again later"
+                )
+
+            job = ScanJob(kind, env)
+            self._jobs[job.id] = job
+            self._prune()
+            job.future = self._executor.submit(self._run, job)
+
+        return job
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        """
+        Get a job by id
+
+        Args:
+            job_id: Id of the job
+
+        Returns:
+            ScanJob or None if unknown
+        """
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[ScanJob]:
+        """
+        Get all known jobs, oldest first
+
+        Returns:
+            List of ScanJob objects
+        """
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[ScanJob]:
+        """
+        Cancel a queued or running job
+
+        Queued jobs are removed from the queue immediately; running jobs stop
+        after the project currently being scanned.
+
+        Args:
+            job_id: Id of the job
+
+        Returns:
+            The cancelled ScanJob or None if unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        job.cancel_event.set()
+        with self._lock:
+            future = job.future
+        if future and future.cancel():
+            job.status = "cancelled"
+            job.finished_at = datetime.utcnow()
+
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel all pending jobs and stop the worker threads"""
+        for job in self.list():
+            self.cancel(job.id)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: ScanJob) -> None:
+        """
+        Run a scan job on a worker thread
+
+        Args:
+            job: Job to run
+        """
+        if job.cancel_event.is_set():
+            # Cancelled after leaving the queue but before starting
+            job.status = "cancelled"
+            job.finished_at = datetime.utcnow()
+            return
+
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+
+        try:
+            if job.kind == "dependencies":
+                job.result = self._run_dependency_scan(job)
+            else:
+                job.result = self._run_flow_scan(job)
+            job.status = "completed"
+
+        except ScanJobCancelled:
+            job.status = "cancelled"
+
+        except Exception as e:
+            logger.error(f"Error running scan job {job.id}: {str(e)}")
+            job.error = str(e)
+            job.status = "failed"
+
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    def _run_flow_scan(self, job: ScanJob) -> dict:
+        """
+        Scan flows project by project, checking for cancellation in between
+
+        Args:
+            job: Job being run
+
+        Returns:
+            ProjectFlowsResponse as a dictionary
+        """
+        scanner = FlowScanner()
+        job.scanner = scanner
+
+        projects = []
+        total_flows = 0
+        total_endpoints = 0
+
+        for project_data in scanner.iter_project_flows(job.env):
+            if job.cancel_event.is_set():
+                raise ScanJobCancelled()
+            if project_data["flows"]:
+                projects.append(project_data)
+                total_flows += project_data["total_flows"]
+                total_endpoints += project_data["total_endpoints"]
+
+        return {
+            "total_projects": len(projects),
+            "total_flows": total_flows,
+            "total_endpoints": total_endpoints,
+            "projects": projects
+        }
+
+    def _run_dependency_scan(self, job: ScanJob) -> dict:
+        """
+        Scan dependencies project by project, checking for cancellation in between
+
+        Args:
+            job: Job being run
+
+        Returns:
+            MuleDependencyScanResponse as a dictionary
+        """
+        scanner = MuleProjectScanner()
+        job.scanner = scanner
+
+        projects = []
+        for project_info in scanner.iter_projects():
+            if job.cancel_event.is_set():
+                raise ScanJobCancelled()
+            projects.append(project_info.dict())
+
+        return {
+            "total_projects": len(projects),
+            "projects": projects
+        }
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond the history limit"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+
+# Global scan job manager instance
+scan_jobs = ScanJobManager()
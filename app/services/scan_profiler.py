@@ -0,0 +1,427 @@
+"""
+Service for profiling one flow scan under a sampling or deterministic profiler
+
+Only imported by the debug routes, which are mounted when PROFILING_ENABLED
+is set; regular scans are not instrumented in any way.
+"""
+import os
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.flows import FlowInfo
+from app.services.flow_scanner import FlowScanner
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("sampling", "deterministic")
+COLLAPSED_VIEWS = ("stacks", "files", "allocations")
+
+# Frames kept per traced allocation
+TRACEMALLOC_FRAMES = 16
+
+# Root of the source tree, used to shorten file names in stack labels
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ProfileBusyError(Exception):
+    """Raised when a profile is requested while another one is running"""
+
+
+def _short_file(filename: str) -> str:
+    """
+    Shorten a source file name for reports
+
+    Args:
+        filename: Absolute source file name
+
+    Returns:
+        Path relative to the source tree, or the last two path components
+    """
+    if filename.startswith(SOURCE_ROOT + os.sep):
+        return os.path.relpath(filename, SOURCE_ROOT)
+    return "/".join(filename.replace(os.sep, "/").split("/")[-2:])
+
+
+def _frame_label(code) -> str:
+    """
+    Build the collapsed-stack label of a code object
+
+    Args:
+        code: Code object of a frame
+
+    Returns:
+        Label such as "FlowParser.parse_flow_file (app/utils/flow_parser.py:42)"
+    """
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({_short_file(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+class StackSampler:
+    """Samples the call stack of one thread at a fixed interval"""
+
+    def __init__(self, thread_id: int, root_frame, interval: float):
+        """
+        Initialize the sampler
+
+        Args:
+            thread_id: Identifier of the sampled thread
+            root_frame: Frame at which stacks are cut, so only the profiled call is recorded
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.root_frame = root_frame
+        self.interval = interval
+        self.stacks: Dict[Tuple[str, ...], int] = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="scan-profiler-sampler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling"""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread"""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Sampler thread loop"""
+        labels: Dict[Any, str] = {}
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.root_frame:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                key = tuple(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+                self.samples += 1
+
+
+class ProfiledFlowScanner(FlowScanner):
+    """FlowScanner that parses every file without the cache and records its cost"""
+
+    def __init__(self, mule_directory: str = None, trace_memory: bool = False):
+        """
+        Initialize the scanner
+
+        Args:
+            mule_directory: Path to MuleSoft projects directory
+            trace_memory: Record the memory allocated while parsing each file
+        """
+        super().__init__(mule_directory, use_cache=False)
+        self.trace_memory = trace_memory
+        # (file path, size in bytes, flows, parse seconds, allocated bytes)
+        self.file_costs: List[Tuple[str, int, int, float, Optional[int]]] = []
+
+    def _parse_flow_file(self, flow_file: str) -> List[FlowInfo]:
+        """
+        Parse a flow file and record how long it took
+
+        Args:
+            flow_file: Path to the flow file
+
+        Returns:
+            List of FlowInfo objects
+        """
+        allocated_before = tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+        started = time.perf_counter()
+        flow_infos = super()._parse_flow_file(flow_file)
+        elapsed = time.perf_counter() - started
+        allocated = tracemalloc.get_traced_memory()[0] - allocated_before if self.trace_memory else None
+
+        try:
+            size = os.path.getsize(flow_file)
+        except OSError:
+            size = 0
+        self.file_costs.append((flow_file, size, len(flow_infos), elapsed, allocated))
+        return flow_infos
+
+
+class ScanProfile:
+    """Result of one profiled scan"""
+
+    def __init__(self, project: Optional[str], env: Optional[str], profiler: str, interval: float):
+        """
+        Initialize an empty result
+
+        Args:
+            project: Profiled project (None for the whole tree)
+            env: Environment used to resolve placeholders
+            profiler: "sampling" or "deterministic"
+            interval: Seconds between stack samples
+        """
+        self.project = project
+        self.env = env
+        self.profiler = profiler
+        self.interval = interval
+        self.mule_directory: Optional[str] = None
+        self.elapsed = 0.0
+        self.total_projects = 0
+        self.total_flows = 0
+        self.stacks: Dict[Tuple[str, ...], int] = {}
+        self.samples = 0
+        self.stats: Optional[pstats.Stats] = None
+        self.file_costs: List[Tuple[str, int, int, float, Optional[int]]] = []
+        self.memory_snapshot: Optional[tracemalloc.Snapshot] = None
+        self.peak_memory: Optional[int] = None
+
+    def top_functions(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the functions with the highest cumulative time
+
+        Deterministic profiles report exact times and call counts; sampling
+        profiles estimate times from the share of samples a function is on.
+
+        Args:
+            limit: Number of functions returned
+
+        Returns:
+            List of function dictionaries, highest cumulative time first
+        """
+        functions = []
+        if self.stats is not None:
+            for (filename, line, name), (_, calls, self_time, cumulative, _) in self.stats.stats.items():
+                if filename == "~" or filename == __file__:
+                    continue  # Built-ins without a source file, and the profiler itself
+                functions.append({
+                    "function": name,
+                    "file": _short_file(filename),
+                    "line": line,
+                    "calls": calls,
+                    "self_ms": round(self_time * 1000, 3),
+                    "cumulative_ms": round(cumulative * 1000, 3)
+                })
+        elif self.samples:
+            sample_ms = self.elapsed * 1000 / self.samples
+            self_counts: Dict[str, int] = {}
+            cumulative_counts: Dict[str, int] = {}
+            for stack, count in self.stacks.items():
+                self_counts[stack[-1]] = self_counts.get(stack[-1], 0) + count
+                for label in set(stack):
+                    cumulative_counts[label] = cumulative_counts.get(label, 0) + count
+            for label, count in cumulative_counts.items():
+                functions.append({
+                    "function": label,
+                    "samples": count,
+                    "self_ms": round(self_counts.get(label, 0) * sample_ms, 3),
+                    "cumulative_ms": round(count * sample_ms, 3)
+                })
+
+        functions.sort(key=lambda function: -function["cumulative_ms"])
+        return functions[:limit]
+
+    def top_allocations(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the source lines holding the most memory at the end of the scan
+
+        Args:
+            limit: Number of allocation sites returned
+
+        Returns:
+            List of allocation site dictionaries, largest first
+        """
+        if self.memory_snapshot is None:
+            return []
+        return [
+            {
+                "file": _short_file(statistic.traceback[0].filename),
+                "line": statistic.traceback[0].lineno,
+                "size_bytes": statistic.size,
+                "count": statistic.count
+            }
+            for statistic in self.memory_snapshot.statistics("lineno")[:limit]
+        ]
+
+    def summary(self, limit: int = 30) -> Dict[str, Any]:
+        """
+        Build the JSON report
+
+        Args:
+            limit: Number of functions, files and allocation sites reported
+
+        Returns:
+            Report dictionary
+        """
+        files = sorted(self.file_costs, key=lambda cost: -cost[3])
+        return {
+            "project": self.project,
+            "env": self.env,
+            "profiler": self.profiler,
+            "elapsed_ms": round(self.elapsed * 1000, 3),
+            "total_projects": self.total_projects,
+            "total_files": len(self.file_costs),
+            "total_flows": self.total_flows,
+            "samples": self.samples,
+            "sample_interval_ms": round(self.interval * 1000, 3),
+            "top_functions": self.top_functions(limit),
+            "files": [
+                {
+                    "file_path": file_path,
+                    "size_bytes": size,
+                    "flows": flows,
+                    "parse_ms": round(elapsed * 1000, 3),
+                    "allocated_bytes": allocated
+                }
+                for file_path, size, flows, elapsed, allocated in files[:limit]
+            ],
+            "memory": {
+                "peak_bytes": self.peak_memory,
+                "retained_bytes": sum(statistic.size for statistic in self.memory_snapshot.statistics("filename")),
+                "top_allocations": self.top_allocations(limit)
+            } if self.memory_snapshot is not None else None
+        }
+
+    def collapsed(self, view: str = "stacks") -> str:
+        """
+        Render the profile in the collapsed-stack format of flame graph tools
+
+        Args:
+            view: "stacks" (sampled call stacks, in samples), "files" (project;file,
+                in microseconds of parse time) or "allocations" (allocation
+                tracebacks, in bytes retained)
+
+        Returns:
+            One "frame;frame;frame value" line per distinct stack
+
+        Raises:
+            ValueError: If the view is unknown or has no data
+        """
+        if view == "stacks":
+            lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.items()]
+        elif view == "files":
+            lines = []
+            for file_path, _, _, elapsed, _ in self.file_costs:
+                relative = os.path.relpath(file_path, self.mule_directory) if self.mule_directory else file_path
+                lines.append(f"{relative.replace(os.sep, ';')} {max(1, int(elapsed * 1000000))}")
+        elif view == "allocations":
+            if self.memory_snapshot is None:
+                raise ValueError("Memory was not traced in this profile")
+            lines = []
+            for statistic in self.memory_snapshot.statistics("traceback"):
+                frames = [f"{_short_file(frame.filename)}:{frame.lineno}" for frame in reversed(statistic.traceback)]
+                lines.append(f"{';'.join(frames)} {statistic.size}")
+        else:
+            raise ValueError(f"Unknown view {view}, expected one of {', '.join(COLLAPSED_VIEWS)}")
+
+        return "\n".join(sorted(lines)) + "\n"
+
+
+class ScanProfiler:
+    """Runs one profiled scan at a time and keeps the last result"""
+
+    def __init__(self):
+        """Initialize the profiler"""
+        self._lock = threading.Lock()
+        self.last_profile: Optional[ScanProfile] = None
+
+    def profile(self, project: Optional[str] = None, env: Optional[str] = None,
+                profiler: str = "sampling", interval_ms: float = 1.0,
+                trace_memory: bool = True) -> ScanProfile:
+        """
+        Scan one project or the whole tree under the profilers
+
+        The scan bypasses the scan cache so every file is parsed. The stack
+        sampler always runs, so collapsed stacks are available for both
+        profilers; the deterministic profiler adds exact call counts and
+        times at the price of slowing the scan down.
+
+        Args:
+            project: Project to scan (the whole tree if None)
+            env: Environment used to resolve ${...} placeholders
+            profiler: "sampling" or "deterministic"
+            interval_ms: Milliseconds between stack samples
+            trace_memory: Trace allocations with tracemalloc
+
+        Returns:
+            ScanProfile with the results
+
+        Raises:
+            ValueError: If the profiler is unknown or the project does not exist
+            ProfileBusyError: If another profile is running
+        """
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler}, expected one of {', '.join(PROFILERS)}")
+        if not self._lock.acquire(blocking=False):
+            raise ProfileBusyError("Another profile is running")
+
+        try:
+            result = ScanProfile(project, env, profiler, interval_ms / 1000)
+            scanner = ProfiledFlowScanner(trace_memory=trace_memory)
+            result.mule_directory = scanner.mule_directory
+
+            started_tracing = trace_memory and not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            if trace_memory:
+                tracemalloc.reset_peak()
+
+            sampler = StackSampler(threading.get_ident(), sys._getframe(), result.interval)
+            deterministic = cProfile.Profile() if profiler == "deterministic" else None
+            try:
+                sampler.start()
+                if deterministic is not None:
+                    deterministic.enable()
+                started = time.perf_counter()
+                scanned = self._scan(scanner, project, env)
+                result.elapsed = time.perf_counter() - started
+            finally:
+                if deterministic is not None:
+                    deterministic.disable()
+                sampler.stop()
+                if trace_memory:
+                    # Taken while the scan results are still referenced
+                    result.peak_memory = tracemalloc.get_traced_memory()[1]
+                    result.memory_snapshot = tracemalloc.take_snapshot().filter_traces([
+                        tracemalloc.Filter(False, tracemalloc.__file__),
+                        tracemalloc.Filter(False, __file__),
+                        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                    ])
+                if started_tracing:
+                    tracemalloc.stop()
+
+            result.total_projects = len(scanned)
+            result.total_flows = sum(len(flows) for flows in scanned)
+            result.stacks = sampler.stacks
+            result.samples = sampler.samples
+            result.stats = pstats.Stats(deterministic) if deterministic is not None else None
+            result.file_costs = scanner.file_costs
+            self.last_profile = result
+            return result
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _scan(scanner: ProfiledFlowScanner, project: Optional[str], env: Optional[str]) -> List[List[FlowInfo]]:
+        """
+        Run the profiled scan
+
+        Args:
+            scanner: Profiled scanner
+            project: Project to scan (the whole tree if None)
+            env: Environment used to resolve placeholders
+
+        Returns:
+            Flows of each scanned project
+        """
+        if project is not None:
+            if os.path.basename(project) != project:
+                raise ValueError(f"Project {project} not found")
+            return [scanner.get_project_flows(project, env)]
+        return [flows for _, _, flows in scanner.iter_project_flow_infos(env)]
+
+
+# Global scan profiler instance
+scan_profiler = ScanProfiler()
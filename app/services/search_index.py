@@ -0,0 +1,196 @@
+"""
+Service for full-text search over flow contents across all MuleSoft projects
+"""
+import re
+import math
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models.flows import FlowInfo, FlowContent
+from app.services.incremental_index import IncrementalFlowIndex
+
+logger = logging.getLogger(__name__)
+
+# Weight of a token occurrence per field
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "doc:name": 2.0,
+    "logger": 1.5,
+    "dataweave": 1.0,
+    "attribute": 1.0,
+    "text": 1.0,
+}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search tokens
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List of tokens
+    """
+    return [token.lower() for token in TOKEN_PATTERN.findall(text)]
+
+
+class SearchIndex(IncrementalFlowIndex):
+    """
+    Inverted index from tokens to flows
+
+    Each flow is a document. Postings are kept per flow file, so a refresh
+    only re-indexes the files that changed since the last scan.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        super().__init__()
+        # token -> {doc id: (weighted term frequency, fields containing the token)}
+        self._postings: Dict[str, Dict[int, Tuple[float, Set[str]]]] = {}
+        # doc id -> (project name, file path, flow name, weighted length)
+        self._documents: Dict[int, Tuple[str, str, str, float]] = {}
+        # file path -> (doc ids, tokens)
+        self._files: Dict[str, Tuple[List[int], Set[str]]] = {}
+        self._next_doc_id = 0
+        self._total_length = 0.0
+
+    def _add_file(self, project_name: str, file_path: str, flows: List[FlowInfo],
+                  contents: List[FlowContent]) -> None:
+        """
+        Index the flows of one file
+
+        Args:
+            project_name: Name of the project
+            file_path: Path to the flow file
+            flows: FlowInfo objects parsed from the file
+            contents: Text and structure of each flow, in the same order
+        """
+        doc_ids = []
+        file_tokens: Set[str] = set()
+        for flow, content in zip(flows, contents):
+            doc_id = self._next_doc_id
+            self._next_doc_id += 1
+
+            frequencies: Dict[str, Tuple[float, Set[str]]] = {}
+            length = 0.0
+            for field, values in content.texts.items():
+                weight = FIELD_WEIGHTS.get(field, 1.0)
+                for value in values:
+                    for token in tokenize(value):
+                        frequency, fields = frequencies.get(token, (0.0, set()))
+                        fields.add(field)
+                        frequencies[token] = (frequency + weight, fields)
+                        length += weight
+
+            for token, posting in frequencies.items():
+                self._postings.setdefault(token, {})[doc_id] = posting
+            file_tokens.update(frequencies)
+
+            self._documents[doc_id] = (project_name, file_path, flow.name, length)
+            self._total_length += length
+            doc_ids.append(doc_id)
+
+        self._files[file_path] = (doc_ids, file_tokens)
+
+    def _remove_file(self, file_path: str) -> None:
+        """
+        Remove the postings of one file
+
+        Args:
+            file_path: Path to the flow file
+        """
+        doc_ids, file_tokens = self._files.pop(file_path)
+        for token in file_tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            for doc_id in doc_ids:
+                postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[token]
+
+        for doc_id in doc_ids:
+            self._total_length -= self._documents.pop(doc_id)[3]
+
+    def search(self, query: str, limit: int = 50, project: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find flows containing every token of the query, ranked by BM25
+
+        Args:
+            query: Search text
+            limit: Maximum number of hits returned
+            project: Only return hits in this project
+
+        Returns:
+            Dictionary with the total number of hits and the best hits
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            raise ValueError("Query contains no searchable terms")
+
+        with self._lock:
+            postings = [self._postings.get(token, {}) for token in tokens]
+            # Intersect starting from the rarest token
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for token_postings in postings[1:]:
+                candidates.intersection_update(token_postings)
+            if project is not None:
+                candidates = {doc_id for doc_id in candidates if self._documents[doc_id][0] == project}
+
+            total_documents = len(self._documents)
+            average_length = self._total_length / total_documents if total_documents else 1.0
+
+            scored = []
+            for doc_id in candidates:
+                project_name, file_path, flow_name, length = self._documents[doc_id]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (average_length or 1.0))
+                score = 0.0
+                fields: Set[str] = set()
+                for token_postings in postings:
+                    frequency, token_fields = token_postings[doc_id]
+                    idf = math.log(1 + (total_documents - len(token_postings) + 0.5) / (len(token_postings) + 0.5))
+                    score += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    fields.update(token_fields)
+                scored.append((score, project_name, file_path, flow_name, fields))
+
+        scored.sort(key=lambda hit: (-hit[0], hit[1], hit[2], hit[3]))
+        return {
+            "query": query,
+            "tokens": tokens,
+            "total_hits": len(scored),
+            "hits": [
+                {
+                    "project_name": project_name,
+                    "file_path": file_path,
+                    "flow_name": flow_name,
+                    "score": round(score, 4),
+                    "matched_fields": sorted(fields)
+                }
+                for score, project_name, file_path, flow_name, fields in scored[:limit]
+            ]
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get index statistics
+
+        Returns:
+            Dictionary with the number of indexed files, flows and distinct terms
+        """
+        return {
+            "files_indexed": self.files_indexed,
+            "flows_indexed": len(self._documents),
+            "terms_indexed": len(self._postings)
+        }
+
+
+# Global search index instance
+search_index = SearchIndex()
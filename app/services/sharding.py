@@ -0,0 +1,234 @@
+"""
+Service for sharded scanning across several instances
+
+Worker instances (SHARD_INDEX and SHARD_COUNT set) only scan the projects
+whose name hashes to their shard. A coordinator instance (SHARD_URLS set)
+fans /mule/flows and /mule/dependencies out to the workers and merges their
+responses, reporting unreachable shards instead of failing.
+"""
+import os
+import json
+import zlib
+import logging
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.flows import ProjectFlowsResponse
+from app.models.dependencies import MuleDependencyScanResponse
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def shard_of(project_name: str, shard_count: int) -> int:
+    """
+    Get the shard owning a project
+
+    CRC-32 of the name is used because it is stable across processes and
+    hosts, unlike hash().
+
+    Args:
+        project_name: Name of the project directory
+        shard_count: Number of shards
+
+    Returns:
+        Shard index in [0, shard_count)
+    """
+    return zlib.crc32(project_name.encode("utf-8")) % shard_count
+
+
+def owns_project(project_name: str) -> bool:
+    """
+    Check whether this instance scans a project
+
+    Args:
+        project_name: Name of the project directory
+
+    Returns:
+        True if sharding is off or the project hashes to this instance's shard
+    """
+    shard_index = settings.get_shard_index()
+    shard_count = settings.get_shard_count()
+    if shard_index is None or shard_count <= 1:
+        return True
+    return shard_of(project_name, shard_count) == shard_index
+
+
+def owned_projects(mule_directory: Optional[str] = None) -> List[str]:
+    """
+    List the project directories scanned by this instance
+
+    Args:
+        mule_directory: MuleSoft projects directory (MULE_DIRECTORY if None)
+
+    Returns:
+        Sorted project names
+    """
+    mule_directory = mule_directory or settings.get_mule_directory()
+    if not os.path.isdir(mule_directory):
+        return []
+    return sorted(
+        item for item in os.listdir(mule_directory)
+        if not item.startswith('.') and os.path.isdir(os.path.join(mule_directory, item)) and owns_project(item)
+    )
+
+
+class ShardCoordinator:
+    """Fans scan requests out to the shard workers and merges their responses"""
+
+    def __init__(self, urls: Optional[List[str]] = None, timeout: Optional[float] = None):
+        """
+        Initialize the coordinator
+
+        Args:
+            urls: Base URLs of the shard workers (SHARD_URLS if None)
+            timeout: Seconds to wait for each shard
+        """
+        self.urls = urls if urls is not None else settings.get_shard_urls()
+        self.timeout = timeout or settings.get_shard_timeout_seconds()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether this instance coordinates shard workers"""
+        return bool(self.urls)
+
+    def scan_flows(self, params: Dict[str, Any]) -> ProjectFlowsResponse:
+        """
+        Get /mule/flows from every shard and merge the responses
+
+        Args:
+            params: Query parameters forwarded to the shards (None values are dropped)
+
+        Returns:
+            Merged ProjectFlowsResponse; partial if a shard is missing or partial
+        """
+        responses, missing = self._fan_out("/mule/flows", params)
+        projects = self._merge_projects(responses)
+        return ProjectFlowsResponse(
+            total_projects=len(projects),
+            total_flows=sum(project["total_flows"] for project in projects),
+            total_endpoints=sum(project["total_endpoints"] for project in projects),
+            projects=projects,
+            partial=bool(missing) or any(response.get("partial") for response in responses),
+            skipped_projects=sorted(
+                project_name for response in responses for project_name in response.get("skipped_projects", [])
+            ),
+            missing_shards=missing
+        )
+
+    def scan_dependencies(self, params: Dict[str, Any]) -> MuleDependencyScanResponse:
+        """
+        Get /mule/dependencies from every shard and merge the responses
+
+        Args:
+            params: Query parameters forwarded to the shards (None values are dropped)
+
+        Returns:
+            Merged MuleDependencyScanResponse; partial if a shard is missing or partial
+        """
+        responses, missing = self._fan_out("/mule/dependencies", params)
+        projects = self._merge_projects(responses)
+        return MuleDependencyScanResponse(
+            total_projects=len(projects),
+            projects=projects,
+            partial=bool(missing) or any(response.get("partial") for response in responses),
+            skipped_projects=sorted(
+                project_name for response in responses for project_name in response.get("skipped_projects", [])
+            ),
+            missing_shards=missing
+        )
+
+    def shards(self) -> List[Dict[str, Any]]:
+        """
+        Get the shard information reported by every worker
+
+        Returns:
+            One dictionary per shard URL with its status and reported shard
+        """
+        with ThreadPoolExecutor(max_workers=len(self.urls), thread_name_prefix="shard-fan-out") as executor:
+            results = list(executor.map(lambda url: self._fetch(url, "/mule/shard", {}), self.urls))
+
+        statuses = []
+        for url, (response, error) in zip(self.urls, results):
+            status = {"url": url, "status": "ok" if error is None else "missing", "error": error}
+            if response is not None:
+                status.update(shard_index=response.get("shard_index"), shard_count=response.get("shard_count"),
+                              projects_owned=response.get("projects_owned"))
+            statuses.append(status)
+        return statuses
+
+    def _fan_out(self, path: str, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Request a path from every shard concurrently
+
+        Args:
+            path: Request path
+            params: Query parameters
+
+        Returns:
+            Tuple of (responses of the shards that answered, URLs of the shards that did not)
+        """
+        with ThreadPoolExecutor(max_workers=len(self.urls), thread_name_prefix="shard-fan-out") as executor:
+            results = list(executor.map(lambda url: self._fetch(url, path, params), self.urls))
+
+        responses = []
+        missing = []
+        for url, (response, error) in zip(self.urls, results):
+            if error is None:
+                responses.append(response)
+            else:
+                logger.warning(f"Shard {url} did not answer {path}: {error}")
+                missing.append(url)
+        return responses, missing
+
+    def _fetch(self, url: str, path: str, params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Get a JSON response from one shard
+
+        Args:
+            url: Base URL of the shard
+            path: Request path
+            params: Query parameters (None values are dropped)
+
+        Returns:
+            Tuple of (response or None, error message or None)
+        """
+        query = urllib.parse.urlencode({
+            key: str(value).lower() if isinstance(value, bool) else value
+            for key, value in params.items() if value is not None
+        })
+        request_url = url.rstrip("/") + path + (f"?{query}" if query else "")
+        try:
+            with urllib.request.urlopen(request_url, timeout=self.timeout) as response:
+                return json.loads(response.read()), None
+        except urllib.error.HTTPError as e:
+            return None, f"HTTP {e.code}"
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return None, str(getattr(e, "reason", e))
+
+    @staticmethod
+    def _merge_projects(responses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Concatenate the project lists of the shards
+
+        A project reported by more than one shard (e.g. while the shard count
+        is being changed) is only kept once.
+
+        Args:
+            responses: Shard responses
+
+        Returns:
+            Projects sorted by name
+        """
+        projects: Dict[str, Dict[str, Any]] = {}
+        for response in responses:
+            for project in response.get("projects", []):
+                projects.setdefault(project["project_name"], project)
+        return [projects[name] for name in sorted(projects)]
+
+
+# Global shard coordinator instance
+shard_coordinator = ShardCoordinator()
@@ -0,0 +1,344 @@
+"""
+Scan result store shared by all worker processes of a deployment
+"""
+import os
+import json
+import mmap
+import time
+import hashlib
+import threading
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+from app.services.flow_scanner import FlowScanner
+from app.services.mule_scanner import MuleProjectScanner
+from app.services.response_variants import IDENTITY, encode_payload, response_variants
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KINDS = ["flows", "dependencies"]
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "leader.lock"
+CHUNK_SIZE = 256 * 1024
+
+# File name suffix of each pre-compressed snapshot variant
+VARIANT_SUFFIXES = {"gzip": "gz", "br": "br", "zstd": "zst"}
+
+
+class SharedScanStore:
+    """
+    Shares scan results between uvicorn workers through snapshot files
+
+    One worker, elected by holding an exclusive lock file, scans the MuleSoft
+    directory and publishes each result as a JSON snapshot file together with
+    a manifest carrying a generation counter. Every worker memory-maps the
+    latest snapshots read-only and only remaps them when the generation
+    changes, so the scan runs once and the page cache holds a single copy.
+    The leader also writes each snapshot compressed once per response
+    encoding, so workers serve compressed responses without compressing.
+    """
+
+    def __init__(self, directory: Optional[str] = None, refresh_seconds: Optional[int] = None):
+        """
+        Initialize the store
+
+        Args:
+            directory: Directory holding the shared snapshots (disabled if empty)
+            refresh_seconds: Seconds between scans by the elected worker
+        """
+        self.directory = directory if directory is not None else settings.get_shared_cache_directory()
+        self.refresh_seconds = refresh_seconds or settings.get_shared_cache_refresh_seconds()
+        self.is_leader = False
+        self.generation = 0
+        self._lock_fd: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._manifest_mtime: Optional[int] = None
+        # (kind, encoding) -> mapped snapshot file
+        self._maps: Dict[Tuple[str, str], mmap.mmap] = {}
+        # Replaced maps that responses were still streaming when they were replaced
+        self._retired: List[mmap.mmap] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a shared cache directory is configured"""
+        return bool(self.directory)
+
+    def start(self) -> None:
+        """Start the background thread that elects a leader and publishes snapshots"""
+        if not self.enabled or self._thread:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="shared-scan-store", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and give up leadership"""
+        self._stop.set()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        self.is_leader = False
+        self._thread = None
+        with self._lock:
+            self._retire(self._maps.values())
+            self._maps = {}
+            self._manifest_mtime = None
+
+    def get(self, kind: str, encoding: str = IDENTITY) -> Optional[mmap.mmap]:
+        """
+        Get the latest published snapshot
+
+        Args:
+            kind: Snapshot kind ("flows" or "dependencies")
+            encoding: Content-Encoding of the variant, or "identity"
+
+        Returns:
+            Read-only memory map of the JSON snapshot, or None if none is published yet;
+            it is closed once a newer generation is mapped, so stream it through response()
+        """
+        if not self.enabled:
+            return None
+
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        try:
+            mtime = os.stat(manifest_path).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                self._remap(manifest_path, mtime)
+            return self._maps.get((kind, encoding))
+
+    def response(self, kind: str, accept_encoding: Optional[str]) -> Optional[StreamingResponse]:
+        """
+        Stream the latest snapshot in the variant matching Accept-Encoding
+
+        Args:
+            kind: Snapshot kind ("flows" or "dependencies")
+            accept_encoding: Accept-Encoding header of the request
+
+        Returns:
+            Streaming response, or None if no snapshot is published yet
+        """
+        if self.get(kind) is None:
+            return None
+
+        with self._lock:
+            available = [encoding for map_kind, encoding in self._maps if map_kind == kind]
+            encoding = response_variants.negotiate(accept_encoding, available)
+            snapshot = self._maps.get((kind, encoding))
+            if snapshot is None:
+                encoding = IDENTITY
+                snapshot = self._maps.get((kind, IDENTITY))
+            if snapshot is None:
+                return None
+            # Exporting a view under the lock keeps the map open until the response is sent
+            view = memoryview(snapshot)
+
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding != IDENTITY:
+            headers["Content-Encoding"] = encoding
+        return StreamingResponse(self.iter_snapshot(view), media_type="application/json", headers=headers)
+
+    def iter_snapshot(self, view: memoryview) -> Iterator[bytes]:
+        """
+        Read a mapped snapshot in chunks for a streaming response
+
+        Args:
+            view: Memory view of a map returned by get()
+
+        Yields:
+            Chunks of the JSON snapshot
+        """
+        try:
+            for offset in range(0, len(view), CHUNK_SIZE):
+                yield bytes(view[offset:offset + CHUNK_SIZE])
+        finally:
+            view.release()
+            if self._retired:
+                with self._lock:
+                    self._retire([])
+
+    def _retire(self, maps) -> None:
+        """
+        Close replaced maps, keeping those still exported to a streaming response
+
+        Must be called with the lock held. Maps that cannot be closed yet are
+        retried after the next response finishes or the next remap.
+
+        Args:
+            maps: Maps no longer served
+        """
+        still_open = []
+        for snapshot in list(self._retired) + list(maps):
+            try:
+                snapshot.close()
+            except BufferError:
+                still_open.append(snapshot)
+        self._retired = still_open
+
+    def _remap(self, manifest_path: str, mtime: int) -> None:
+        """
+        Map the snapshot files listed in the manifest
+
+        Args:
+            manifest_path: Path to the manifest file
+            mtime: Modification time of the manifest
+        """
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading shared scan manifest {manifest_path}: {str(e)}")
+            return
+
+        if manifest["generation"] == self.generation and self._maps:
+            self._manifest_mtime = mtime
+            return
+
+        maps = {}
+        for kind, entry in manifest["snapshots"].items():
+            files = {IDENTITY: entry["file"]}
+            files.update({encoding: variant["file"] for encoding, variant in entry.get("variants", {}).items()})
+            for encoding, file_name in files.items():
+                path = os.path.join(self.directory, file_name)
+                try:
+                    with open(path, 'rb') as f:
+                        maps[(kind, encoding)] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Error mapping shared scan snapshot {path}: {str(e)}")
+                    for partial in maps.values():
+                        partial.close()
+                    return
+
+        # Maps still exported to streaming responses are closed once those finish
+        self._retire(self._maps.values())
+        self._maps = maps
+        self.generation = manifest["generation"]
+        self._manifest_mtime = mtime
+        logger.info(f"Mapped shared scan snapshots generation {self.generation}")
+
+    def _run(self) -> None:
+        """Background loop: try to become leader and publish snapshots periodically"""
+        while not self._stop.is_set():
+            if self._try_acquire_leadership():
+                try:
+                    self.publish()
+                except Exception as e:
+                    logger.error(f"Error publishing shared scan snapshots: {str(e)}")
+            self._stop.wait(self.refresh_seconds)
+
+    def _try_acquire_leadership(self) -> bool:
+        """
+        Try to take the exclusive leader lock without blocking
+
+        The lock is released by the operating system when the leader process
+        exits, so another worker takes over on its next attempt.
+
+        Returns:
+            True if this process is the leader
+        """
+        if self._lock_fd is not None:
+            return True
+
+        import fcntl  # POSIX only, so imported when the shared cache is enabled
+
+        fd = os.open(os.path.join(self.directory, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        self._lock_fd = fd
+        self.is_leader = True
+        logger.info(f"Elected as shared scan leader (pid {os.getpid()})")
+        return True
+
+    def publish(self) -> int:
+        """
+        Scan all projects and publish new snapshots if anything changed
+
+        Returns:
+            The current generation
+        """
+        payloads = {
+            "flows": encode_payload(FlowScanner().scan_project_flows()),
+            "dependencies": encode_payload(MuleProjectScanner().scan_projects())
+        }
+        digests = {kind: hashlib.sha256(payload).hexdigest() for kind, payload in payloads.items()}
+
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        current = self._read_manifest(manifest_path)
+        if current and all(
+            current["snapshots"].get(kind, {}).get("sha256") == digest for kind, digest in digests.items()
+        ):
+            return current["generation"]
+
+        generation = (current["generation"] if current else 0) + 1
+        snapshots = {}
+        for kind, payload in payloads.items():
+            file_name = f"{kind}.{generation}.json"
+            self._write_atomic(os.path.join(self.directory, file_name), payload)
+            snapshots[kind] = {"file": file_name, "sha256": digests[kind], "size": len(payload), "variants": {}}
+            for encoding in response_variants.encodings:
+                variant_name = f"{file_name}.{VARIANT_SUFFIXES[encoding]}"
+                variant = response_variants.compress(payload, encoding)
+                self._write_atomic(os.path.join(self.directory, variant_name), variant)
+                snapshots[kind]["variants"][encoding] = {"file": variant_name, "size": len(variant)}
+
+        manifest = {"generation": generation, "published_at": time.time(), "snapshots": snapshots}
+        self._write_atomic(manifest_path, json.dumps(manifest).encode("utf-8"))
+        self._remove_stale_snapshots(generation)
+
+        logger.info(f"Published shared scan snapshots generation {generation}")
+        return generation
+
+    @staticmethod
+    def _read_manifest(manifest_path: str) -> Optional[Dict[str, Any]]:
+        """Read the manifest, or None if there is none yet"""
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        """Write a file so readers never see a partial version"""
+        temp_path = f"{path}.tmp.{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def _remove_stale_snapshots(self, generation: int) -> None:
+        """
+        Delete snapshot files and their variants older than the previous generation
+
+        Workers still mapping a deleted file keep a valid mapping until they remap.
+
+        Args:
+            generation: Current generation
+        """
+        for file_name in os.listdir(self.directory):
+            parts = file_name.split(".")
+            if len(parts) in (3, 4) and parts[0] in SNAPSHOT_KINDS and parts[2] == "json":
+                if parts[1].isdigit() and int(parts[1]) < generation - 1:
+                    try:
+                        os.unlink(os.path.join(self.directory, file_name))
+                    except OSError:
+                        pass
+
+
+# Global shared scan store instance
+shared_store = SharedScanStore()
@@ -0,0 +1,397 @@
+"""
+Service for storing scan results as content-addressed snapshots and diffing them
+"""
+import os
+import json
+import time
+import zlib
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.snapshots import (
+    SnapshotInfo, SnapshotDiff, ProjectDiff, FlowChange, EndpointChange, ProcessorCountChange, DependencyChange
+)
+from app.services.flow_scanner import FlowScanner
+from app.services.mule_scanner import MuleProjectScanner
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Number of decoded objects kept in memory
+OBJECT_CACHE_SIZE = 4096
+
+# Project attributes compared between snapshots besides dependencies
+PROJECT_ATTRIBUTES = ["group_id", "artifact_id", "version", "packaging", "app_runtime", "mule_maven_plugin_version"]
+
+# Project object compared against added and removed projects
+EMPTY_PROJECT: Dict[str, Any] = {"files": {}, "pom": None}
+
+
+class SnapshotStore:
+    """
+    Stores scans as a tree of content-addressed objects
+
+    Like a git tree, a snapshot points to a root object mapping project names
+    to project objects, which map flow file paths to file objects and point
+    to a pom object. Objects are named by the SHA-256 of their content, so
+    unchanged files and projects are stored once and shared by all snapshots,
+    and a diff only descends into subtrees whose hashes differ.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize the store
+
+        Args:
+            directory: Directory holding objects and snapshots
+        """
+        self.directory = directory or settings.get_snapshot_directory()
+        self._lock = threading.Lock()
+        self._objects: "OrderedDict[str, Any]" = OrderedDict()
+
+    def create(self, ref: Optional[str] = None, mule_directory: Optional[str] = None) -> SnapshotInfo:
+        """
+        Scan all projects and store the result as a new snapshot
+
+        Args:
+            ref: Git revision to scan instead of the working tree
+            mule_directory: MuleSoft projects directory (defaults to MULE_DIRECTORY)
+
+        Returns:
+            SnapshotInfo of the new snapshot
+        """
+        written = [0]
+        poms = {
+            project.project_name: project
+            for project in MuleProjectScanner(mule_directory, ref=ref).iter_projects()
+        }
+
+        projects = {}
+        total_flows = 0
+        for project_name, project_dir, flows in FlowScanner(mule_directory, ref=ref).iter_project_flow_infos():
+            files: Dict[str, List[Dict[str, Any]]] = {}
+            for flow in flows:
+                path = os.path.relpath(flow.file_path, project_dir).replace(os.sep, "/")
+                files.setdefault(path, []).append(flow.dict(exclude={"file_path"}))
+            total_flows += len(flows)
+
+            pom = poms.pop(project_name, None)
+            projects[project_name] = self._put_project(files, pom, written)
+
+        # Projects with a pom.xml but no flow directory
+        for project_name, pom in poms.items():
+            projects[project_name] = self._put_project({}, pom, written)
+
+        root = self._put({"projects": dict(sorted(projects.items()))}, written)
+
+        created_at = datetime.now(timezone.utc)
+        snapshot = SnapshotInfo(
+            id=f"{created_at.strftime('%Y%m%dT%H%M%S%fZ')}-{root[:8]}",
+            created_at=created_at,
+            ref=ref,
+            root=root,
+            total_projects=len(projects),
+            total_flows=total_flows,
+            objects_written=written[0]
+        )
+        self._write_atomic(self._snapshot_path(snapshot.id), snapshot.json().encode("utf-8"))
+
+        logger.info(f"Stored snapshot {snapshot.id} ({written[0]} new objects)")
+        return snapshot
+
+    def _put_project(self, files: Dict[str, List[Dict[str, Any]]], pom: Any, written: List[int]) -> str:
+        """Store the objects of one project and return the project object hash"""
+        return self._put({
+            "files": {path: self._put({"flows": flows}, written) for path, flows in sorted(files.items())},
+            "pom": self._put(pom.dict(exclude={"project_path"}), written) if pom else None
+        }, written)
+
+    def list_snapshots(self) -> List[SnapshotInfo]:
+        """
+        List stored snapshots
+
+        Returns:
+            List of SnapshotInfo objects, oldest first
+        """
+        snapshots = []
+        for snapshot_id in self._snapshot_ids():
+            try:
+                snapshots.append(SnapshotInfo.parse_file(self._snapshot_path(snapshot_id)))
+            except (OSError, ValueError) as e:
+                logger.error(f"Error reading snapshot {snapshot_id}: {str(e)}")
+        return snapshots
+
+    def resolve(self, name: str) -> SnapshotInfo:
+        """
+        Find a snapshot by id, "latest" or "previous"
+
+        Args:
+            name: Snapshot id, "latest" or "previous" (the one before latest)
+
+        Returns:
+            SnapshotInfo
+
+        Raises:
+            ValueError: If there is no such snapshot
+        """
+        if name in ("latest", "previous"):
+            # Ids start with the creation time, so they sort chronologically
+            snapshot_ids = self._snapshot_ids()
+            position = 1 if name == "latest" else 2
+            if len(snapshot_ids) < position:
+                raise ValueError(f"No {name} snapshot")
+            name = snapshot_ids[-position]
+
+        path = self._snapshot_path(os.path.basename(name))
+        if not os.path.exists(path):
+            raise ValueError(f"Snapshot {name} not found")
+        return SnapshotInfo.parse_file(path)
+
+    def _snapshot_ids(self) -> List[str]:
+        """Get the ids of stored snapshots, oldest first"""
+        snapshot_dir = os.path.join(self.directory, "snapshots")
+        if not os.path.isdir(snapshot_dir):
+            return []
+        return sorted(file_name[:-5] for file_name in os.listdir(snapshot_dir) if file_name.endswith(".json"))
+
+    def _snapshot_path(self, snapshot_id: str) -> str:
+        """Get the path of a snapshot file"""
+        return os.path.join(self.directory, "snapshots", f"{snapshot_id}.json")
+
+    def diff(self, from_name: str = "previous", to_name: str = "latest") -> SnapshotDiff:
+        """
+        Compare two snapshots
+
+        Only projects and files whose hashes differ are loaded and compared.
+        Added and removed projects are compared against an empty project, so
+        their flows, endpoints and dependency versions are listed.
+
+        Args:
+            from_name: Older snapshot id, "latest" or "previous"
+            to_name: Newer snapshot id, "latest" or "previous"
+
+        Returns:
+            SnapshotDiff
+        """
+        started = time.monotonic()
+        before = self.resolve(from_name)
+        after = self.resolve(to_name)
+        compared = [0]
+
+        projects_added = []
+        projects_removed = []
+        projects_changed = []
+        if before.root != after.root:
+            projects_before = self._get(before.root, compared)["projects"]
+            projects_after = self._get(after.root, compared)["projects"]
+
+            for project_name in sorted(projects_before.keys() | projects_after.keys()):
+                hash_before = projects_before.get(project_name)
+                hash_after = projects_after.get(project_name)
+                if hash_before == hash_after:
+                    continue
+                project_before = self._get(hash_before, compared) if hash_before else EMPTY_PROJECT
+                project_after = self._get(hash_after, compared) if hash_after else EMPTY_PROJECT
+                project_diff = self._diff_project(project_name, project_before, project_after, compared)
+                if hash_before is None:
+                    projects_added.append(project_diff)
+                elif hash_after is None:
+                    projects_removed.append(project_diff)
+                else:
+                    projects_changed.append(project_diff)
+
+        return SnapshotDiff(
+            from_snapshot=before.id,
+            to_snapshot=after.id,
+            identical=before.root == after.root,
+            projects_added=projects_added,
+            projects_removed=projects_removed,
+            projects_changed=projects_changed,
+            objects_compared=compared[0],
+            elapsed_ms=round((time.monotonic() - started) * 1000, 3)
+        )
+
+    def _diff_project(self, project_name: str, before: Dict[str, Any], after: Dict[str, Any],
+                      compared: List[int]) -> ProjectDiff:
+        """
+        Compare two versions of a project object
+
+        Args:
+            project_name: Name of the project
+            before: Older project object
+            after: Newer project object
+            compared: Counter of objects loaded
+
+        Returns:
+            ProjectDiff
+        """
+        diff = ProjectDiff(project_name=project_name)
+        files_before = before["files"]
+        files_after = after["files"]
+
+        # (file path, flow name) -> flow; flow names are only unique within a file
+        flows_before: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        flows_after: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for path in sorted(files_before.keys() | files_after.keys()):
+            hash_before = files_before.get(path)
+            hash_after = files_after.get(path)
+            if hash_before == hash_after:
+                continue
+
+            if hash_before is None:
+                diff.files_added.append(path)
+            elif hash_after is None:
+                diff.files_removed.append(path)
+            else:
+                diff.files_changed.append(path)
+
+            if hash_before:
+                flows_before.update(
+                    ((path, flow["name"]), flow) for flow in self._get(hash_before, compared)["flows"]
+                )
+            if hash_after:
+                flows_after.update(
+                    ((path, flow["name"]), flow) for flow in self._get(hash_after, compared)["flows"]
+                )
+
+        for file_path, flow_name in sorted(flows_before.keys() | flows_after.keys()):
+            flow_before = flows_before.get((file_path, flow_name))
+            flow_after = flows_after.get((file_path, flow_name))
+            if flow_before is None:
+                diff.flows_added.append(FlowChange(flow_name=flow_name, file_path=file_path))
+            elif flow_after is None:
+                diff.flows_removed.append(FlowChange(flow_name=flow_name, file_path=file_path))
+            elif flow_before["processors_count"] != flow_after["processors_count"]:
+                diff.processors_changed.append(ProcessorCountChange(
+                    flow_name=flow_name,
+                    file_path=file_path,
+                    before=flow_before["processors_count"],
+                    after=flow_after["processors_count"]
+                ))
+
+            endpoints_before = self._endpoint_keys(flow_before)
+            endpoints_after = self._endpoint_keys(flow_after)
+            diff.endpoints_added.extend(
+                EndpointChange(flow_name=flow_name, file_path=file_path, method=method, path=path)
+                for method, path in sorted(endpoints_after - endpoints_before, key=str)
+            )
+            diff.endpoints_removed.extend(
+                EndpointChange(flow_name=flow_name, file_path=file_path, method=method, path=path)
+                for method, path in sorted(endpoints_before - endpoints_after, key=str)
+            )
+
+        if before["pom"] != after["pom"]:
+            pom_before = self._get(before["pom"], compared) if before["pom"] else {}
+            pom_after = self._get(after["pom"], compared) if after["pom"] else {}
+            self._diff_pom(diff, pom_before, pom_after)
+
+        return diff
+
+    @staticmethod
+    def _endpoint_keys(flow: Optional[Dict[str, Any]]) -> set:
+        """Get the (method, path) pairs of a flow's endpoints"""
+        if not flow:
+            return set()
+        return {(endpoint.get("method"), endpoint.get("path")) for endpoint in flow["endpoints"]}
+
+    @staticmethod
+    def _diff_pom(diff: ProjectDiff, before: Dict[str, Any], after: Dict[str, Any]) -> None:
+        """
+        Record dependency and project attribute changes between two pom objects
+
+        Args:
+            diff: ProjectDiff to fill in
+            before: Older pom object ({} if missing)
+            after: Newer pom object ({} if missing)
+        """
+        for attribute in PROJECT_ATTRIBUTES:
+            if before.get(attribute) != after.get(attribute):
+                diff.attributes_changed[attribute] = {"before": before.get(attribute), "after": after.get(attribute)}
+
+        def by_key(pom: Dict[str, Any]) -> Dict[Tuple, str]:
+            return {
+                (dep["group_id"], dep["artifact_id"], dep.get("classifier")): dep["version"]
+                for dep in pom.get("dependencies", [])
+            }
+
+        dependencies_before = by_key(before)
+        dependencies_after = by_key(after)
+        for key in sorted(dependencies_before.keys() | dependencies_after.keys(), key=str):
+            version_before = dependencies_before.get(key)
+            version_after = dependencies_after.get(key)
+            if version_before != version_after:
+                diff.dependencies_changed.append(DependencyChange(
+                    group_id=key[0],
+                    artifact_id=key[1],
+                    classifier=key[2],
+                    before=version_before,
+                    after=version_after
+                ))
+
+    def _put(self, value: Any, written: List[int]) -> str:
+        """
+        Store an object unless an identical one exists
+
+        Args:
+            value: JSON-serialisable object
+            written: Counter of objects written
+
+        Returns:
+            SHA-256 hash naming the object
+        """
+        data = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        object_hash = hashlib.sha256(data).hexdigest()
+
+        path = self._object_path(object_hash)
+        if not os.path.exists(path):
+            self._write_atomic(path, zlib.compress(data))
+            written[0] += 1
+        return object_hash
+
+    def _get(self, object_hash: str, compared: List[int]) -> Any:
+        """
+        Load an object, reusing recently loaded objects
+
+        Args:
+            object_hash: Hash naming the object
+            compared: Counter of objects loaded
+
+        Returns:
+            Decoded object
+        """
+        compared[0] += 1
+        with self._lock:
+            value = self._objects.get(object_hash)
+            if value is not None:
+                self._objects.move_to_end(object_hash)
+                return value
+
+        with open(self._object_path(object_hash), 'rb') as f:
+            value = json.loads(zlib.decompress(f.read()))
+
+        with self._lock:
+            self._objects[object_hash] = value
+            if len(self._objects) > OBJECT_CACHE_SIZE:
+                self._objects.popitem(last=False)
+        return value
+
+    def _object_path(self, object_hash: str) -> str:
+        """Get the path of an object file"""
+        return os.path.join(self.directory, "objects", object_hash[:2], object_hash[2:])
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        """Write a file so readers never see a partial version"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+
+# Global snapshot store instance
+snapshot_store = SnapshotStore()
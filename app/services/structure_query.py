@@ -0,0 +1,330 @@
+"""
+Service for structural queries over the element ancestry paths of all flows
+
+Query language:
+    foreach//db:select                  db:select anywhere inside a foreach
+    choice/when/http:request            http:request directly inside a choice branch
+    !until-successful//http:request     http:request with no enclosing until-successful
+    /flow/http:listener                 http:listener directly under the flow (anchored)
+    not error-handler                   flows without an error-handler
+    foreach//db:select and not error-handler
+    (http:request or db:select) and scheduler
+
+A pattern is a list of element names separated by "/" (direct child) or
+"//" (any depth); "*" matches any element. A flow matches a pattern if any
+of its elements does. Patterns combine with and, or, not and parentheses.
+"""
+import re
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models.flows import FlowInfo, FlowContent
+from app.services.incremental_index import IncrementalFlowIndex
+
+logger = logging.getLogger(__name__)
+
+QUERY_TOKEN_PATTERN = re.compile(r"\s*(\(|\)|[^\s()]+)")
+ELEMENT_NAME_PATTERN = re.compile(r"^(\*|[A-Za-z_][\w.\-]*(:[\w.\-]+)?)$")
+
+# Matched flows: doc id -> element paths that matched
+Matches = Dict[int, Set[str]]
+
+
+class PathPattern:
+    """Compiled element path pattern matched against ancestry paths"""
+
+    def __init__(self, pattern: str):
+        """
+        Compile a pattern
+
+        Args:
+            pattern: Pattern text, e.g. "foreach//db:select"
+
+        Raises:
+            ValueError: If the pattern is malformed
+        """
+        self.pattern = pattern
+        self.excluded_ancestor: Optional[str] = None
+
+        text = pattern
+        if text.startswith("!"):
+            excluded, separator, text = text[1:].partition("//")
+            if not separator or not ELEMENT_NAME_PATTERN.match(excluded) or excluded == "*":
+                raise ValueError(f"Invalid pattern {pattern}: expected !element//pattern")
+            self.excluded_ancestor = excluded
+
+        anchored = text.startswith("/") and not text.startswith("//")
+        if text.startswith("//"):
+            text = text[2:]  # Same as an unanchored pattern
+        steps = re.split(r"(//|/)", text[1:] if anchored else text)
+        names = steps[0::2]
+        axes = steps[1::2]
+        if not names or any(not ELEMENT_NAME_PATTERN.match(name) for name in names):
+            raise ValueError(f"Invalid pattern {pattern}")
+
+        regex = "^" if anchored else "(?:^|/)"
+        for index, name in enumerate(names):
+            if index:
+                regex += "/" if axes[index - 1] == "/" else "/(?:[^/]+/)*"
+            regex += "[^/]+" if name == "*" else re.escape(name)
+        self._regex = re.compile(regex + "$")
+
+        # Element name the path must end with, used to look up candidate paths
+        self.target = None if names[-1] == "*" else names[-1]
+
+    def matches(self, path: str) -> bool:
+        """
+        Check whether an element ancestry path matches
+
+        Args:
+            path: Slash-separated ancestry path, e.g. "flow/foreach/db:select"
+
+        Returns:
+            True if the element at the end of the path matches
+        """
+        if not self._regex.search(path):
+            return False
+        if self.excluded_ancestor is not None:
+            return self.excluded_ancestor not in path.split("/")[:-1]
+        return True
+
+
+class StructureQuery:
+    """Parsed query: a tree of and/or/not nodes over path patterns"""
+
+    def __init__(self, query: str):
+        """
+        Parse a query
+
+        Args:
+            query: Query text
+
+        Raises:
+            ValueError: If the query is malformed
+        """
+        self.query = query
+        self._tokens = QUERY_TOKEN_PATTERN.findall(query.strip())
+        self._position = 0
+        if not self._tokens:
+            raise ValueError("Empty query")
+
+        self.tree = self._parse_or()
+        if self._position != len(self._tokens):
+            raise ValueError(f"Unexpected '{self._tokens[self._position]}' in query")
+
+    def _peek(self) -> Optional[str]:
+        """Get the next token without consuming it"""
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def _take(self) -> str:
+        """Consume the next token"""
+        token = self._peek()
+        if token is None:
+            raise ValueError("Unexpected end of query")
+        self._position += 1
+        return token
+
+    def _parse_or(self) -> Tuple:
+        """or_expr := and_expr ("or" and_expr)*"""
+        node = self._parse_and()
+        while self._peek() == "or":
+            self._take()
+            node = ("or", node, self._parse_and())
+        return node
+
+    def _parse_and(self) -> Tuple:
+        """and_expr := unary ("and" unary)*"""
+        node = self._parse_unary()
+        while self._peek() == "and":
+            self._take()
+            node = ("and", node, self._parse_unary())
+        return node
+
+    def _parse_unary(self) -> Tuple:
+        """unary := "not" unary | "(" or_expr ")" | pattern"""
+        token = self._take()
+        if token == "not":
+            return ("not", self._parse_unary())
+        if token == "(":
+            node = self._parse_or()
+            if self._take() != ")":
+                raise ValueError("Missing ')' in query")
+            return node
+        if token in (")", "and", "or"):
+            raise ValueError(f"Unexpected '{token}' in query")
+        return ("pattern", PathPattern(token))
+
+
+class StructureIndex(IncrementalFlowIndex):
+    """
+    Index of the distinct element ancestry paths of every flow
+
+    Ancestry paths are recorded by FlowParser while parsing, so queries match
+    patterns against the distinct paths (shared by many flows) instead of
+    walking flow elements again.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        super().__init__()
+        # ancestry path -> doc ids of flows containing it
+        self._path_docs: Dict[str, Set[int]] = {}
+        # last element name -> ancestry paths ending with it
+        self._paths_by_name: Dict[str, Set[str]] = {}
+        # doc id -> (project name, file path, flow name, ancestry paths)
+        self._documents: Dict[int, Tuple[str, str, str, List[str]]] = {}
+        # file path -> doc ids
+        self._files: Dict[str, List[int]] = {}
+        self._next_doc_id = 0
+
+    def _add_file(self, project_name: str, file_path: str, flows: List[FlowInfo],
+                  contents: List[FlowContent]) -> None:
+        """
+        Index the ancestry paths of the flows of one file
+
+        Args:
+            project_name: Name of the project
+            file_path: Path to the flow file
+            flows: FlowInfo objects parsed from the file
+            contents: Text and structure of each flow, in the same order
+        """
+        doc_ids = []
+        for flow, content in zip(flows, contents):
+            doc_id = self._next_doc_id
+            self._next_doc_id += 1
+
+            paths = content.element_paths
+            for path in paths:
+                docs = self._path_docs.get(path)
+                if docs is None:
+                    docs = self._path_docs[path] = set()
+                    self._paths_by_name.setdefault(path.rsplit("/", 1)[-1], set()).add(path)
+                docs.add(doc_id)
+
+            self._documents[doc_id] = (project_name, file_path, flow.name, paths)
+            doc_ids.append(doc_id)
+
+        self._files[file_path] = doc_ids
+
+    def _remove_file(self, file_path: str) -> None:
+        """
+        Remove the flows of one file
+
+        Args:
+            file_path: Path to the flow file
+        """
+        for doc_id in self._files.pop(file_path):
+            _, _, _, paths = self._documents.pop(doc_id)
+            for path in paths:
+                docs = self._path_docs[path]
+                docs.discard(doc_id)
+                if not docs:
+                    del self._path_docs[path]
+                    name = path.rsplit("/", 1)[-1]
+                    self._paths_by_name[name].discard(path)
+                    if not self._paths_by_name[name]:
+                        del self._paths_by_name[name]
+
+    def query(self, query: str, limit: int = 100, project: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find flows matching a structural query
+
+        Args:
+            query: Query text
+            limit: Maximum number of flows returned
+            project: Only return flows of this project
+
+        Returns:
+            Dictionary with the number of matching flows and the first matches
+
+        Raises:
+            ValueError: If the query is malformed
+        """
+        parsed = StructureQuery(query)
+
+        with self._lock:
+            matches = self._evaluate(parsed.tree)
+            rows = [
+                (self._documents[doc_id], paths)
+                for doc_id, paths in matches.items()
+                if project is None or self._documents[doc_id][0] == project
+            ]
+
+        rows.sort(key=lambda row: (row[0][0], row[0][1], row[0][2]))
+        return {
+            "query": query,
+            "total_flows": len(rows),
+            "flows": [
+                {
+                    "project_name": project_name,
+                    "file_path": file_path,
+                    "flow_name": flow_name,
+                    "matched_paths": sorted(paths)
+                }
+                for (project_name, file_path, flow_name, _), paths in rows[:limit]
+            ]
+        }
+
+    def _evaluate(self, node: Tuple) -> Matches:
+        """
+        Evaluate a query tree node
+
+        Args:
+            node: Parsed query node
+
+        Returns:
+            Matching doc ids with the element paths that matched
+        """
+        kind = node[0]
+        if kind == "pattern":
+            return self._match_pattern(node[1])
+
+        if kind == "not":
+            excluded = self._evaluate(node[1])
+            return {doc_id: set() for doc_id in self._documents if doc_id not in excluded}
+
+        left = self._evaluate(node[1])
+        right = self._evaluate(node[2])
+        if kind == "and":
+            return {doc_id: left[doc_id] | right[doc_id] for doc_id in left.keys() & right.keys()}
+
+        combined = {doc_id: set(paths) for doc_id, paths in left.items()}
+        for doc_id, paths in right.items():
+            combined.setdefault(doc_id, set()).update(paths)
+        return combined
+
+    def _match_pattern(self, pattern: PathPattern) -> Matches:
+        """
+        Match a pattern against the distinct ancestry paths
+
+        Args:
+            pattern: Compiled pattern
+
+        Returns:
+            Matching doc ids with the element paths that matched
+        """
+        candidates = self._paths_by_name.get(pattern.target, ()) if pattern.target else self._path_docs.keys()
+
+        matches: Matches = {}
+        for path in candidates:
+            if pattern.matches(path):
+                for doc_id in self._path_docs[path]:
+                    matches.setdefault(doc_id, set()).add(path)
+        return matches
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get index statistics
+
+        Returns:
+            Dictionary with the number of indexed files, flows and distinct paths
+        """
+        return {
+            "files_indexed": self.files_indexed,
+            "flows_indexed": len(self._documents),
+            "paths_indexed": len(self._path_docs)
+        }
+
+
+# Global structure index instance
+structure_index = StructureIndex()
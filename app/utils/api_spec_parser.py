@@ -0,0 +1,284 @@
+"""
+API specification parsing utilities for APIkit RAML and OAS specs
+"""
+import os
+import re
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+HTTP_METHODS = {"get", "post", "put", "delete", "patch", "head", "options"}
+
+# Extensions of files that can hold a root API specification
+SPEC_EXTENSIONS = {".raml", ".yaml", ".yml", ".json"}
+
+# Bytes read to recognise a root specification
+SPEC_SNIFF_BYTES = 4096
+
+RAML_ROOT_PATTERN = re.compile(rb"^\s*#%RAML\s+(0\.8|1\.0)\s*$", re.MULTILINE)
+OAS_ROOT_PATTERN = re.compile(rb"""^\s*["']?(openapi|swagger)["']?\s*:""", re.MULTILINE)
+
+# Operation: (HTTP method in upper case, resource path as written in the spec)
+Operation = Tuple[str, str]
+
+
+class IncludeRef:
+    """Unresolved RAML !include, resolved relative to the including file when needed"""
+
+    __slots__ = ("path",)
+
+    def __init__(self, path: str):
+        self.path = path
+
+
+class RamlLoader(yaml.SafeLoader):
+    """YAML loader that keeps RAML !include tags as IncludeRef markers"""
+
+
+RamlLoader.add_constructor("!include", lambda loader, node: IncludeRef(loader.construct_scalar(node)))
+
+
+def parse_document(content: bytes, file_path: str) -> Any:
+    """
+    Parse a RAML, YAML or JSON document
+
+    Args:
+        content: Raw file content
+        file_path: Path of the file, used to pick the format
+
+    Returns:
+        Parsed document with !include tags kept as IncludeRef markers
+    """
+    if file_path.lower().endswith(".json"):
+        return json.loads(content)
+    return yaml.load(content, Loader=RamlLoader)
+
+
+def sniff_spec_type(content: bytes, file_path: str) -> Optional[str]:
+    """
+    Recognise a root API specification from the start of a file
+
+    RAML fragments (e.g. "#%RAML 1.0 Library") and plain data files are not
+    root specifications.
+
+    Args:
+        content: First bytes of the file
+        file_path: Path of the file
+
+    Returns:
+        "raml", "oas" or None
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".raml":
+        return "raml" if RAML_ROOT_PATTERN.match(content.split(b"\n", 1)[0]) else None
+    if extension in SPEC_EXTENSIONS and OAS_ROOT_PATTERN.search(content):
+        return "oas"
+    return None
+
+
+class ApiSpecParser:
+    """
+    Builds the resource/method table of one root specification
+
+    Documents are obtained through a loader callback so the caller can cache
+    parsed files; every file read is recorded in dependencies.
+    """
+
+    def __init__(self, load_document: Callable[[str], Any]):
+        """
+        Initialize the parser
+
+        Args:
+            load_document: Function returning the parsed document of a file path
+        """
+        self._load_document = load_document
+        self.dependencies: List[str] = []
+
+    def parse(self, spec_path: str, spec_type: str) -> Dict[str, Any]:
+        """
+        Parse a root specification
+
+        Args:
+            spec_path: Path to the root RAML or OAS file
+            spec_type: "raml" or "oas"
+
+        Returns:
+            Dictionary with the spec type, title, version and sorted operations
+        """
+        document = self._load(spec_path)
+        if not isinstance(document, dict):
+            raise ValueError(f"{spec_path} is not a {spec_type.upper()} document")
+
+        operations: Set[Operation] = set()
+        base_dir = os.path.dirname(spec_path)
+        if spec_type == "raml":
+            resource_types = self._raml_resource_types(document, base_dir, "")
+            self._raml_operations(document, base_dir, "", resource_types, operations)
+            title = document.get("title")
+            version = document.get("version")
+        else:
+            self._oas_operations(document, spec_path, operations)
+            info = document.get("info") if isinstance(document.get("info"), dict) else {}
+            title = info.get("title")
+            version = info.get("version")
+
+        return {
+            "type": spec_type,
+            "title": str(title) if title is not None else None,
+            "version": str(version) if version is not None else None,
+            "operations": sorted(operations, key=lambda operation: (operation[1], operation[0]))
+        }
+
+    def _load(self, path: str) -> Any:
+        """Load a document and record it as a dependency"""
+        path = os.path.normpath(path)
+        self.dependencies.append(path)
+        return self._load_document(path)
+
+    def _resolve(self, value: Any, base_dir: str) -> Tuple[Any, str]:
+        """
+        Resolve an !include marker
+
+        Args:
+            value: Parsed value, possibly an IncludeRef
+            base_dir: Directory of the file holding the value
+
+        Returns:
+            Tuple of (resolved value, directory its own includes are relative to)
+        """
+        if isinstance(value, IncludeRef):
+            path = os.path.join(base_dir, value.path.strip())
+            return self._load(path), os.path.dirname(os.path.normpath(path))
+        return value, base_dir
+
+    def _raml_resource_types(self, document: Dict[str, Any], base_dir: str,
+                             prefix: str) -> Dict[str, Tuple[Any, str]]:
+        """
+        Collect the resource types of a RAML document and of the libraries it uses
+
+        Args:
+            document: RAML root or library document
+            base_dir: Directory of the document
+            prefix: Library namespace prefix, e.g. "lib."
+
+        Returns:
+            Dictionary of qualified name to (definition or IncludeRef, base directory)
+        """
+        resource_types: Dict[str, Tuple[Any, str]] = {}
+        definitions, definitions_dir = self._resolve(document.get("resourceTypes"), base_dir)
+        if isinstance(definitions, dict):
+            for name, definition in definitions.items():
+                resource_types[prefix + str(name)] = (definition, definitions_dir)
+
+        uses = document.get("uses")
+        if isinstance(uses, dict):
+            for namespace, library_path in uses.items():
+                if not isinstance(library_path, str):
+                    continue
+                try:
+                    path = os.path.join(base_dir, library_path)
+                    library = self._load(path)
+                except (OSError, ValueError, yaml.YAMLError) as e:
+                    logger.error(f"Error reading RAML library {library_path}: {str(e)}")
+                    continue
+                if isinstance(library, dict):
+                    resource_types.update(self._raml_resource_types(
+                        library, os.path.dirname(os.path.normpath(path)), f"{prefix}{namespace}."
+                    ))
+        return resource_types
+
+    def _raml_operations(self, node: Dict[str, Any], base_dir: str, prefix: str,
+                         resource_types: Dict[str, Tuple[Any, str]], operations: Set[Operation]) -> None:
+        """
+        Collect the operations of the nested resources of a RAML node
+
+        Methods come from the resource itself and from the non-optional
+        methods of its resource type.
+
+        Args:
+            node: RAML root or resource
+            base_dir: Directory of the file holding the node
+            prefix: Path of the enclosing resource
+            resource_types: Resource types by qualified name
+            operations: Set the operations are added to
+        """
+        for key, value in node.items():
+            if not isinstance(key, str) or not key.startswith("/"):
+                continue
+            path = prefix + key
+            resource, resource_dir = self._resolve(value, base_dir)
+            if not isinstance(resource, dict):
+                resource = {}
+
+            methods = {str(name).lower() for name in resource if str(name).lower() in HTTP_METHODS}
+            type_name = resource.get("type")
+            if isinstance(type_name, dict) and type_name:
+                type_name = next(iter(type_name))  # Parameterised: {collection: {...}}
+            if isinstance(type_name, str) and type_name in resource_types:
+                definition, definition_dir = resource_types[type_name]
+                definition, _ = self._resolve(definition, definition_dir)
+                if isinstance(definition, dict):
+                    # Optional methods ("get?") only apply if the resource declares them
+                    methods.update(str(name).lower() for name in definition if str(name).lower() in HTTP_METHODS)
+
+            for method in methods:
+                operations.add((method.upper(), path))
+            self._raml_operations(resource, resource_dir, path, resource_types, operations)
+
+    def _oas_operations(self, document: Dict[str, Any], spec_path: str, operations: Set[Operation]) -> None:
+        """
+        Collect the operations of an OpenAPI/Swagger document
+
+        Path items may be external $ref files.
+
+        Args:
+            document: OAS root document
+            spec_path: Path to the root file
+            operations: Set the operations are added to
+        """
+        paths = document.get("paths")
+        if not isinstance(paths, dict):
+            return
+
+        for path, item in paths.items():
+            if isinstance(item, dict) and isinstance(item.get("$ref"), str):
+                item = self._resolve_ref(item["$ref"], document, spec_path)
+            if not isinstance(item, dict):
+                continue
+            for method in item:
+                if str(method).lower() in HTTP_METHODS:
+                    operations.add((str(method).upper(), str(path)))
+
+    def _resolve_ref(self, ref: str, document: Any, document_path: str) -> Any:
+        """
+        Resolve a JSON reference such as "paths/orders.yaml#/get" or "#/x-paths/orders"
+
+        Args:
+            ref: Reference
+            document: Document holding the reference
+            document_path: Path to that document
+
+        Returns:
+            Referenced value, or None if it cannot be resolved
+        """
+        file_part, _, pointer = ref.partition("#")
+        if file_part:
+            try:
+                document = self._load(os.path.join(os.path.dirname(document_path), file_part))
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                logger.error(f"Error reading $ref {ref} of {document_path}: {str(e)}")
+                return None
+
+        for token in [token for token in pointer.split("/") if token]:
+            token = token.replace("~1", "/").replace("~0", "~")
+            if isinstance(document, dict):
+                document = document.get(token)
+            elif isinstance(document, list) and token.isdigit() and int(token) < len(document):
+                document = document[int(token)]
+            else:
+                return None
+        return document
@@ -0,0 +1,106 @@
+"""
+Utilities for reading MuleSoft application archives (.jar) without extracting them
+"""
+import os
+import fnmatch
+import zipfile
+import logging
+from typing import IO, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Flow configuration entries inside a packaged application (or a sources jar)
+FLOW_ENTRY_PATTERNS = [
+    "*.xml",
+    "mule/*.xml",
+    "src/main/mule/*.xml",
+    "src/main/flows/*.xml",
+]
+
+# XML files at the archive root that are never flow configurations
+NON_FLOW_ENTRIES = {"log4j2.xml", "log4j2-test.xml", "pom.xml"}
+
+
+class ArchiveReader:
+    """Utility class for listing and streaming entries of a MuleSoft application archive"""
+
+    def __init__(self, archive_path: str):
+        """
+        Open an archive, reading only its central directory
+
+        Args:
+            archive_path: Path to the .jar file
+        """
+        self.archive_path = archive_path
+        self._zip = zipfile.ZipFile(archive_path)
+
+    def find_flow_entries(self) -> List[str]:
+        """
+        Find flow configuration entries in the archive
+
+        Returns:
+            List of entry names
+        """
+        flow_entries = []
+        for name in self._zip.namelist():
+            if name in NON_FLOW_ENTRIES or name.endswith('/'):
+                continue
+            if any(self._matches(name, pattern) for pattern in FLOW_ENTRY_PATTERNS):
+                flow_entries.append(name)
+        return flow_entries
+
+    def find_pom_entry(self) -> Optional[str]:
+        """
+        Find the Maven pom.xml packaged under META-INF/maven
+
+        Returns:
+            Entry name or None if the archive has no pom
+        """
+        for name in self._zip.namelist():
+            if name.startswith("META-INF/maven/") and name.endswith("/pom.xml"):
+                return name
+        return None
+
+    def open(self, entry_name: str) -> IO[bytes]:
+        """
+        Open an entry for streaming, decompressing it as it is read
+
+        Args:
+            entry_name: Name of the entry
+
+        Returns:
+            Binary file object
+        """
+        return self._zip.open(entry_name)
+
+    def entry_path(self, entry_name: str) -> str:
+        """
+        Get the path reported for an entry, e.g. "app.jar!/orders.xml"
+
+        Args:
+            entry_name: Name of the entry
+
+        Returns:
+            Archive path and entry name joined with "!/"
+        """
+        return f"{self.archive_path}!/{entry_name}"
+
+    @staticmethod
+    def _matches(name: str, pattern: str) -> bool:
+        """Match an entry name against a pattern without crossing directory levels"""
+        return name.count('/') == pattern.count('/') and fnmatch.fnmatch(name, pattern)
+
+    @property
+    def project_name(self) -> str:
+        """Name of the project, taken from the archive file name"""
+        return os.path.splitext(os.path.basename(self.archive_path))[0]
+
+    def close(self) -> None:
+        """Close the archive"""
+        self._zip.close()
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -2,17 +2,43 @@
 Flow parsing utilities for MuleSoft flow files
 """
 import os
+import re
+import sys
 import glob
-import xmltodict
 import logging
-from typing import Dict, Any, List, Optional
+from xml.sax.saxutils import unescape
+from typing import Dict, Any, IO, List, Optional, Tuple, Union
 from pathlib import Path
 
-from app.models.flows import FlowInfo, EndpointInfo
+from app.models.flows import FlowInfo, EndpointInfo, FlowMetrics, FlowContent, FlowLocation
 from app.config.processors import PROCESSOR_KEYS, get_processor_info
+from app.utils.xml_parser import parse_xml, read_xml_file
 
 logger = logging.getLogger(__name__)
 
+# Project directories that contain flow configuration files
+FLOW_FILE_DIRECTORIES = [
+    "src/main/mule",
+    "src/main/resources",
+    "src/main/api",
+    "src/main/flows"
+]
+
+# Elements whose text is a DataWeave script
+DATAWEAVE_ELEMENTS = {"ee:set-payload", "ee:set-attributes", "ee:set-variable"}
+
+# Attributes that carry no searchable text
+IGNORED_ATTRIBUTES = {"@doc:id"}
+
+# Comments and CDATA sections (skipped), and flow/sub-flow start and end tags
+FLOW_TAG_PATTERN = re.compile(
+    rb"<!--.*?-->|<!\[CDATA\[.*?\]\]>"
+    rb"|<(?P<kind>flow|sub-flow)(?P<attributes>(?:\s+[\w:.\-]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*)\s*(?P<empty>/?)>"
+    rb"|</(?P<end>flow|sub-flow)\s*>",
+    re.DOTALL
+)
+NAME_ATTRIBUTE_PATTERN = re.compile(rb"""\sname\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+
 
 class FlowParser:
     """Utility class for parsing MuleSoft flow files"""
@@ -29,10 +55,8 @@ class FlowParser:
             List of flow file paths
         """
         flow_patterns = [
-            os.path.join(project_path, "src/main/mule/*.xml"),
-            os.path.join(project_path, "src/main/resources/*.xml"),
-            os.path.join(project_path, "src/main/api/*.xml"),
-            os.path.join(project_path, "src/main/flows/*.xml")
+            os.path.join(project_path, directory, "*.xml")
+            for directory in FLOW_FILE_DIRECTORIES
         ]
         
         flow_files = []
@@ -53,11 +77,8 @@ class FlowParser:
             FlowInfo object or None if parsing fails
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                xml_content = f.read()
-            
             # Parse XML to dictionary
-            flow_data = xmltodict.parse(xml_content)
+            flow_data = parse_xml(read_xml_file(file_path), file_path)
             
             # Extract flow information
             flow_info = FlowParser._extract_flow_info(flow_data, file_path)
@@ -80,20 +101,154 @@ class FlowParser:
             List of FlowInfo objects
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                xml_content = f.read()
+            return FlowParser.parse_flow_content(read_xml_file(file_path), file_path)
             
-            # Parse XML to dictionary
-            flow_data = xmltodict.parse(xml_content)
+        except Exception as e:
+            logger.error(f"Error parsing flow file {file_path}: {str(e)}")
+            return []
+    
+    @staticmethod
+    def load_flow_file(file_path: str) -> Tuple[List[FlowInfo], List[FlowLocation]]:
+        """
+        Parse a flow file within the parsing limits and locate its flow elements
+        
+        Args:
+            file_path: Path to the flow file
             
-            # Extract all flow information
-            flow_infos = FlowParser._extract_all_flows_info(flow_data, file_path)
+        Returns:
+            Tuple of (FlowInfo objects, FlowLocation objects)
             
-            return flow_infos
+        Raises:
+            Exception: If the file cannot be read, is malformed or exceeds a limit
+        """
+        xml_content = read_xml_file(file_path)
+        return FlowParser.parse_flow_content(xml_content, file_path), FlowParser.locate_flows(xml_content, file_path)
+    
+    @staticmethod
+    def locate_flows(xml_content: bytes, file_path: str) -> List[FlowLocation]:
+        """
+        Find the byte offsets and line ranges of the flow and sub-flow elements
+        
+        Only tags are scanned, so this is much cheaper than parsing the file.
+        Flow elements do not nest, so each start tag is paired with the next
+        end tag of the same kind.
+        
+        Args:
+            xml_content: Raw file content
+            file_path: Path to the flow file
             
-        except Exception as e:
-            logger.error(f"Error parsing flow file {file_path}: {str(e)}")
+        Returns:
+            List of FlowLocation objects in document order
+        """
+        locations = []
+        open_element = None
+        line = 1
+        line_position = 0
+        
+        for match in FLOW_TAG_PATTERN.finditer(xml_content):
+            kind = match.group("kind")
+            end_kind = match.group("end")
+            if kind is None and end_kind is None:
+                continue  # Comment or CDATA section
+            
+            line += xml_content.count(b"\n", line_position, match.start())
+            line_position = match.start()
+            
+            if kind is not None and open_element is None:
+                name_match = NAME_ATTRIBUTE_PATTERN.search(match.group("attributes"))
+                name = (name_match.group(1) or name_match.group(2) or b"") if name_match else b""
+                name = unescape(name.decode("utf-8", "replace"), {"&quot;": '"', "&apos;": "'"})
+                open_element = (kind.decode(), name, match.start(), line)
+                if not match.group("empty"):
+                    continue
+            elif open_element is None or end_kind.decode() != open_element[0]:
+                continue
+            
+            element_kind, name, start_byte, start_line = open_element
+            locations.append(FlowLocation(
+                name=name or os.path.basename(file_path),
+                kind=element_kind,
+                file_path=file_path,
+                start_byte=start_byte,
+                end_byte=match.end(),
+                start_line=start_line,
+                end_line=line + xml_content.count(b"\n", match.start(), match.end())
+            ))
+            open_element = None
+        
+        return locations
+    
+    @staticmethod
+    def parse_flow_element(xml_content: Union[str, bytes], file_path: str) -> Optional[FlowInfo]:
+        """
+        Parse a single flow or sub-flow element cut out of its file
+        
+        Args:
+            xml_content: XML of the element alone
+            file_path: Path to the flow file
+            
+        Returns:
+            FlowInfo object or None if the content is not a flow or sub-flow
+        """
+        flow_data = parse_xml(xml_content, file_path)
+        for kind in ('flow', 'sub-flow'):
+            if kind in flow_data:
+                return FlowParser._create_flow_info_from_element(flow_data[kind] or {}, file_path)
+        return None
+    
+    @staticmethod
+    def parse_flow_content(xml_content: Union[str, bytes, IO], file_path: str) -> List[FlowInfo]:
+        """
+        Parse MuleSoft flow XML content and extract all flow information
+        
+        Args:
+            xml_content: XML as a string, bytes or a binary file object streamed by the parser
+            file_path: Path reported for the flows (e.g. a path inside an archive)
+            
+        Returns:
+            List of FlowInfo objects
+        """
+        # Parse XML to dictionary
+        flow_data = parse_xml(xml_content, file_path)
+        
+        # Extract all flow information
+        return FlowParser._extract_all_flows_info(flow_data, file_path)
+    
+    @staticmethod
+    def extract_flow_contents(xml_content: Union[str, bytes, IO], file_path: str) -> List[FlowContent]:
+        """
+        Parse MuleSoft flow XML content and record the searchable text and structure of each flow
+        
+        Only needed by the search, structure and DataWeave indexes, so it is
+        kept out of the regular scan and parsed on first use.
+        
+        Args:
+            xml_content: XML as a string, bytes or a binary file object streamed by the parser
+            file_path: Path to the flow file
+            
+        Returns:
+            List of FlowContent objects, in the order of parse_flow_content's flows
+        """
+        flow_data = parse_xml(xml_content, file_path)
+        return [FlowParser._create_flow_content(flow_element, file_path)
+                for flow_element in FlowParser._flow_elements(flow_data)]
+    
+    @staticmethod
+    def _flow_elements(flow_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Get the flow elements of parsed flow XML data
+        
+        Args:
+            flow_data: Parsed flow XML data
+            
+        Returns:
+            Flow elements of the mule root element, or direct flow elements (fallback)
+        """
+        container = flow_data['mule'] if 'mule' in flow_data else flow_data
+        if not isinstance(container, dict) or 'flow' not in container:
             return []
+        flow_elements = container['flow']
+        return flow_elements if isinstance(flow_elements, list) else [flow_elements]
     
     @staticmethod
     def _extract_all_flows_info(flow_data: Dict[str, Any], file_path: str) -> List[FlowInfo]:
@@ -107,37 +262,8 @@ class FlowParser:
         Returns:
             List of FlowInfo objects
         """
-        flow_infos = []
-        
-        # Check if we have a mule root element
-        if 'mule' in flow_data:
-            mule_data = flow_data['mule']
-            if 'flow' in mule_data:
-                flow_elements = mule_data['flow']
-                if isinstance(flow_elements, list):
-                    for flow_element in flow_elements:
-                        flow_info = FlowParser._create_flow_info_from_element(flow_element, file_path)
-                        if flow_info:
-                            flow_infos.append(flow_info)
-                else:
-                    flow_info = FlowParser._create_flow_info_from_element(flow_elements, file_path)
-                    if flow_info:
-                        flow_infos.append(flow_info)
-        else:
-            # Direct flow elements (fallback)
-            if 'flow' in flow_data:
-                flow_elements = flow_data['flow']
-                if isinstance(flow_elements, list):
-                    for flow_element in flow_elements:
-                        flow_info = FlowParser._create_flow_info_from_element(flow_element, file_path)
-                        if flow_info:
-                            flow_infos.append(flow_info)
-                else:
-                    flow_info = FlowParser._create_flow_info_from_element(flow_elements, file_path)
-                    if flow_info:
-                        flow_infos.append(flow_info)
-        
-        return flow_infos
+        return [FlowParser._create_flow_info_from_element(flow_element, file_path)
+                for flow_element in FlowParser._flow_elements(flow_data)]
     
     @staticmethod
     def _create_flow_info_from_element(flow_element: Dict[str, Any], file_path: str) -> FlowInfo:
@@ -156,8 +282,9 @@ class FlowParser:
         # Extract endpoints
         endpoints = FlowParser._extract_endpoints(flow_element, flow_name)
         
-        # Count processors and collect their names
-        processors_count, processors_found = FlowParser._count_processors(flow_element)
+        # Count processors, collect their names and record complexity features
+        metrics = FlowMetrics()
+        processors_count, processors_found = FlowParser._count_processors(flow_element, metrics)
         
         # Extract error handlers
         error_handlers = FlowParser._extract_error_handlers(flow_element)
@@ -172,9 +299,29 @@ class FlowParser:
             processors_count=processors_count,
             processors_found=processors_found,
             error_handlers=error_handlers,
-            sub_flows=sub_flows
+            sub_flows=sub_flows,
+            metrics=metrics
         )
     
+    @staticmethod
+    def _create_flow_content(flow_element: Dict[str, Any], file_path: str) -> FlowContent:
+        """
+        Record the searchable text and element ancestry paths of a flow element
+        
+        Args:
+            flow_element: Flow XML element
+            file_path: Path to the flow file
+            
+        Returns:
+            FlowContent object
+        """
+        flow_name = flow_element.get('@name', os.path.basename(file_path))
+        content = FlowContent(texts={"name": [flow_name]})
+        element_paths: Dict[str, None] = {"flow": None}
+        FlowParser._collect_content("flow", flow_element, content, "flow", element_paths)
+        content.element_paths = list(element_paths)
+        return content
+    
     @staticmethod
     def _extract_flow_info(flow_data: Dict[str, Any], file_path: str) -> FlowInfo:
         """
@@ -304,26 +451,29 @@ class FlowParser:
             method=endpoint_data.get('@method'),
             doc_id=endpoint_data.get('@doc:name'),
             config_ref=endpoint_data.get('@config-ref'),
-            listener_config=endpoint_data
+            listener_config=endpoint_data,
+            element=endpoint_type
         )
     
     @staticmethod
-    def _count_processors(flow_element: Dict[str, Any]) -> tuple[int, List[str]]:
+    def _count_processors(flow_element: Dict[str, Any], metrics: Optional[FlowMetrics] = None) -> tuple[int, List[str]]:
         """
         Count processors in a flow element recursively and collect their names
         
         Args:
             flow_element: Flow XML element
+            metrics: Optional FlowMetrics to record complexity features into
             
         Returns:
             Tuple of (processor_count, list_of_processor_names)
         """
         processors_found = []
-        count = FlowParser._count_processors_recursive(flow_element, processors_found)
+        count = FlowParser._count_processors_recursive(flow_element, processors_found, metrics=metrics)
         return count, processors_found
     
     @staticmethod
-    def _count_processors_recursive(element: Any, processors_found: List[str], count: int = 0) -> int:
+    def _count_processors_recursive(element: Any, processors_found: List[str], count: int = 0,
+                                    metrics: Optional[FlowMetrics] = None, depth: int = 0) -> int:
         """
         Recursively count processors in an element and collect their names
         
@@ -331,6 +481,8 @@ class FlowParser:
             element: XML element to search
             processors_found: List to collect processor names
             count: Current count of processors
+            metrics: Optional FlowMetrics to record complexity features into
+            depth: Number of processors enclosing the element
             
         Returns:
             Total number of processors found
@@ -338,20 +490,165 @@ class FlowParser:
         if isinstance(element, dict):
             # Check if this element is a processor
             for key in element.keys():
+                child_depth = depth
                 if key in PROCESSOR_KEYS:
                     count += 1
                     processors_found.append(key)
+                    if metrics is not None:
+                        child_depth = depth + 1
+                        FlowParser._record_metrics(key, element[key], metrics, child_depth)
                 # Always recursively search nested elements (even if current key is a processor)
                 if isinstance(element[key], (dict, list)):
-                    count = FlowParser._count_processors_recursive(element[key], processors_found, count)
+                    count = FlowParser._count_processors_recursive(element[key], processors_found, count, metrics, child_depth)
         
         elif isinstance(element, list):
             # Handle lists of elements
             for item in element:
-                count = FlowParser._count_processors_recursive(item, processors_found, count)
+                count = FlowParser._count_processors_recursive(item, processors_found, count, metrics, depth)
         
         return count
     
+    @staticmethod
+    def _record_metrics(key: str, value: Any, metrics: FlowMetrics, depth: int) -> None:
+        """
+        Record complexity features for processor elements found during traversal
+        
+        Args:
+            key: Processor key
+            value: Processor element (or list of elements sharing the key)
+            metrics: FlowMetrics to update
+            depth: Nesting depth of the processor
+        """
+        elements = value if isinstance(value, list) else [value]
+        metrics.max_depth = max(metrics.max_depth, depth)
+        
+        if key == 'choice':
+            for element in elements:
+                if isinstance(element, dict):
+                    metrics.choice_branches += FlowParser._count_children(element, 'when')
+                    metrics.choice_branches += FlowParser._count_children(element, 'otherwise')
+        elif key == 'foreach':
+            metrics.foreach_count += len(elements)
+        elif key == 'scatter-gather':
+            for element in elements:
+                if isinstance(element, dict):
+                    metrics.scatter_gather_routes += FlowParser._count_children(element, 'route')
+        elif key in ('on-error-continue', 'on-error-propagate'):
+            metrics.error_handler_count += len(elements)
+        elif key == 'flow-ref':
+            for element in elements:
+                if isinstance(element, dict) and element.get('@name'):
+                    metrics.flow_refs.append(element['@name'])
+    
+    @staticmethod
+    def _count_children(element: Dict[str, Any], key: str) -> int:
+        """
+        Count child elements with the given key
+        
+        Args:
+            element: Parent XML element
+            key: Child element key
+            
+        Returns:
+            Number of child elements
+        """
+        children = element.get(key)
+        if children is None:
+            return 0
+        return len(children) if isinstance(children, list) else 1
+    
+    @staticmethod
+    def _collect_content(tag: str, element: Any, content: FlowContent, path: str,
+                         element_paths: Dict[str, None]) -> None:
+        """
+        Recursively collect attribute values, labels, logger messages and
+        DataWeave scripts of an element, and the ancestry path of every element
+        
+        Args:
+            tag: Element name
+            element: XML element (dict, list of elements sharing the tag, or text)
+            content: FlowContent to record text into
+            path: Slash-separated ancestry path of the element, ending with its tag
+            element_paths: Ordered set collecting the ancestry paths
+        """
+        if isinstance(element, list):
+            for item in element:
+                FlowParser._collect_content(tag, item, content, path, element_paths)
+        
+        elif isinstance(element, str):
+            if tag in DATAWEAVE_ELEMENTS:
+                FlowParser._record_script(tag, {}, element, content)
+            elif element.strip():
+                content.texts.setdefault("text", []).append(element)
+        
+        elif isinstance(element, dict):
+            if tag == 'apikit:router' and element.get('@config-ref'):
+                content.apikit_configs.append(element['@config-ref'])
+            if tag in DATAWEAVE_ELEMENTS:
+                if '@resource' in element:
+                    content.script_resources.append(
+                        (FlowParser._dataweave_target(tag, element), element['@resource'])
+                    )
+                if isinstance(element.get('#text'), str):
+                    FlowParser._record_script(tag, element, element['#text'], content)
+            
+            for key, value in element.items():
+                if key == '#text':
+                    if tag not in DATAWEAVE_ELEMENTS:
+                        FlowParser._collect_content(tag, value, content, path, element_paths)
+                elif key.startswith('@'):
+                    if not isinstance(value, str) or key in IGNORED_ATTRIBUTES or key.startswith('@xmlns'):
+                        continue
+                    if tag == 'flow' and key == '@name':
+                        continue  # Recorded as the flow name
+                    if key == '@doc:name':
+                        field = "doc:name"
+                    elif tag == 'logger' and key == '@message':
+                        field = "logger"
+                    else:
+                        field = "attribute"
+                    content.texts.setdefault(field, []).append(value)
+                else:
+                    child_path = f"{path}/{key}"
+                    element_paths[child_path] = None
+                    FlowParser._collect_content(key, value, content, child_path, element_paths)
+    
+    @staticmethod
+    def _record_script(tag: str, element: Dict[str, Any], script: str, content: FlowContent) -> None:
+        """
+        Record an inline DataWeave script
+        
+        Scripts are interned, so the same script copied into many flows is
+        held in memory once.
+        
+        Args:
+            tag: DataWeave element name (e.g. ee:set-payload)
+            element: Attributes of the element
+            script: Script text
+            content: FlowContent to record the script into
+        """
+        if not script.strip():
+            return
+        script = sys.intern(script)
+        content.texts.setdefault("dataweave", []).append(script)
+        content.scripts.append((FlowParser._dataweave_target(tag, element), script))
+    
+    @staticmethod
+    def _dataweave_target(tag: str, element: Dict[str, Any]) -> str:
+        """
+        Describe what a DataWeave element sets
+        
+        Args:
+            tag: DataWeave element name
+            element: Attributes of the element
+            
+        Returns:
+            "payload", "attributes" or "variable:<name>"
+        """
+        if tag == 'ee:set-variable':
+            return f"variable:{element.get('@variableName', '')}"
+        return tag.split('-', 1)[1]
+    
     @staticmethod
     def _extract_error_handlers(flow_element: Dict[str, Any]) -> List[str]:
         """
@@ -0,0 +1,247 @@
+"""
+Utilities for reading objects straight from a local git repository
+"""
+import re
+import subprocess
+import threading
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tree entry: (mode, name, object sha)
+TreeEntry = Tuple[str, str, str]
+
+# Number of parsed tree objects kept per repository
+TREE_CACHE_SIZE = 256
+
+# Abbreviated or full commit sha
+SHA_PATTERN = re.compile(r"^[0-9a-fA-F]{4,40}$")
+
+
+class GitObjectError(Exception):
+    """Raised when a git object cannot be read"""
+
+
+@lru_cache(maxsize=256)
+def _is_ref_name(ref: str) -> bool:
+    """Check a name with `git check-ref-format --allow-onelevel`"""
+    completed = subprocess.run(
+        ["git", "check-ref-format", "--allow-onelevel", ref],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    return completed.returncode == 0
+
+
+def validate_ref(ref: str) -> str:
+    """
+    Check that a revision is a commit sha or a well-formed branch or tag name
+
+    Revisions are written to the shared `git cat-file --batch` pipe, so a
+    line break or revision expression in a user-supplied ref must never
+    reach it.
+
+    Args:
+        ref: Branch, tag or commit
+
+    Returns:
+        The ref unchanged
+
+    Raises:
+        ValueError: If the ref is not a sha or a valid ref name
+    """
+    if not ref or any(character in ref for character in "\n\r\0"):
+        raise ValueError(f"Invalid git ref {ref!r}")
+    if not SHA_PATTERN.match(ref) and not _is_ref_name(ref):
+        raise ValueError(f"Invalid git ref {ref!r}")
+    return ref
+
+
+class GitObjectReader:
+    """
+    Reads git objects through one long-lived `git cat-file --batch` process
+
+    Every object read is a request/response on the same pipe, so reading many
+    files does not start a subprocess per file.
+    """
+
+    def __init__(self, repo_path: str):
+        """
+        Start the batch reader for a repository
+
+        Args:
+            repo_path: Path to the repository working tree or bare repository
+        """
+        self.repo_path = repo_path
+        self._lock = threading.RLock()
+        self._trees: "OrderedDict[str, List[TreeEntry]]" = OrderedDict()
+        self._process = subprocess.Popen(
+            ["git", "-C", repo_path, "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+    @property
+    def alive(self) -> bool:
+        """Whether the batch process is still running"""
+        return self._process.poll() is None
+
+    def read_object(self, name: str) -> Tuple[str, str, bytes]:
+        """
+        Read an object by sha or revision expression (e.g. "develop:pom.xml")
+
+        Args:
+            name: Object name understood by git cat-file
+
+        Returns:
+            Tuple of (object sha, object type, content)
+
+        Raises:
+            GitObjectError: If the object does not exist
+        """
+        with self._lock:
+            if not self.alive:
+                raise GitObjectError(f"git cat-file process for {self.repo_path} has exited")
+
+            if "\n" in name:
+                raise GitObjectError(f"Invalid object name {name!r}")
+
+            try:
+                self._process.stdin.write(name.encode("utf-8") + b"\n")
+                self._process.stdin.flush()
+                header = self._process.stdout.readline().decode("utf-8").rstrip("\n")
+            except (OSError, ValueError) as e:
+                self._discard()
+                raise GitObjectError(f"Error reading {name} from {self.repo_path}: {str(e)}")
+
+            if header.endswith((" missing", " ambiguous")):
+                raise GitObjectError(f"Object {name} not found in {self.repo_path}")
+
+            try:
+                sha, object_type, size = header.split(" ")
+                content = self._read_exactly(int(size))
+                if self._read_exactly(1) != b"\n":  # Trailing newline
+                    raise GitObjectError(f"Missing object terminator after {name}")
+            except (GitObjectError, OSError, ValueError) as e:
+                # The pipe is out of step with our requests; a new reader must be started
+                self._discard()
+                raise GitObjectError(f"Unexpected git cat-file output for {name} in {self.repo_path}: {str(e)}")
+
+        return sha, object_type, content
+
+    def _read_exactly(self, size: int) -> bytes:
+        """Read exactly size bytes from the batch process"""
+        chunks = []
+        while size > 0:
+            chunk = self._process.stdout.read(size)
+            if not chunk:
+                raise GitObjectError(f"Unexpected end of git cat-file output for {self.repo_path}")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def resolve_tree(self, ref: str) -> Optional[str]:
+        """
+        Resolve a revision to the sha of its root tree
+
+        Args:
+            ref: Branch, tag or commit
+
+        Returns:
+            Tree sha or None if the revision does not exist
+        """
+        try:
+            sha, _, _ = self.read_object(f"{ref}^{{tree}}")
+            return sha
+        except GitObjectError:
+            return None
+
+    def read_tree(self, tree_sha: str) -> List[TreeEntry]:
+        """
+        Read and parse a tree object, reusing recently read trees
+
+        Args:
+            tree_sha: Sha of the tree
+
+        Returns:
+            List of (mode, name, sha) entries
+        """
+        with self._lock:
+            cached = self._trees.get(tree_sha)
+            if cached is not None:
+                self._trees.move_to_end(tree_sha)
+                return cached
+
+            _, object_type, content = self.read_object(tree_sha)
+            if object_type != "tree":
+                raise GitObjectError(f"Object {tree_sha} is a {object_type}, not a tree")
+
+            entries = []
+            position = 0
+            while position < len(content):
+                space = content.index(b" ", position)
+                null = content.index(b"\0", space)
+                mode = content[position:space].decode("ascii")
+                name = content[space + 1:null].decode("utf-8", errors="replace")
+                sha = content[null + 1:null + 21].hex()
+                entries.append((mode, name, sha))
+                position = null + 21
+
+            self._trees[tree_sha] = entries
+            if len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+            return entries
+
+    def find_tree(self, tree_sha: str, path: str) -> Optional[str]:
+        """
+        Walk down from a tree to a subdirectory
+
+        Args:
+            tree_sha: Sha of the starting tree
+            path: Slash-separated subdirectory path ("" for the tree itself)
+
+        Returns:
+            Sha of the subdirectory tree or None if it does not exist
+        """
+        for part in [part for part in path.split("/") if part]:
+            for mode, name, sha in self.read_tree(tree_sha):
+                if name == part and mode == "40000":
+                    tree_sha = sha
+                    break
+            else:
+                return None
+        return tree_sha
+
+    def read_blob(self, blob_sha: str) -> bytes:
+        """
+        Read the content of a blob
+
+        Args:
+            blob_sha: Sha of the blob
+
+        Returns:
+            Blob content
+        """
+        _, _, content = self.read_object(blob_sha)
+        return content
+
+    def _discard(self) -> None:
+        """Kill the batch process so the registry starts a new reader"""
+        logger.error(f"Discarding git cat-file reader for {self.repo_path}")
+        if self.alive:
+            self._process.kill()
+            self._process.wait()
+        self._trees.clear()
+
+    def close(self) -> None:
+        """Stop the batch process"""
+        if self.alive:
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
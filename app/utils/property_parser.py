@@ -0,0 +1,152 @@
+"""
+Property file parsing utilities for MuleSoft configuration properties
+"""
+import os
+import re
+import yaml
+import logging
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Matches ${key} placeholders, including Mule's ${secure::key} form
+PLACEHOLDER_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+# Maximum nesting of placeholders inside property values
+MAX_RESOLVE_DEPTH = 10
+
+
+class PropertyParser:
+    """Utility class for parsing YAML and .properties configuration files"""
+
+    @staticmethod
+    def parse_property_file(file_path: str) -> Dict[str, str]:
+        """
+        Parse a YAML or .properties file into a flat key/value map
+
+        Args:
+            file_path: Path to the property file
+
+        Returns:
+            Dictionary of dotted property keys to string values
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            if file_path.endswith('.properties'):
+                return PropertyParser.parse_properties(content)
+            return PropertyParser.parse_yaml(content)
+
+        except Exception as e:
+            logger.error(f"Error parsing property file {file_path}: {str(e)}")
+            return {}
+
+    @staticmethod
+    def parse_yaml(content: str) -> Dict[str, str]:
+        """
+        Parse YAML property content, flattening nested keys with dots
+
+        Args:
+            content: YAML file content
+
+        Returns:
+            Flat dictionary of property keys to string values
+        """
+        data = yaml.safe_load(content)
+        properties = {}
+        if isinstance(data, dict):
+            PropertyParser._flatten(data, '', properties)
+        return properties
+
+    @staticmethod
+    def _flatten(data: Dict[str, Any], prefix: str, properties: Dict[str, str]) -> None:
+        """
+        Flatten a nested YAML mapping into dotted keys
+
+        Args:
+            data: Nested mapping
+            prefix: Key prefix of the current level
+            properties: Dictionary to collect flattened values
+        """
+        for key, value in data.items():
+            full_key = f"{prefix}{key}"
+            if isinstance(value, dict):
+                PropertyParser._flatten(value, f"{full_key}.", properties)
+            elif value is not None:
+                properties[full_key] = str(value)
+
+    @staticmethod
+    def parse_properties(content: str) -> Dict[str, str]:
+        """
+        Parse Java .properties content
+
+        Args:
+            content: .properties file content
+
+        Returns:
+            Dictionary of property keys to string values
+        """
+        properties = {}
+        pending = ''
+
+        for raw_line in content.splitlines():
+            line = pending + raw_line.strip()
+            pending = ''
+
+            if not line or line[0] in '#!':
+                continue
+
+            # Handle line continuations
+            if line.endswith('\\') and not line.endswith('\\\\'):
+                pending = line[:-1]
+                continue
+
+            match = re.match(r'([^=:\s]+)\s*[=:\s]\s*(.*)', line)
+            if match:
+                properties[match.group(1)] = match.group(2)
+            else:
+                properties[line] = ''
+
+        return properties
+
+    @staticmethod
+    def resolve_value(value: str, properties: Dict[str, str]) -> str:
+        """
+        Replace ${key} placeholders in a string with property values
+
+        Unknown keys and secure properties are left untouched.
+
+        Args:
+            value: String that may contain placeholders
+            properties: Property map to resolve against
+
+        Returns:
+            String with known placeholders replaced
+        """
+        def replace(match: re.Match) -> str:
+            return properties.get(match.group(1).strip(), match.group(0))
+
+        for _ in range(MAX_RESOLVE_DEPTH):
+            resolved = PLACEHOLDER_PATTERN.sub(replace, value)
+            if resolved == value:
+                break
+            value = resolved
+
+        return value
+
+    @staticmethod
+    def environment_tokens(file_path: str) -> set:
+        """
+        Split a property file name into lowercase tokens used to match environments
+
+        For example "config-prod.yaml" yields {"config", "prod"}.
+
+        Args:
+            file_path: Path to the property file
+
+        Returns:
+            Set of file name tokens
+        """
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        return {token for token in re.split(r'[-_.]', stem.lower()) if token}
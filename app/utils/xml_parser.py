@@ -1,16 +1,201 @@
 """
 XML parsing utilities for MuleSoft pom.xml files
 """
+import os
+import time
 import xmltodict
-from typing import Dict, Any, Optional
+from xml.parsers import expat
+from typing import Dict, Any, IO, Optional, Union
 import logging
 
+from app.config.settings import settings
+
 logger = logging.getLogger(__name__)
 
+# Start tags parsed between two checks of the parse time limit
+TIME_CHECK_INTERVAL = 256
+
+
+class XMLLimitError(ValueError):
+    """Raised when an XML file exceeds a parsing limit or uses a rejected construct"""
+    
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason  # "size", "depth", "timeout" or "entities"
+
+
+class _LimitedExpatParser:
+    """
+    Wraps an expat parser to enforce depth and time limits while xmltodict parses
+    
+    xmltodict installs its handlers by attribute assignment; the element
+    handlers are wrapped to count depth and check the clock, and entity
+    declarations (the basis of entity expansion attacks) are rejected.
+    """
+    
+    def __init__(self, parser, max_depth: int, deadline: Optional[float]):
+        object.__setattr__(self, "_parser", parser)
+        object.__setattr__(self, "_max_depth", max_depth)
+        object.__setattr__(self, "_deadline", deadline)
+        object.__setattr__(self, "_depth", 0)
+        object.__setattr__(self, "_elements", 0)
+        parser.EntityDeclHandler = self._reject_entity
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._parser, name)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "StartElementHandler":
+            value = self._wrap_start(value)
+        elif name == "EndElementHandler":
+            value = self._wrap_end(value)
+        setattr(self._parser, name, value)
+    
+    def _wrap_start(self, handler):
+        def start(*args):
+            depth = self._depth + 1
+            elements = self._elements + 1
+            object.__setattr__(self, "_depth", depth)
+            object.__setattr__(self, "_elements", elements)
+            if depth > self._max_depth:
+                raise XMLLimitError("depth", f"Element nesting exceeds {self._max_depth} levels")
+            if self._deadline is not None and elements % TIME_CHECK_INTERVAL == 0 \
+                    and time.monotonic() > self._deadline:
+                raise XMLLimitError("timeout", "Parsing exceeded the time limit")
+            return handler(*args)
+        return start
+    
+    def _wrap_end(self, handler):
+        def end(*args):
+            object.__setattr__(self, "_depth", self._depth - 1)
+            return handler(*args)
+        return end
+    
+    @staticmethod
+    def _reject_entity(*args) -> None:
+        raise XMLLimitError("entities", "Entity declarations are not allowed")
+
+
+class _LimitedExpat:
+    """Stand-in for the expat module passed to xmltodict.parse"""
+    
+    def __init__(self, max_depth: int, timeout_ms: Optional[int]):
+        self.max_depth = max_depth
+        self.timeout_ms = timeout_ms
+    
+    def ParserCreate(self, *args, **kwargs):
+        deadline = time.monotonic() + self.timeout_ms / 1000 if self.timeout_ms else None
+        return _LimitedExpatParser(expat.ParserCreate(*args, **kwargs), self.max_depth, deadline)
+
+
+class _LimitedReader:
+    """Binary file object wrapper that raises once more than max_bytes have been read"""
+    
+    def __init__(self, stream: IO, max_bytes: int, source_name: str):
+        self._stream = stream
+        self._max_bytes = max_bytes
+        self._source_name = source_name
+        self._read = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self._read += len(data)
+        if self._read > self._max_bytes:
+            raise XMLLimitError("size", f"{self._source_name} is larger than {self._max_bytes} bytes")
+        return data
+
+
+def parse_xml(xml_content: Union[str, bytes, IO], source_name: str) -> Dict[str, Any]:
+    """
+    Parse XML into a dictionary with size, depth and time limits
+    
+    Limits come from XML_MAX_FILE_BYTES, XML_MAX_DEPTH and XML_PARSE_TIMEOUT_MS.
+    Entity declarations are rejected and entities are never expanded.
+    
+    Args:
+        xml_content: XML as a string, bytes or a binary file object streamed by the parser
+        source_name: Name of the content used in error messages
+        
+    Returns:
+        Parsed XML data as dictionary
+        
+    Raises:
+        XMLLimitError: If a limit is exceeded
+        xml.parsers.expat.ExpatError: If the XML is malformed
+    """
+    max_bytes = settings.get_xml_max_file_bytes()
+    if max_bytes:
+        if isinstance(xml_content, (str, bytes)):
+            if len(xml_content) > max_bytes:
+                raise XMLLimitError("size", f"{source_name} is larger than {max_bytes} bytes")
+        else:
+            # Streams (e.g. archive entries) are counted as the parser reads them
+            xml_content = _LimitedReader(xml_content, max_bytes, source_name)
+    
+    limited_expat = _LimitedExpat(settings.get_xml_max_depth(), settings.get_xml_parse_timeout_ms())
+    return xmltodict.parse(xml_content, expat=limited_expat, disable_entities=True)
+
+
+def read_xml_file(file_path: str) -> bytes:
+    """
+    Read an XML file, refusing files over the size limit without reading them
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Raw file content
+        
+    Raises:
+        XMLLimitError: If the file is larger than XML_MAX_FILE_BYTES
+    """
+    max_bytes = settings.get_xml_max_file_bytes()
+    if max_bytes and os.path.getsize(file_path) > max_bytes:
+        raise XMLLimitError("size", f"{file_path} is larger than {max_bytes} bytes")
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
+def failure_reason(error: Exception) -> str:
+    """
+    Classify a parsing failure
+    
+    Args:
+        error: Exception raised while reading or parsing a file
+        
+    Returns:
+        "size", "depth", "timeout", "entities", "syntax", "encoding", "io" or "error"
+    """
+    if isinstance(error, XMLLimitError):
+        return error.reason
+    if isinstance(error, expat.ExpatError):
+        return "syntax"
+    if isinstance(error, UnicodeError):
+        return "encoding"
+    if isinstance(error, OSError):
+        return "io"
+    return "error"
+
 
 class XMLParser:
     """Utility class for parsing XML files"""
     
+    @staticmethod
+    def load_pom_xml(file_path: str) -> Dict[str, Any]:
+        """
+        Parse a pom.xml file within the parsing limits
+        
+        Args:
+            file_path: Path to the pom.xml file
+            
+        Returns:
+            Parsed XML data as dictionary
+            
+        Raises:
+            Exception: If the file cannot be read, is malformed or exceeds a limit
+        """
+        return parse_xml(read_xml_file(file_path), file_path)
+    
     @staticmethod
     def parse_pom_xml(file_path: str) -> Optional[Dict[str, Any]]:
         """
@@ -23,14 +208,29 @@ class XMLParser:
             Parsed XML data as dictionary or None if parsing fails
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                xml_content = f.read()
-            
-            return xmltodict.parse(xml_content)
+            return XMLParser.load_pom_xml(file_path)
         except Exception as e:
             logger.error(f"Error parsing XML file {file_path}: {str(e)}")
             return None
     
+    @staticmethod
+    def parse_pom_content(xml_content: Union[str, bytes, IO], source_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse pom.xml content and return the parsed data
+        
+        Args:
+            xml_content: XML as a string, bytes or a binary file object streamed by the parser
+            source_name: Name of the content used in log messages
+            
+        Returns:
+            Parsed XML data as dictionary or None if parsing fails
+        """
+        try:
+            return parse_xml(xml_content, source_name)
+        except Exception as e:
+            logger.error(f"Error parsing XML content {source_name}: {str(e)}")
+            return None
+    
     @staticmethod
     def extract_project_data(pom_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -49,8 +249,8 @@ class XMLParser:
             'artifact_id': project_data.get('artifactId', 'Unknown'),
             'version': project_data.get('version', 'Unknown'),
             'packaging': project_data.get('packaging', 'Unknown'),
-            'properties': project_data.get('properties', {}),
-            'dependencies': project_data.get('dependencies', {})
+            'properties': project_data.get('properties') or {},  # Empty elements parse as None
+            'dependencies': project_data.get('dependencies') or {}
         }
     
     @staticmethod
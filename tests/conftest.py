@@ -0,0 +1,87 @@
+"""
+Shared fixtures: a small MuleSoft estate on disk and a client serving it
+"""
+import os
+import subprocess
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.scan_cache import scan_cache
+
+POM_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <groupId>com.acme</groupId>
+    <artifactId>{name}</artifactId>
+    <version>{version}</version>
+    <dependencies>{dependencies}</dependencies>
+</project>
+"""
+
+DEPENDENCY_TEMPLATE = """
+        <dependency>
+            <groupId>com.acme</groupId>
+            <artifactId>{name}</artifactId>
+            <version>{version}</version>
+        </dependency>"""
+
+FLOW_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<mule xmlns="http://www.mulesoft.org/schema/mule/core">
+    <flow name="{name}">
+        <http:listener config-ref="api-config" path="{path}" allowedMethods="GET"/>
+        <logger message="{name} called"/>
+    </flow>
+</mule>
+"""
+
+
+def write_project(root, name, version="1.0.0", dependencies=None, flows=None):
+    """
+    Write a project with a pom.xml and one flow file per flow
+
+    Args:
+        root: Estate directory
+        name: Project name (also its artifactId)
+        version: Project version
+        dependencies: Mapping of artifactId to version
+        flows: Mapping of flow file name to (flow name, listener path)
+
+    Returns:
+        Path to the project directory
+    """
+    project = os.path.join(str(root), name)
+    os.makedirs(os.path.join(project, "src", "main", "mule"), exist_ok=True)
+    dependency_xml = "".join(
+        DEPENDENCY_TEMPLATE.format(name=artifact, version=dependency_version)
+        for artifact, dependency_version in (dependencies or {}).items()
+    )
+    with open(os.path.join(project, "pom.xml"), "w") as f:
+        f.write(POM_TEMPLATE.format(name=name, version=version, dependencies=dependency_xml))
+    for file_name, (flow_name, path) in (flows or {}).items():
+        with open(os.path.join(project, "src", "main", "mule", file_name), "w") as f:
+            f.write(FLOW_TEMPLATE.format(name=flow_name, path=path))
+    return project
+
+
+def git(repo, *args):
+    """Run a git command in a repository"""
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+@pytest.fixture
+def estate(tmp_path, monkeypatch):
+    """Empty estate directory served as MULE_DIRECTORY, with a cold scan cache"""
+    monkeypatch.setenv("MULE_DIRECTORY", str(tmp_path))
+    scan_cache.clear()
+    yield tmp_path
+    scan_cache.clear()
+
+
+@pytest.fixture
+def client():
+    """Test client of the API"""
+    return TestClient(app)
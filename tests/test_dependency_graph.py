@@ -0,0 +1,59 @@
+import os
+
+from app.services.dependency_graph import DependencyGraph
+from app.services.mule_scanner import MuleProjectScanner
+from app.services.scan_cache import scan_cache
+from tests.conftest import write_project
+
+
+def _estate(root):
+    write_project(root, "shared-lib", version="2.0.0")
+    write_project(root, "orders-api", dependencies={"shared-lib": "1.0.0"})
+    write_project(root, "billing-api", dependencies={"shared-lib": "2.0.0", "orders-api": "1.0.0"})
+
+
+def _settled_graph(root):
+    graph = DependencyGraph()
+    graph.refresh(MuleProjectScanner(str(root)))
+    graph.refresh(MuleProjectScanner(str(root)))
+    return graph
+
+
+def test_unrelated_cache_kind_keeps_the_graph(estate):
+    _estate(estate)
+    graph = _settled_graph(estate)
+    snapshot = graph._graph
+
+    flow_file = os.path.join(str(estate), "orders-api", "pom.xml")
+    scan_cache.put("flow-locations", flow_file, scan_cache.fingerprint(flow_file), [])
+    graph.refresh(MuleProjectScanner(str(estate)))
+
+    assert graph._graph is snapshot
+
+
+def test_pom_change_rebuilds_the_graph(estate):
+    _estate(estate)
+    graph = _settled_graph(estate)
+    assert graph.impact("orders-api")["total_dependents"] == 1
+
+    write_project(estate, "billing-api", dependencies={"shared-lib": "2.0.0"})
+    os.utime(os.path.join(str(estate), "billing-api", "pom.xml"), ns=(1, 1))
+    graph.refresh(MuleProjectScanner(str(estate)))
+
+    assert graph.impact("orders-api")["total_dependents"] == 0
+
+
+def test_summary_layers_and_cycles(estate):
+    _estate(estate)
+    write_project(estate, "ping-api", dependencies={"pong-api": "1.0.0"})
+    write_project(estate, "pong-api", dependencies={"ping-api": "1.0.0"})
+    graph = _settled_graph(estate)
+
+    summary = graph.summary()
+
+    assert summary["layers"] == [["shared-lib"], ["orders-api"], ["billing-api"]]
+    assert sorted(summary["cyclic_projects"]) == ["ping-api", "pong-api"]
+    assert summary["total_edges"] == 5
+    assert [dependent["project_name"] for dependent in graph.impact("shared-lib")["dependents"]] == [
+        "billing-api", "orders-api"
+    ]
@@ -0,0 +1,57 @@
+import os
+
+from app.services.apikit_coverage import ApikitCoverage
+from app.services.endpoint_conflicts import EndpointConflictIndex, parse_attributes
+from app.services.quarantine import file_quarantine
+from app.services.scan_cache import ScanCache
+from tests.conftest import write_project
+
+GLOBAL_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<mule xmlns="http://www.mulesoft.org/schema/mule/core">
+    <http:listener-config name="api-config" basePath="/api"/>
+    <http:listener-config name='internal-config' basePath='/internal'/>
+    <apikit:config name="p1-config" api="p1.raml"/>
+    <apikit:config name='p2-config' api='spec.yaml'/>
+</mule>
+"""
+
+
+def _write_global(project):
+    path = os.path.join(project, "src", "main", "mule", "global.xml")
+    with open(path, "w") as f:
+        f.write(GLOBAL_XML)
+    return path
+
+
+def test_parse_attributes_accepts_both_quote_styles():
+    assert parse_attributes(""" name='a' path="/b" empty=''""") == {"name": "a", "path": "/b", "empty": ""}
+
+
+def test_configs_with_single_quoted_attributes(estate):
+    project = write_project(estate, "orders-api")
+    _write_global(project)
+
+    assert EndpointConflictIndex._listener_base_paths(project) == {
+        "api-config": "/api", "internal-config": "/internal"
+    }
+    assert ApikitCoverage._apikit_configs(project) == {"p1-config": "p1.raml", "p2-config": "spec.yaml"}
+
+
+def test_configs_skip_oversized_files(estate, monkeypatch):
+    project = write_project(estate, "orders-api")
+    _write_global(project)
+    monkeypatch.setenv("XML_MAX_FILE_BYTES", "64")
+
+    assert EndpointConflictIndex._listener_base_paths(project) == {}
+    assert ApikitCoverage._apikit_configs(project) == {}
+
+
+def test_configs_skip_quarantined_files(estate):
+    project = write_project(estate, "orders-api")
+    path = _write_global(project)
+    file_quarantine.add("flow", path, ScanCache.fingerprint(path), ValueError("broken"), 0.0)
+    try:
+        assert EndpointConflictIndex._listener_base_paths(project) == {}
+        assert ApikitCoverage._apikit_configs(project) == {}
+    finally:
+        file_quarantine.release(path)
@@ -0,0 +1,60 @@
+import shutil
+
+import pytest
+
+from app.services.flow_scanner import FlowScanner
+from app.services.git_source import git_sources
+from app.services.mule_scanner import MuleProjectScanner
+from tests.conftest import git, write_project
+
+
+@pytest.fixture
+def monorepo(estate):
+    """Estate whose first commit has orders-api and billing-api, and whose working tree replaced billing-api"""
+    write_project(estate, "orders-api", flows={"orders.xml": ("get-orders", "/orders")})
+    write_project(estate, "billing-api", flows={"billing.xml": ("get-invoices", "/invoices")})
+    git(estate, "init", "-q")
+    git(estate, "add", "-A")
+    git(estate, "commit", "-q", "-m", "one")
+    git(estate, "tag", "v1")
+    shutil.rmtree(estate / "billing-api")
+    write_project(estate, "customers-api", flows={"customers.xml": ("get-customers", "/customers")})
+    yield estate
+    git_sources.close_all()
+
+
+def test_flow_scan_lists_projects_at_ref(monorepo):
+    result = FlowScanner(str(monorepo), ref="v1").scan_project_flows()
+
+    assert sorted(project["project_name"] for project in result.projects) == ["billing-api", "orders-api"]
+    assert FlowScanner(str(monorepo), ref="v1").get_project_path("billing-api").endswith("billing-api")
+    with pytest.raises(ValueError):
+        FlowScanner(str(monorepo), ref="v1").get_project_path("customers-api")
+
+
+def test_dependency_scan_lists_projects_at_ref(monorepo):
+    result = MuleProjectScanner(str(monorepo), ref="v1").scan_projects()
+
+    assert sorted(project.project_name for project in result.projects) == ["billing-api", "orders-api"]
+
+
+def test_project_repositories_without_the_ref_are_not_listed(estate):
+    tagged = write_project(estate, "orders-api", flows={"orders.xml": ("get-orders", "/orders")})
+    untagged = write_project(estate, "billing-api", flows={"billing.xml": ("get-invoices", "/invoices")})
+    for project in (tagged, untagged):
+        git(project, "init", "-q")
+        git(project, "add", "-A")
+        git(project, "commit", "-q", "-m", "one")
+    git(tagged, "tag", "v1")
+    try:
+        assert FlowScanner(str(estate), ref="v1").list_project_names() == ["orders-api"]
+    finally:
+        git_sources.close_all()
+
+
+def test_flow_batch_rejects_invalid_ref(estate, client):
+    write_project(estate, "orders-api", flows={"orders.xml": ("get-orders", "/orders")})
+
+    response = client.post("/mule/flows/batch", json={"projects": ["orders-api"], "ref": "main..other"})
+
+    assert response.status_code == 400
@@ -0,0 +1,56 @@
+import os
+from typing import List
+
+import pytest
+
+from app.models.flows import FlowContent, FlowInfo
+from app.services.flow_scanner import FlowScanner
+from app.services.incremental_index import IncrementalFlowIndex
+from tests.conftest import write_project
+
+
+class RecordingIndex(IncrementalFlowIndex):
+    """Index recording the files it is asked to add and remove"""
+
+    def __init__(self):
+        super().__init__()
+        self.added: List[str] = []
+        self.removed: List[str] = []
+
+    def _add_file(self, project_name: str, file_path: str, flows: List[FlowInfo],
+                  contents: List[FlowContent]) -> None:
+        self.added.append(os.path.basename(file_path))
+
+    def _remove_file(self, file_path: str) -> None:
+        self.removed.append(os.path.basename(file_path))
+
+
+def test_hooks_are_abstract():
+    class Incomplete(IncrementalFlowIndex):
+        def _add_file(self, project_name, file_path, flows, contents):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_refresh_only_reindexes_changed_files(estate):
+    project = write_project(estate, "orders-api", flows={
+        "orders.xml": ("get-orders", "/orders"), "refunds.xml": ("get-refunds", "/refunds")
+    })
+    index = RecordingIndex()
+    index.refresh(FlowScanner(str(estate)))
+    assert sorted(index.added) == ["orders.xml", "refunds.xml"]
+
+    index.added.clear()
+    index.refresh(FlowScanner(str(estate)))
+    assert (index.added, index.removed) == ([], [])
+
+    write_project(estate, "orders-api", flows={"orders.xml": ("list-orders", "/orders")})
+    os.utime(os.path.join(project, "src", "main", "mule", "orders.xml"), ns=(1, 1))
+    os.remove(os.path.join(project, "src", "main", "mule", "refunds.xml"))
+    index.refresh(FlowScanner(str(estate)))
+
+    assert index.added == ["orders.xml"]
+    assert sorted(index.removed) == ["orders.xml", "refunds.xml"]
+    assert index.files_indexed == 1
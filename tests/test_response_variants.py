@@ -0,0 +1,54 @@
+import os
+
+from app.services.response_variants import response_variants
+from app.services.scan_cache import scan_cache
+from tests.conftest import write_project
+
+
+def _settle(client, url):
+    """Request until the variant is served from memory, returning the body"""
+    client.get(url)
+    return client.get(url).json()
+
+
+def test_unrelated_cache_kind_does_not_rebuild_variants(estate, client):
+    project = write_project(
+        estate, "orders-api",
+        dependencies={"shared-lib": "1.0.0"},
+        flows={"orders.xml": ("get-orders", "/orders")}
+    )
+    _settle(client, "/mule/flows")
+    _settle(client, "/mule/dependencies")
+    builds = response_variants.builds
+
+    pom_path = f"{project}/pom.xml"
+    fingerprint = scan_cache.fingerprint(pom_path)
+    scan_cache.put("flow-locations", pom_path, fingerprint, {})
+    scan_cache.put("api-spec", pom_path, fingerprint, {})
+    client.get("/mule/flows")
+    client.get("/mule/dependencies")
+
+    assert response_variants.builds == builds
+
+
+def test_flow_change_rebuilds_flow_variants(estate, client):
+    write_project(estate, "orders-api", flows={"orders.xml": ("get-orders", "/orders")})
+    body = _settle(client, "/mule/flows")
+    assert body["total_flows"] == 1
+
+    write_project(
+        estate, "orders-api",
+        flows={"orders.xml": ("get-orders", "/orders"), "refunds.xml": ("get-refunds", "/refunds")}
+    )
+    assert client.get("/mule/flows").json()["total_flows"] == 2
+
+
+def test_flow_edit_with_same_totals_rebuilds_flow_variants(estate, client):
+    project = write_project(estate, "orders-api", flows={"orders.xml": ("get-orders", "/orders")})
+    _settle(client, "/mule/flows")
+
+    write_project(estate, "orders-api", flows={"orders.xml": ("list-orders", "/orders")})
+    os.utime(os.path.join(project, "src", "main", "mule", "orders.xml"), ns=(1, 1))
+    body = client.get("/mule/flows").json()
+
+    assert [flow["name"] for flow in body["projects"][0]["flows"]] == ["list-orders"]
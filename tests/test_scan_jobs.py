@@ -0,0 +1,38 @@
+import threading
+
+from app.services import scan_jobs as scan_jobs_module
+from app.services.scan_jobs import ScanJobManager
+
+
+class BlockingScanner:
+    """Flow scanner yielding one project, then waiting until released"""
+
+    started = None
+    release = None
+
+    def iter_project_flows(self, env=None):
+        self.started.set()
+        self.release.wait(5)
+        yield {"project_name": "orders-api", "flows": [], "total_flows": 0, "total_endpoints": 0}
+        yield {"project_name": "billing-api", "flows": [], "total_flows": 0, "total_endpoints": 0}
+
+
+def test_cancel_queued_and_running_jobs(monkeypatch):
+    BlockingScanner.started, BlockingScanner.release = threading.Event(), threading.Event()
+    monkeypatch.setattr(scan_jobs_module, "FlowScanner", BlockingScanner)
+    manager = ScanJobManager(max_workers=1, max_queued=1, history=10)
+    try:
+        running = manager.submit("flows")
+        assert BlockingScanner.started.wait(5)
+        queued = manager.submit("flows")
+
+        assert manager.cancel(queued.id).status == "cancelled"
+        manager.cancel(running.id)
+        BlockingScanner.release.set()
+        running.future.result(5)
+
+        assert running.status == "cancelled"
+        assert running.result is None
+    finally:
+        BlockingScanner.release.set()
+        manager.shutdown()
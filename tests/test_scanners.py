@@ -0,0 +1,44 @@
+from app.services.flow_scanner import FlowScanner
+from app.services.git_source import git_sources
+from app.services.mule_scanner import MuleProjectScanner
+from tests.conftest import git, write_project
+
+
+def _estate(root):
+    write_project(root, "orders-api", flows={"orders.xml": ("get-orders", "/orders")})
+    write_project(root, "billing-api", flows={
+        "billing.xml": ("get-invoices", "/invoices"), "refunds.xml": ("get-refunds", "/refunds")
+    })
+
+
+def test_files_parsed_excludes_cache_hits(estate):
+    _estate(estate)
+
+    cold_flows, cold_poms = FlowScanner(str(estate)), MuleProjectScanner(str(estate))
+    cold_flows.scan_project_flows()
+    cold_poms.scan_projects()
+    warm_flows, warm_poms = FlowScanner(str(estate)), MuleProjectScanner(str(estate))
+    warm_flows.scan_project_flows()
+    warm_poms.scan_projects()
+
+    assert (cold_flows.files_parsed, cold_poms.files_parsed) == (3, 2)
+    assert (warm_flows.files_parsed, warm_poms.files_parsed) == (0, 0)
+
+
+def test_files_parsed_at_ref_excludes_cached_blobs(estate):
+    _estate(estate)
+    git(estate, "init", "-q")
+    git(estate, "add", "-A")
+    git(estate, "commit", "-q", "-m", "one")
+    try:
+        cold_flows, cold_poms = FlowScanner(str(estate), ref="HEAD"), MuleProjectScanner(str(estate), ref="HEAD")
+        cold_flows.scan_project_flows()
+        cold_poms.scan_projects()
+        warm_flows, warm_poms = FlowScanner(str(estate), ref="HEAD"), MuleProjectScanner(str(estate), ref="HEAD")
+        warm_flows.scan_project_flows()
+        warm_poms.scan_projects()
+    finally:
+        git_sources.close_all()
+
+    assert (cold_flows.files_parsed, cold_poms.files_parsed) == (3, 2)
+    assert (warm_flows.files_parsed, warm_poms.files_parsed) == (0, 0)
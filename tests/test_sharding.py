@@ -0,0 +1,34 @@
+from app.services.sharding import ShardCoordinator, owns_project, shard_of
+
+
+def test_projects_are_split_between_shards(monkeypatch):
+    names = [f"project-{index}" for index in range(50)]
+    monkeypatch.setenv("SHARD_COUNT", "3")
+    owners = []
+    for shard_index in range(3):
+        monkeypatch.setenv("SHARD_INDEX", str(shard_index))
+        owners.append({name for name in names if owns_project(name)})
+
+    assert set().union(*owners) == set(names)
+    assert sum(len(owned) for owned in owners) == len(names)
+    assert all(name in owners[shard_of(name, 3)] for name in names)
+
+
+def test_scan_flows_merges_shards(monkeypatch):
+    coordinator = ShardCoordinator(urls=["http://a", "http://b", "http://c"])
+    responses = [
+        {"projects": [{"project_name": "orders-api", "total_flows": 2, "total_endpoints": 1}]},
+        {"projects": [
+            {"project_name": "billing-api", "total_flows": 1, "total_endpoints": 1},
+            {"project_name": "orders-api", "total_flows": 9, "total_endpoints": 9}
+        ], "partial": True, "skipped_projects": ["zeta-api"]}
+    ]
+    monkeypatch.setattr(coordinator, "_fan_out", lambda path, params: (responses, ["http://c"]))
+
+    result = coordinator.scan_flows({})
+
+    assert [project["project_name"] for project in result.projects] == ["billing-api", "orders-api"]
+    assert (result.total_projects, result.total_flows, result.total_endpoints) == (2, 3, 2)
+    assert result.partial
+    assert result.skipped_projects == ["zeta-api"]
+    assert result.missing_shards == ["http://c"]
@@ -0,0 +1,55 @@
+import os
+import shutil
+
+from app.services.snapshot_store import SnapshotStore
+from tests.conftest import write_project
+
+
+def _snapshot_pair(estate, tmp_path_factory, change):
+    store = SnapshotStore(str(tmp_path_factory.mktemp("snapshots")))
+    before = store.create(mule_directory=str(estate))
+    change()
+    after = store.create(mule_directory=str(estate))
+    return store.diff(before.id, after.id)
+
+
+def test_flows_are_compared_by_file_and_name(estate, tmp_path_factory):
+    project = write_project(estate, "orders-api", flows={
+        "orders.xml": ("health", "/orders/health"), "billing.xml": ("health", "/billing/health")
+    })
+
+    def change():
+        os.remove(os.path.join(project, "src", "main", "mule", "billing.xml"))
+
+    diff = _snapshot_pair(estate, tmp_path_factory, change)
+
+    (project_diff,) = diff.projects_changed
+    assert [(flow.file_path, flow.flow_name) for flow in project_diff.flows_removed] == [
+        ("src/main/mule/billing.xml", "health")
+    ]
+    assert [endpoint.path for endpoint in project_diff.endpoints_removed] == ["/billing/health"]
+    assert project_diff.flows_added == []
+
+
+def test_added_and_removed_projects_are_expanded(estate, tmp_path_factory):
+    write_project(estate, "orders-api", dependencies={"shared-lib": "1.0.0"},
+                  flows={"orders.xml": ("get-orders", "/orders")})
+
+    def change():
+        shutil.rmtree(os.path.join(str(estate), "orders-api"))
+        write_project(estate, "billing-api", dependencies={"shared-lib": "2.0.0"},
+                      flows={"billing.xml": ("get-invoices", "/invoices")})
+
+    diff = _snapshot_pair(estate, tmp_path_factory, change)
+
+    (added,) = diff.projects_added
+    (removed,) = diff.projects_removed
+    assert added.project_name == "billing-api"
+    assert [endpoint.path for endpoint in added.endpoints_added] == ["/invoices"]
+    assert [(dependency.artifact_id, dependency.before, dependency.after)
+            for dependency in added.dependencies_changed] == [("shared-lib", None, "2.0.0")]
+    assert removed.project_name == "orders-api"
+    assert [flow.flow_name for flow in removed.flows_removed] == ["get-orders"]
+    assert [(dependency.artifact_id, dependency.before, dependency.after)
+            for dependency in removed.dependencies_changed] == [("shared-lib", "1.0.0", None)]
+    assert diff.projects_changed == []
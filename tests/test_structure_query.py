@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from app.services.flow_scanner import FlowScanner
+from app.services.structure_query import PathPattern, StructureIndex, StructureQuery
+from tests.conftest import write_project
+
+FLOWS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<mule xmlns="http://www.mulesoft.org/schema/mule/core">
+    <flow name="loop-select">
+        <foreach><db:select config-ref="db"/></foreach>
+        <error-handler><on-error-continue/></error-handler>
+    </flow>
+    <flow name="retry-call">
+        <until-successful><http:request path="/a"/></until-successful>
+    </flow>
+    <flow name="bare-call">
+        <http:request path="/b"/>
+    </flow>
+    <flow name="routed">
+        <http:listener path="/routed"/>
+        <choice><when expression="#[true]"><http:request path="/c"/></when></choice>
+    </flow>
+</mule>
+"""
+
+
+@pytest.mark.parametrize("pattern, path, expected", [
+    ("db:select", "flow/foreach/db:select", True),
+    ("foreach/db:select", "flow/foreach/db:select", True),
+    ("foreach/db:select", "flow/foreach/try/db:select", False),
+    ("foreach//db:select", "flow/foreach/try/db:select", True),
+    ("/flow/http:listener", "flow/http:listener", True),
+    ("/http:listener", "flow/http:listener", False),
+    ("//http:listener", "flow/http:listener", True),
+    ("flow/*", "flow/logger", True),
+    ("flow/*", "flow/choice/logger", False),
+    ("*", "flow", True),
+    ("/flow", "flow", True),
+    ("!until-successful//http:request", "flow/http:request", True),
+    ("!until-successful//http:request", "flow/until-successful/http:request", False),
+])
+def test_path_pattern_grammar(pattern, path, expected):
+    assert PathPattern(pattern).matches(path) is expected
+
+
+@pytest.mark.parametrize("pattern", ["", "a///b", "!*//x", "!foreach/x", "1abc"])
+def test_invalid_path_patterns(pattern):
+    with pytest.raises(ValueError):
+        PathPattern(pattern)
+
+
+@pytest.mark.parametrize("query", ["", "(foreach", "foreach and", "and foreach", "foreach )"])
+def test_invalid_queries(query):
+    with pytest.raises(ValueError):
+        StructureQuery(query)
+
+
+@pytest.fixture
+def index(estate):
+    project = write_project(estate, "orders-api")
+    with open(os.path.join(project, "src", "main", "mule", "flows.xml"), "w") as f:
+        f.write(FLOWS_XML)
+    structure_index = StructureIndex()
+    structure_index.refresh(FlowScanner(str(estate)))
+    return structure_index
+
+
+def _flow_names(index, query):
+    return sorted(flow["flow_name"] for flow in index.query(query)["flows"])
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("flow", ["bare-call", "loop-select", "retry-call", "routed"]),
+    ("/flow", ["bare-call", "loop-select", "retry-call", "routed"]),
+    ("not //flow", []),
+    ("foreach//db:select", ["loop-select"]),
+    ("!until-successful//http:request", ["bare-call", "routed"]),
+    ("choice/when/http:request", ["routed"]),
+    ("http:request and not error-handler", ["bare-call", "retry-call", "routed"]),
+    ("(db:select or http:listener) and not until-successful", ["loop-select", "routed"]),
+    ("not http:request", ["loop-select"]),
+])
+def test_structure_queries(index, query, expected):
+    assert _flow_names(index, query) == expected
+
+
+def test_root_path_is_recorded(index):
+    assert index.query("/flow")["flows"][0]["matched_paths"] == ["flow"]
@@ -0,0 +1,65 @@
+"""
+Tests for the XML parsing limits
+"""
+import io
+
+import pytest
+
+from app.utils.xml_parser import XMLLimitError, parse_xml, failure_reason
+
+
+def nested_xml(depth: int) -> bytes:
+    """Build a document with elements nested depth levels deep"""
+    return b"<a>" * depth + b"</a>" * depth
+
+
+def test_parses_within_limits():
+    assert parse_xml(b"<mule><flow name='main'/></mule>", "ok.xml") == {"mule": {"flow": {"@name": "main"}}}
+
+
+def test_rejects_deep_nesting(monkeypatch):
+    monkeypatch.setenv("XML_MAX_DEPTH", "50")
+    parse_xml(nested_xml(50), "shallow.xml")
+    with pytest.raises(XMLLimitError) as error:
+        parse_xml(nested_xml(51), "deep.xml")
+    assert error.value.reason == "depth"
+
+
+def test_rejects_entity_declarations():
+    content = (
+        b'<?xml version="1.0"?>'
+        b'<!DOCTYPE lolz [<!ENTITY lol "lol"><!ENTITY lol2 "&lol;&lol;&lol;&lol;">]>'
+        b"<lolz>&lol2;</lolz>"
+    )
+    with pytest.raises(XMLLimitError) as error:
+        parse_xml(content, "entities.xml")
+    assert error.value.reason == "entities"
+
+
+def test_rejects_oversized_bytes(monkeypatch):
+    monkeypatch.setenv("XML_MAX_FILE_BYTES", "64")
+    with pytest.raises(XMLLimitError) as error:
+        parse_xml(b"<mule>" + b" " * 64 + b"</mule>", "large.xml")
+    assert error.value.reason == "size"
+
+
+def test_rejects_oversized_stream(monkeypatch):
+    monkeypatch.setenv("XML_MAX_FILE_BYTES", "64")
+    parse_xml(io.BytesIO(b"<mule/>"), "small-entry.xml")
+    with pytest.raises(XMLLimitError) as error:
+        parse_xml(io.BytesIO(b"<mule>" + b" " * 64 + b"</mule>"), "large-entry.xml")
+    assert error.value.reason == "size"
+
+
+def test_stops_at_time_limit(monkeypatch):
+    monkeypatch.setenv("XML_PARSE_TIMEOUT_MS", "1")
+    content = b"<mule>" + b"<flow/>" * 200000 + b"</mule>"
+    with pytest.raises(XMLLimitError) as error:
+        parse_xml(content, "slow.xml")
+    assert error.value.reason == "timeout"
+
+
+def test_classifies_syntax_errors():
+    with pytest.raises(Exception) as error:
+        parse_xml(b"<mule>", "broken.xml")
+    assert failure_reason(error.value) == "syntax"